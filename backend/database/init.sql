@@ -1,6 +1,6 @@
 -- ═══════════════════════════════════════════════════════════════
 -- AI-SupraAgent - Database Initialization
--- PostgreSQL 16 + pgvector
+-- PostgreSQL 16 + pgvector (>= 0.7 for halfvec)
 -- ═══════════════════════════════════════════════════════════════
 
 -- Enable pgvector extension
@@ -30,7 +30,7 @@ CREATE TABLE IF NOT EXISTS document_chunks (
     document_id UUID NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
     chunk_index INTEGER NOT NULL,
     content TEXT NOT NULL,
-    embedding vector(768),  -- text-embedding-004 dimension
+    embedding halfvec(768),  -- text-embedding-004 dimension, stored as float16
     token_count INTEGER,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     metadata JSONB DEFAULT '{}'::jsonb
@@ -65,10 +65,12 @@ CREATE TABLE IF NOT EXISTS chat_messages (
 -- INDEXES
 -- ═══════════════════════════════════════════════════════════════
 
--- Vector similarity search index (IVFFlat for performance)
-CREATE INDEX IF NOT EXISTS idx_document_chunks_embedding
-ON document_chunks USING ivfflat (embedding vector_cosine_ops)
-WITH (lists = 100);
+-- Vector similarity search index (HNSW: no training step, so it stays
+-- accurate on a table that starts empty; replaces the old IVFFlat index)
+DROP INDEX IF EXISTS idx_document_chunks_embedding;
+CREATE INDEX IF NOT EXISTS idx_document_chunks_embedding_hnsw
+ON document_chunks USING hnsw (embedding halfvec_cosine_ops)
+WITH (m = 16, ef_construction = 64);
 
 -- Document lookups
 CREATE INDEX IF NOT EXISTS idx_documents_status ON documents(status);
@@ -114,7 +116,7 @@ CREATE TRIGGER update_chat_sessions_updated_at
 -- VECTOR SEARCH FUNCTION
 -- ═══════════════════════════════════════════════════════════════
 CREATE OR REPLACE FUNCTION search_similar_chunks(
-    query_embedding vector(768),
+    query_embedding halfvec(768),
     match_threshold FLOAT DEFAULT 0.7,
     match_count INT DEFAULT 5
 )
@@ -3,10 +3,12 @@
 Provides endpoints for Speech-to-Text and Text-to-Speech functionality.
 """
 
-from typing import Optional
+from contextlib import aclosing
+from typing import AsyncGenerator, Optional
 import base64
 import structlog
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, Field
 
 from src.services.audio_service import get_audio_service
@@ -14,6 +16,13 @@ from src.services.audio_service import get_audio_service
 logger = structlog.get_logger()
 router = APIRouter(prefix="/audio", tags=["Audio"])
 
+# Content type for each TTS output encoding (LINEAR16 comes with a WAV header)
+_AUDIO_MEDIA_TYPES = {
+    "MP3": "audio/mpeg",
+    "LINEAR16": "audio/wav",
+    "OGG_OPUS": "audio/ogg",
+}
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Request/Response Models
@@ -211,7 +220,7 @@ async def synthesize_speech(request: SynthesisRequest) -> SynthesisResponse:
                 detail="Audio service not available"
             )
 
-        result = await audio_service.text_to_speech(
+        result = await audio_service.text_to_speech_batch(
             text=request.text,
             language_code=request.language_code,
             voice_name=request.voice_name,
@@ -238,6 +247,94 @@ async def synthesize_speech(request: SynthesisRequest) -> SynthesisResponse:
         )
 
 
+@router.post("/synthesize/audio")
+async def synthesize_speech_audio(request: SynthesisRequest) -> Response:
+    """Convert text to speech, returning the raw audio file.
+
+    Same as /synthesize but skips base64 and the JSON envelope, for
+    clients that can play a binary response directly.
+
+    Args:
+        request: Synthesis parameters including text and voice settings
+
+    Returns:
+        Binary audio response
+    """
+    audio_service = get_audio_service()
+    if not audio_service:
+        raise HTTPException(
+            status_code=503,
+            detail="Audio service not available"
+        )
+
+    result = await audio_service.text_to_speech_batch(
+        text=request.text,
+        language_code=request.language_code,
+        voice_name=request.voice_name,
+        speaking_rate=request.speaking_rate,
+        pitch=request.pitch,
+        audio_encoding=request.audio_encoding,
+        return_format="bytes",
+    )
+
+    if not result.get("success"):
+        raise HTTPException(status_code=502, detail=result.get("error"))
+
+    return Response(
+        content=result["audio_content"],
+        media_type=_AUDIO_MEDIA_TYPES.get(request.audio_encoding, "audio/mpeg"),
+    )
+
+
+@router.post("/synthesize/stream")
+async def synthesize_speech_stream(request: SynthesisRequest) -> StreamingResponse:
+    """Convert text to speech, streaming OGG_OPUS audio as it is synthesized.
+
+    Lets the client start playback on the first chunk. The audio_encoding
+    and pitch fields of the request are ignored; streaming always returns
+    OGG_OPUS, and speaking_rate is capped at 2.0.
+
+    Args:
+        request: Synthesis parameters including text and voice settings
+
+    Returns:
+        Chunked audio/ogg response
+
+    Raises:
+        HTTPException: If the service is unavailable or synthesis fails
+            before the first chunk
+    """
+    audio_service = get_audio_service()
+    if not audio_service:
+        raise HTTPException(
+            status_code=503,
+            detail="Audio service not available"
+        )
+
+    chunks = audio_service.text_to_speech_streaming(
+        text=request.text,
+        language_code=request.language_code,
+        voice_name=request.voice_name,
+        speaking_rate=request.speaking_rate,
+    )
+
+    # Pull the first chunk before committing to a 200, so setup errors
+    # (bad voice, auth, quota) still reach the client as an error status
+    try:
+        first_chunk = await anext(chunks, b"")
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+    async def body() -> AsyncGenerator[bytes, None]:
+        async with aclosing(chunks):
+            if first_chunk:
+                yield first_chunk
+            async for chunk in chunks:
+                yield chunk
+
+    return StreamingResponse(body(), media_type="audio/ogg")
+
+
 @router.get("/voices")
 async def list_available_voices():
     """List available TTS voices.
@@ -354,7 +451,7 @@ async def voice_conversation(request: VoiceConversationRequest) -> VoiceConversa
         clean_response = clean_response.replace("- ", "")
         clean_response = clean_response.replace("|", " ")
 
-        synthesis = await audio_service.text_to_speech(
+        synthesis = await audio_service.text_to_speech_batch(
             text=clean_response[:4000],  # Limit length for TTS
             language_code=request.language_code,
             speaking_rate=1.0,
@@ -8,6 +8,7 @@ import json
 from typing import Annotated, Any, AsyncGenerator
 from uuid import UUID
 
+import orjson
 import structlog
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
@@ -18,7 +19,7 @@ from sqlalchemy.orm import selectinload
 
 from src.database.connection import get_db
 from src.database.models import ChatMessage, ChatSession
-from src.mcp.orchestrator import AgentOrchestrator
+from src.mcp.orchestrator import get_orchestrator
 from src.mcp.alerts import get_campaign_alerts, format_alerts_for_display
 from src.mcp.memory import get_agent_memory
 from src.config import get_settings
@@ -34,6 +35,11 @@ logger = structlog.get_logger()
 
 router = APIRouter(prefix="/chat", tags=["Chat"])
 
+# Text events dominate the stream, so their SSE frame is assembled from
+# precomputed bytes instead of building and encoding a dict per token
+_TEXT_FRAME_PREFIX = b'data: {"event":"text","data":'
+_TEXT_FRAME_SUFFIX = b"}\n\n"
+
 
 @router.post("/sessions", response_model=ChatSessionResponse)
 async def create_session(
@@ -105,17 +111,7 @@ async def list_sessions(
     result = await db.execute(query)
     rows = result.all()
 
-    return [
-        ChatSessionResponse(
-            id=session.id,
-            title=session.title,
-            user_id=session.user_id,
-            created_at=session.created_at,
-            updated_at=session.updated_at,
-            message_count=count,
-        )
-        for session, count in rows
-    ]
+    return [ChatSessionResponse.from_row(session, count) for session, count in rows]
 
 
 @router.get("/sessions/{session_id}", response_model=ChatSessionResponse)
@@ -153,14 +149,7 @@ async def get_session(
 
     session, count = row
 
-    return ChatSessionResponse(
-        id=session.id,
-        title=session.title,
-        user_id=session.user_id,
-        created_at=session.created_at,
-        updated_at=session.updated_at,
-        message_count=count,
-    )
+    return ChatSessionResponse.from_row(session, count)
 
 
 @router.get("/sessions/{session_id}/messages", response_model=list[ChatMessageResponse])
@@ -189,17 +178,7 @@ async def get_messages(
     result = await db.execute(query)
     messages = result.scalars().all()
 
-    return [
-        ChatMessageResponse(
-            id=msg.id,
-            session_id=msg.session_id,
-            role=msg.role,
-            content=msg.content,
-            tool_calls=msg.tool_calls,
-            created_at=msg.created_at,
-        )
-        for msg in messages
-    ]
+    return [ChatMessageResponse.from_row(msg) for msg in messages]
 
 
 @router.delete("/sessions/{session_id}")
@@ -273,7 +252,7 @@ async def stream_chat(
     db.add(user_message)
     await db.commit()
 
-    async def generate() -> AsyncGenerator[str, None]:
+    async def generate() -> AsyncGenerator[str | bytes, None]:
         """Generate SSE events for chat stream."""
         settings = get_settings()
 
@@ -283,7 +262,7 @@ async def stream_chat(
             orchestrator = get_genai_orchestrator()
             logger.info("Using Gen AI SDK orchestrator")
         else:
-            orchestrator = AgentOrchestrator()
+            orchestrator = get_orchestrator()
 
         full_response = ""
         tool_calls_data: list[dict] = []
@@ -309,10 +288,11 @@ async def stream_chat(
                 messages=messages,
                 use_rag=request.use_rag,
                 use_analytics=request.use_analytics,
+                session_id=str(session.id),
             ):
                 if event["type"] == "text":
                     full_response += event["content"]
-                    yield f"data: {json.dumps({'event': 'text', 'data': event['content']})}\n\n"
+                    yield _TEXT_FRAME_PREFIX + orjson.dumps(event["content"]) + _TEXT_FRAME_SUFFIX
 
                 elif event["type"] == "tool_call":
                     tool_calls_data.append(event["data"])
@@ -465,7 +445,7 @@ async def get_daily_digest() -> DailyDigestResponse:
         Formatted daily digest in markdown
     """
     try:
-        orchestrator = AgentOrchestrator()
+        orchestrator = get_orchestrator()
         digest = await orchestrator.get_daily_digest()
 
         from datetime import datetime
@@ -206,22 +206,8 @@ async def list_documents(
     result = await db.execute(query)
     documents = result.scalars().all()
 
-    return DocumentListResponse(
-        documents=[
-            DocumentResponse(
-                id=doc.id,
-                filename=doc.filename,
-                original_name=doc.original_name,
-                mime_type=doc.mime_type,
-                file_size=doc.file_size,
-                status=DocumentStatus(doc.status),
-                chunk_count=doc.chunk_count,
-                created_at=doc.created_at,
-                updated_at=doc.updated_at,
-                metadata=doc.metadata_ or {},
-            )
-            for doc in documents
-        ],
+    return DocumentListResponse.model_construct(
+        documents=[DocumentResponse.from_row(doc) for doc in documents],
         total=total,
         page=page,
         page_size=page_size,
@@ -252,18 +238,7 @@ async def get_document(
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
 
-    return DocumentResponse(
-        id=document.id,
-        filename=document.filename,
-        original_name=document.original_name,
-        mime_type=document.mime_type,
-        file_size=document.file_size,
-        status=DocumentStatus(document.status),
-        chunk_count=document.chunk_count,
-        created_at=document.created_at,
-        updated_at=document.updated_at,
-        metadata=document.metadata_ or {},
-    )
+    return DocumentResponse.from_row(document)
 
 
 @router.delete("/{document_id}")
@@ -70,6 +70,30 @@ class Settings(BaseSettings):
         bool,
         Field(default=False, description="Use new google-genai SDK instead of vertexai (experimental)"),
     ]
+    gemini_summary_model: Annotated[
+        str,
+        Field(default="gemini-2.0-flash", description="Cheaper model used to summarize old chat history"),
+    ]
+    speculative_follow_up: Annotated[
+        bool,
+        Field(default=False, description="Start the post-tool Gemini request before the tool finishes (costs extra tokens)"),
+    ]
+    chat_history_window: Annotated[
+        int,
+        Field(default=20, description="Recent messages sent verbatim; older ones are summarized"),
+    ]
+    max_tool_calls: Annotated[
+        int,
+        Field(default=20, description="Max tool calls per chat response before the agent stops"),
+    ]
+    max_wall_seconds: Annotated[
+        float,
+        Field(default=60.0, description="Max seconds spent on one chat response before the agent stops"),
+    ]
+    max_total_tokens: Annotated[
+        int,
+        Field(default=64000, description="Max Gemini tokens (prompt + output) per chat response"),
+    ]
 
     # ─────────────────────────────────────────────────────────────
     # Google Custom Search (for web search)
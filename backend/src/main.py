@@ -13,6 +13,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from src.config import get_settings
+from src.mcp.http_client import close_http_client, get_http_client
+from src.services.audio_service import get_audio_service
 
 # ═══════════════════════════════════════════════════════════════
 # Logging Configuration
@@ -58,9 +60,21 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         environment=settings.environment,
         log_level=settings.log_level,
     )
+    # Open the pooled outbound client up front; tools share it via
+    # get_http_client() and handlers can reach it on app.state
+    app.state.http_client = get_http_client()
+    # Create the Google STT/TTS clients now so the first voice request
+    # doesn't pay for channel setup; a failure here falls back to lazy init
+    audio_service = get_audio_service()
+    if audio_service:
+        try:
+            await audio_service.initialize()
+        except Exception as e:
+            logger.warning("Audio service not initialized at startup", error=str(e))
     yield
     # Shutdown
     logger.info("Shutting down AI-SupraAgent Backend")
+    await close_http_client()
 
 
 # ═══════════════════════════════════════════════════════════════
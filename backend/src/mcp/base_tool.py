@@ -0,0 +1,34 @@
+"""Base class for tools that expose Gemini function declarations."""
+
+import abc
+
+from vertexai.generative_models import FunctionDeclaration
+
+
+class BaseTool(abc.ABC):
+    """Tool with a static set of Gemini function declarations.
+
+    Subclasses implement ``_build_function_declarations()``. The result is
+    built on first use and cached on the subclass, so it is shared by every
+    instance of that tool.
+    """
+
+    _function_declarations: list[FunctionDeclaration] | None = None
+
+    def get_function_declarations(self) -> list[FunctionDeclaration]:
+        """Get Gemini function declarations for this tool.
+
+        Returns:
+            List of function declarations
+        """
+        cls = type(self)
+        # Look only at the subclass itself so tools never share a cache
+        declarations = cls.__dict__.get("_function_declarations")
+        if declarations is None:
+            declarations = self._build_function_declarations()
+            cls._function_declarations = declarations
+        return declarations
+
+    @abc.abstractmethod
+    def _build_function_declarations(self) -> list[FunctionDeclaration]:
+        """Build the tool's function declarations."""
@@ -11,12 +11,13 @@ from vertexai.generative_models import FunctionDeclaration
 
 from src.config import get_settings
 from src.mcp.autonomous_agent import get_data_discovery, get_autonomous_analyzer
+from src.mcp.base_tool import BaseTool
 
 logger = structlog.get_logger()
 settings = get_settings()
 
 
-class BigQueryTool:
+class BigQueryTool(BaseTool):
     """MCP tool for BigQuery data queries."""
 
     def __init__(self, project_id: str | None = None) -> None:
@@ -29,12 +30,8 @@ class BigQueryTool:
         self.client = bigquery.Client(project=self.project_id)
         logger.info("BigQuery tool initialized", project_id=self.project_id)
 
-    def get_function_declarations(self) -> list[FunctionDeclaration]:
-        """Get Gemini function declarations for BigQuery tools.
-
-        Returns:
-            List of function declarations
-        """
+    def _build_function_declarations(self) -> list[FunctionDeclaration]:
+        """Build BigQuery function declarations."""
         return [
             FunctionDeclaration(
                 name="bq_list_datasets",
@@ -15,12 +15,13 @@ from google.protobuf import json_format
 from vertexai.generative_models import FunctionDeclaration
 
 from src.config import get_settings
+from src.mcp.base_tool import BaseTool
 
 logger = structlog.get_logger()
 settings = get_settings()
 
 
-class GoogleAdsTool:
+class GoogleAdsTool(BaseTool):
     """MCP Tool for Google Ads API operations."""
 
     # Simple in-memory cache: {cache_key: (timestamp, result)}
@@ -218,12 +219,8 @@ class GoogleAdsTool:
             }
         ]
 
-    def get_function_declarations(self) -> list[FunctionDeclaration]:
-        """Return Gemini FunctionDeclaration objects for the tools.
-
-        Returns:
-            List of FunctionDeclaration objects for Gemini
-        """
+    def _build_function_declarations(self) -> list[FunctionDeclaration]:
+        """Build FunctionDeclarations from the tools schema."""
         declarations = []
         for tool in self.get_tools_schema():
             declarations.append(
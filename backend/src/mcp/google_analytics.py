@@ -19,12 +19,13 @@ from google.analytics.admin_v1beta import AnalyticsAdminServiceClient
 from vertexai.generative_models import FunctionDeclaration
 
 from src.config import get_settings
+from src.mcp.base_tool import BaseTool
 
 logger = structlog.get_logger()
 settings = get_settings()
 
 
-class GoogleAnalyticsTool:
+class GoogleAnalyticsTool(BaseTool):
     """MCP tool for Google Analytics 4 data queries."""
 
     def __init__(self) -> None:
@@ -33,12 +34,8 @@ class GoogleAnalyticsTool:
         self.admin_client = AnalyticsAdminServiceClient()
         self.default_property_id = settings.ga4_property_id
 
-    def get_function_declarations(self) -> list[FunctionDeclaration]:
-        """Get Gemini function declarations for GA4 tools.
-
-        Returns:
-            List of function declarations
-        """
+    def _build_function_declarations(self) -> list[FunctionDeclaration]:
+        """Build GA4 function declarations."""
         return [
             FunctionDeclaration(
                 name="ga_list_properties",
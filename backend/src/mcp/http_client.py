@@ -0,0 +1,43 @@
+"""Shared HTTP client for MCP tools.
+
+One pooled httpx.AsyncClient is reused by every tool call, so TCP/TLS
+connections are kept alive instead of being opened per request. HTTP/2 is
+enabled so concurrent calls to the same host share one connection.
+"""
+
+import httpx
+import structlog
+
+logger = structlog.get_logger()
+
+# Connection pool limits for outbound tool traffic
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+HTTP_TIMEOUT = httpx.Timeout(30.0)  # seconds
+
+# Singleton instance
+_http_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get or create the shared HTTP client.
+
+    Returns:
+        Pooled httpx.AsyncClient instance
+    """
+    global _http_client
+
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT, http2=True)
+        logger.info("Shared HTTP client created")
+
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and release its connections."""
+    global _http_client
+
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+        logger.info("Shared HTTP client closed")
@@ -11,21 +11,18 @@ from vertexai.generative_models import FunctionDeclaration
 
 from src.database.connection import async_session_maker
 from src.database.models import Document
+from src.mcp.base_tool import BaseTool
 from src.rag.retrieval import search_similar_chunks
 from src.schemas.documents import DocumentStatus
 
 logger = structlog.get_logger()
 
 
-class KnowledgeBaseTool:
+class KnowledgeBaseTool(BaseTool):
     """MCP tool for knowledge base queries."""
 
-    def get_function_declarations(self) -> list[FunctionDeclaration]:
-        """Get Gemini function declarations for KB tools.
-
-        Returns:
-            List of function declarations
-        """
+    def _build_function_declarations(self) -> list[FunctionDeclaration]:
+        """Build knowledge base function declarations."""
         return [
             FunctionDeclaration(
                 name="search_knowledge_base",
@@ -11,6 +11,8 @@ from typing import Any
 import structlog
 from vertexai.generative_models import FunctionDeclaration
 
+from src.mcp.base_tool import BaseTool
+
 logger = structlog.get_logger()
 
 # Path to the leads CSV file
@@ -20,7 +22,7 @@ LEADS_CSV_PATH = os.path.join(
 )
 
 
-class LeadsTool:
+class LeadsTool(BaseTool):
     """Tool for analyzing leads/CRM data from CSV."""
 
     def __init__(self) -> None:
@@ -28,8 +30,8 @@ class LeadsTool:
         self.csv_path = LEADS_CSV_PATH
         logger.info("Leads tool initialized", csv_path=self.csv_path)
 
-    def get_function_declarations(self) -> list[FunctionDeclaration]:
-        """Get Gemini function declarations for leads tools."""
+    def _build_function_declarations(self) -> list[FunctionDeclaration]:
+        """Build leads function declarations."""
         return [
             FunctionDeclaration(
                 name="leads_get_summary",
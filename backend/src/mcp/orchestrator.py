@@ -13,11 +13,16 @@ Improvements implemented:
 - Robust error handling with retries
 """
 
-import json
-from datetime import datetime
+import functools
+import hashlib
+import time
+from collections import OrderedDict
+from contextlib import aclosing
+from datetime import datetime, timezone
 from typing import Any, AsyncGenerator
 import asyncio
 
+import orjson
 import structlog
 from google.cloud import aiplatform
 from vertexai.generative_models import (
@@ -35,6 +40,9 @@ from src.mcp.google_analytics import GoogleAnalyticsTool
 from src.mcp.google_ads import get_google_ads_tool, GoogleAdsTool
 from src.mcp.knowledge_base import KnowledgeBaseTool
 from src.mcp.web_search import get_web_search_tool, WebSearchTool
+from src.mcp.http_client import get_http_client
+from src.mcp.streaming import coalesce_text
+from src.mcp.tool_routing import ToolRouter
 from src.mcp.bigquery import get_bigquery_tool, BigQueryTool
 from src.mcp.autonomous_agent import get_data_discovery, get_autonomous_analyzer
 from src.mcp.leads_tool import get_leads_tool, LeadsTool
@@ -49,13 +57,99 @@ from src.mcp.alerts import get_campaign_alerts, format_alerts_for_display
 from src.mcp.response_templates import ResponseTemplates
 from src.rag.retrieval import get_context_for_query
 
+__all__ = ["AgentOrchestrator", "get_orchestrator"]
+
 logger = structlog.get_logger()
 settings = get_settings()
 
+# Debug-only log calls are skipped entirely unless LOG_LEVEL is DEBUG
+_DEBUG = settings.log_level.upper() == "DEBUG"
+
 # Retry configuration
 MAX_RETRIES = 3
 RETRY_DELAY = 1.0  # seconds
 
+# Allow up to 10 chained tool calls per response
+MAX_CHAINED_TOOL_CALLS = 10
+
+# System instruction with CoT prompting, split into a static prefix built
+# once per process and a small dated part rebuilt when the day rolls over
+# (OPTIMIZED: reduced from ~3500 to ~1800 tokens for better caching)
+_STATIC_PREFIX_TEXT = """ROL: Consultor estratégico de marketing digital para SCRAM (tecnología y seguridad electrónica).
+
+REGLAS CRÍTICAS:
+1. IDIOMA: Responde en el MISMO idioma del usuario. Nunca mezcles.
+2. SIN PENSAMIENTO VISIBLE: Nunca escribas "Pensamiento", "Voy a", "Déjame", "Let me". Primera palabra = emoji o respuesta directa.
+3. LONGITUD ADAPTATIVA:
+   - Pregunta simple (sí/no, cuánto) → 2-4 oraciones
+   - Pregunta compleja (análisis) → 📊RESUMEN → 🔍ANÁLISIS → 💡INSIGHTS → ✅RECOMENDACIONES
+
+ECOSISTEMA:
+- GA4 Principal (scram2k.com): 508206486
+- GA4 Seguridad: 509271243
+- GA4 Conectividad: 512088907
+
+HERRAMIENTAS - Flujo recomendado:
+1. `google_ads_list_campaigns` PRIMERO para obtener IDs
+2. `leads_from_google_ads` para datos REALES del CRM
+3. Compara siempre: Ads reporta ~1 conversión pero CRM tiene 25+ leads de Ads = TRACKING ROTO
+
+REGLAS DE HERRAMIENTAS:
+- NO uses `google_ads_search` con GAQL (falla)
+- Ejecuta herramientas SIN pedir permiso
+- NUNCA pidas IDs al usuario
+- Encadena hasta 10 herramientas si es necesario
+- Para análisis cruzado usa `bq_auto_analyze`
+
+BENCHMARKS: CTR >2% bueno, CPC <$2 bueno, Conv Rate >3% bueno
+
+PRINCIPIOS:
+- Sé estratégico, no técnico
+- Cruza datos de múltiples fuentes
+- Siempre da recomendaciones accionables
+- Identifica causa raíz, no síntomas"""
+_SYSTEM_PREFIX_PART = Part.from_text(_STATIC_PREFIX_TEXT)
+_DATE_TEMPLATE = "Fecha: {current_date}"
+
+# Sent after the first round of tool results
+_SYNTHESIS_INSTRUCTION = """RESPONDE AHORA. Tienes los datos.
+
+🚫 PROHIBIDO: "Pensamiento", "Voy a", "RECUERDA", tablas crudas, JSON
+✅ TU PRIMERA PALABRA: emoji (📊/🔍/✅) o respuesta directa
+
+ADAPTA LA LONGITUD:
+- Pregunta simple (sí/no, cuánto, cuál) → 2-4 oraciones máximo
+- Pregunta compleja (por qué, analiza, plan) → formato completo:
+  📊 RESUMEN (1 oración) → 🔍 ANÁLISIS → 💡 INSIGHTS → ✅ RECOMENDACIONES
+
+Si faltan datos, llama otra herramienta. Si ya tienes suficiente, RESPONDE."""
+
+# Shorter reminder sent after chained tool results
+_SYNTHESIS_REMINDER = """Datos obtenidos. RESPONDE AHORA o llama otra herramienta.
+🚫 Sin "Pensamiento", "Voy a", tablas crudas
+✅ Adapta longitud: simple=2-4 oraciones, complejo=formato completo"""
+
+# Built Gemini Tool lists keyed by which optional tools are available
+# (ads, web, bigquery, leads); protobuf construction then runs once per process
+_FUNCTION_DECL_CACHE: dict[tuple[bool, bool, bool, bool], list[Tool]] = {}
+
+# Summaries of trimmed chat history kept per process
+_SUMMARY_CACHE_SIZE = 256
+
+# RAG context cache: normalized query -> (stored_at, context)
+_RAG_CACHE_SIZE = 256
+_RAG_CACHE_TTL = 600.0  # seconds
+
+# Replies too short or generic to be worth a vector search
+_RAG_MIN_QUERY_LEN = 8
+_RAG_SKIP_QUERIES = frozenset({"si", "sí", "ok", "gracias", "no"})
+
+# Last results per (tool, args) used to predict speculative follow-ups
+_SPECULATION_CACHE_SIZE = 128
+
+# Chat history role -> Gemini Content role
+_ROLE_MAP = {"user": "user", "assistant": "model", "model": "model"}
+
 
 def _serialize_for_function_response(result: Any) -> dict:
     """Serialize result for Vertex AI function response.
@@ -83,13 +177,70 @@ def _serialize_for_function_response(result: Any) -> dict:
 
         # For dicts and lists, convert to JSON string
         # This avoids the "'list' object has no attribute 'get'" error
-        return {"result": json.dumps(result, ensure_ascii=False, default=str)}
+        return {"result": orjson.dumps(result, default=str, option=orjson.OPT_NON_STR_KEYS).decode()}
 
     except Exception as e:
         # Ultimate fallback - stringify whatever we got
         return {"result": f"Result: {str(result)[:2000]}"}
 
 
+def _chunk_parts(chunk: Any) -> Any:
+    """Return the parts of a streamed chunk's first candidate, or ()."""
+    candidates = chunk.candidates
+    cand = candidates[0] if candidates else None
+    return cand.content.parts if cand and cand.content else ()
+
+
+def _tool_turn_contents(
+    fc_parts: list[Part],
+    calls: list[tuple[str, dict[str, Any]]],
+    results: list[Any],
+    instruction: str,
+) -> list[Content]:
+    """Build the contents that record one tool turn in the conversation.
+
+    Args:
+        fc_parts: Function-call parts emitted by the model
+        calls: (tool_name, tool_args) pairs matching ``fc_parts``
+        results: Tool results in call order
+        instruction: Synthesis text sent after the tool results
+
+    Returns:
+        Model turn with every call, user turn with every response, and the
+        synthesis instruction
+    """
+    return [
+        Content(role="model", parts=fc_parts),
+        # Function responses go in their own Content
+        # (combining with text can cause SDK issues)
+        Content(
+            role="user",
+            parts=[
+                Part.from_function_response(
+                    name=tool_name,
+                    response=_serialize_for_function_response(result),
+                )
+                for (tool_name, _), result in zip(calls, results)
+            ],
+        ),
+        # Add synthesis instruction as separate user message
+        Content(role="user", parts=[Part.from_text(instruction)]),
+    ]
+
+
+async def _discard_follow_up(task: asyncio.Task | None) -> None:
+    """Cancel an unused follow-up request and close its stream if it opened."""
+    if task is None:
+        return
+    task.cancel()
+    await asyncio.wait((task,))
+    if task.cancelled() or task.exception() is not None:
+        return
+    aclose = getattr(task.result(), "aclose", None)
+    if aclose is not None:
+        await aclose()
+
+
 def _format_tool_result(tool_name: str, result: Any) -> str:
     """Format tool result into readable text for display.
 
@@ -317,34 +468,53 @@ class AgentOrchestrator:
             location=settings.vertex_ai_location,
         )
 
+        # Pooled HTTP client shared by tools that call HTTP APIs directly
+        self.http = get_http_client()
+
         # Initialize tools
         self.ga_tool = GoogleAnalyticsTool()
         self.kb_tool = KnowledgeBaseTool()
         self.ads_tool = get_google_ads_tool()  # May be None if not configured
-        self.web_tool = get_web_search_tool()  # Web search tool
+        self.web_tool = get_web_search_tool(http=self.http)  # Web search tool
         self.bq_tool = get_bigquery_tool()  # BigQuery for advanced analytics
         self.leads_tool = get_leads_tool()  # CRM/Leads data from CSV
 
+        # Only the most recent messages are replayed verbatim; older ones are
+        # folded into a summary produced by a cheaper model
+        self.history_window = settings.chat_history_window
+        self.summary_cache: dict[str, str] = {}
+        self._summary_tasks: dict[str, asyncio.Task] = {}
+        self._summary_model: GenerativeModel | None = None
+
+        # Speculative follow-ups: start the next Gemini request while a single
+        # tool runs, predicting the tool returns what it returned last time
+        self.speculative_follow_up = settings.speculative_follow_up
+        self._last_tool_results: OrderedDict[tuple[str, bytes], Any] = OrderedDict()
+
+        # Recent RAG lookups, so repeated questions skip embedding + search
+        self._rag_cache: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
         # Initialize memory and alerts (may be None if BigQuery not available)
         self.memory = get_agent_memory()
         self.alerts = get_campaign_alerts()
 
         # Build Gemini tool definitions
         self.tools = self._build_tools()
+        self._router = ToolRouter(
+            self.ga_tool, self.kb_tool, self.ads_tool, self.web_tool, self.bq_tool, self.leads_tool
+        )
 
-        # Initialize model with TEMPERATURE 1.0 (Google recommendation for Gemini 2.0+)
-        self.model = GenerativeModel(
-            settings.gemini_model,
-            tools=self.tools,
-            generation_config=GenerationConfig(
-                temperature=1.0,  # Recommended by Google for Gemini 2.0+
-                top_p=0.95,
-                max_output_tokens=8192,
-            ),
+        # TEMPERATURE 1.0 (Google recommendation for Gemini 2.0+)
+        self.generation_config = GenerationConfig(
+            temperature=1.0,  # Recommended by Google for Gemini 2.0+
+            top_p=0.95,
+            max_output_tokens=8192,
         )
 
-        # System instruction with Chain-of-Thought prompting
-        self.system_instruction = self._build_system_instruction()
+        # System instruction with Chain-of-Thought prompting; the model is
+        # built around it and rebuilt when the date in it rolls over
+        self._sysinstr_day: int | None = None
+        self._refresh_system_instruction()
 
         # Count tools safely
         try:
@@ -361,48 +531,35 @@ class AgentOrchestrator:
             alerts_enabled=self.alerts is not None,
         )
 
-    def _build_system_instruction(self) -> str:
-        """Build the system instruction with CoT prompting.
+    def _refresh_system_instruction(self) -> None:
+        """Rebuild the dated instruction part and model when the UTC day changes.
 
-        OPTIMIZED: Reduced from ~3500 to ~1800 tokens for better caching.
+        The instruction is passed natively via ``system_instruction=`` instead
+        of being replayed as a user/model turn pair on every request. Only the
+        short dated part is rebuilt; the static prefix is a module constant.
         """
-        now = datetime.now()
-        current_date = now.strftime("%Y-%m-%d")
-
-        return f"""ROL: Consultor estratégico de marketing digital para SCRAM (tecnología y seguridad electrónica).
-Fecha: {current_date}
-
-REGLAS CRÍTICAS:
-1. IDIOMA: Responde en el MISMO idioma del usuario. Nunca mezcles.
-2. SIN PENSAMIENTO VISIBLE: Nunca escribas "Pensamiento", "Voy a", "Déjame", "Let me". Primera palabra = emoji o respuesta directa.
-3. LONGITUD ADAPTATIVA:
-   - Pregunta simple (sí/no, cuánto) → 2-4 oraciones
-   - Pregunta compleja (análisis) → 📊RESUMEN → 🔍ANÁLISIS → 💡INSIGHTS → ✅RECOMENDACIONES
-
-ECOSISTEMA:
-- GA4 Principal (scram2k.com): 508206486
-- GA4 Seguridad: 509271243
-- GA4 Conectividad: 512088907
-
-HERRAMIENTAS - Flujo recomendado:
-1. `google_ads_list_campaigns` PRIMERO para obtener IDs
-2. `leads_from_google_ads` para datos REALES del CRM
-3. Compara siempre: Ads reporta ~1 conversión pero CRM tiene 25+ leads de Ads = TRACKING ROTO
-
-REGLAS DE HERRAMIENTAS:
-- NO uses `google_ads_search` con GAQL (falla)
-- Ejecuta herramientas SIN pedir permiso
-- NUNCA pidas IDs al usuario
-- Encadena hasta 10 herramientas si es necesario
-- Para análisis cruzado usa `bq_auto_analyze`
+        day = int(time.time() // 86400)
+        if day == self._sysinstr_day:
+            return
+
+        self._sysinstr_day = day
+        today = datetime.fromtimestamp(day * 86400, tz=timezone.utc).date()
+        self._dated_part = self._build_dated_part(today.isoformat())
+        self.system_instruction = [_SYSTEM_PREFIX_PART, self._dated_part]
+        self.model = GenerativeModel(
+            settings.gemini_model,
+            tools=self.tools,
+            generation_config=self.generation_config,
+            system_instruction=self.system_instruction,
+        )
 
-BENCHMARKS: CTR >2% bueno, CPC <$2 bueno, Conv Rate >3% bueno
+    def _build_dated_part(self, current_date: str) -> Part:
+        """Build the date-dependent part of the system instruction.
 
-PRINCIPIOS:
-- Sé estratégico, no técnico
-- Cruza datos de múltiples fuentes
-- Siempre da recomendaciones accionables
-- Identifica causa raíz, no síntomas"""
+        Args:
+            current_date: Date (YYYY-MM-DD) embedded in the instruction
+        """
+        return Part.from_text(_DATE_TEMPLATE.format(current_date=current_date))
 
     def _build_tools(self) -> list[Tool]:
         """Build Gemini tool definitions from MCP tools.
@@ -410,6 +567,16 @@ PRINCIPIOS:
         Returns:
             List of Gemini Tool objects
         """
+        cache_key = (
+            self.ads_tool is not None,
+            self.web_tool is not None,
+            self.bq_tool is not None,
+            self.leads_tool is not None,
+        )
+        cached_tools = _FUNCTION_DECL_CACHE.get(cache_key)
+        if cached_tools is not None:
+            return cached_tools
+
         function_declarations = []
 
         # Google Analytics tools
@@ -443,7 +610,62 @@ PRINCIPIOS:
             function_declarations.extend(leads_functions)
             logger.info("Leads tool enabled", csv_path=self.leads_tool.csv_path)
 
-        return [Tool(function_declarations=function_declarations)]
+        tools = [Tool(function_declarations=function_declarations)]
+        _FUNCTION_DECL_CACHE[cache_key] = tools
+        return tools
+
+    @staticmethod
+    def _function_call_args(fc: Any) -> dict[str, Any]:
+        """Convert a function call's proto args into a plain dict.
+
+        Args:
+            fc: FunctionCall returned by the model
+
+        Returns:
+            Tool arguments, or an empty dict if they cannot be converted
+        """
+        # FunctionCall.args re-runs the full proto -> dict conversion on every
+        # access and already returns a fresh dict, so read it once, no copy
+        try:
+            args = fc.args
+        except (TypeError, AttributeError) as arg_err:
+            logger.warning("Failed to convert args", error=str(arg_err))
+            return {}
+        if not args:
+            return {}
+        # Safely convert args - handle potential proto/dict conversion issues
+        if isinstance(args, dict):
+            return args
+        try:
+            return dict(args)
+        except (TypeError, AttributeError) as arg_err:
+            logger.warning("Failed to convert args", error=str(arg_err), args_type=type(args).__name__)
+            return {}
+
+    async def _execute_tool_calls(
+        self,
+        calls: list[tuple[str, dict[str, Any]]],
+    ) -> list[dict[str, Any]]:
+        """Execute the tool calls from one model turn concurrently.
+
+        The calls in a single turn don't depend on each other, so they are
+        gathered instead of awaited one by one. A call that raises is turned
+        into an error result so the others still reach the model.
+
+        Args:
+            calls: (tool_name, tool_args) pairs in the order the model emitted them
+
+        Returns:
+            Tool results in the same order as ``calls``
+        """
+        results = await asyncio.gather(
+            *(self._execute_tool_with_retry(name, args) for name, args in calls),
+            return_exceptions=True,
+        )
+        return [
+            {"error": str(result)} if isinstance(result, BaseException) else result
+            for result in results
+        ]
 
     async def _execute_tool_with_retry(
         self,
@@ -502,40 +724,214 @@ PRINCIPIOS:
         Returns:
             Tool execution result
         """
-        logger.info("Executing tool", tool_name=tool_name, args=tool_args)
+        if _DEBUG:
+            logger.debug("Executing tool", tool_name=tool_name, args=tool_args)
+
+        route = self._router.resolve(tool_name)
+        if route is None:
+            logger.warning("Unknown tool requested", tool_name=tool_name)
+            return {"error": f"Herramienta desconocida: {tool_name}"}
 
         try:
-            # Route to appropriate tool
-            if tool_name.startswith("ga_") or tool_name in [
-                "run_report",
-                "run_realtime_report",
-                "get_property_details",
-                "get_account_summaries",
-            ]:
-                result = await self.ga_tool.execute(tool_name, tool_args)
-            elif tool_name.startswith("kb_") or tool_name in [
-                "search_knowledge_base",
-                "list_documents",
-            ]:
-                result = await self.kb_tool.execute(tool_name, tool_args)
-            elif tool_name.startswith("google_ads_") and self.ads_tool:
-                result = await self.ads_tool.execute(tool_name, tool_args)
-            elif tool_name == "web_search" and self.web_tool:
-                result = await self.web_tool.execute(tool_name, tool_args)
-            elif tool_name.startswith("bq_") and self.bq_tool:
-                result = await self.bq_tool.execute(tool_name, tool_args)
-            elif tool_name.startswith("leads_") and self.leads_tool:
-                result = self.leads_tool.execute(tool_name, tool_args)
-            else:
-                result = {"error": f"Herramienta desconocida: {tool_name}"}
-
-            logger.info("Tool executed", tool_name=tool_name, success=True)
+            execute, is_async = route
+            result = execute(tool_name, tool_args)
+            if is_async:
+                result = await result
             return result
 
         except Exception as e:
-            logger.error("Tool execution failed", tool_name=tool_name, error=str(e))
+            # Arguments are only logged when something went wrong
+            logger.error("Tool execution failed", tool_name=tool_name, args=tool_args, error=str(e))
             return {"error": str(e)}
 
+    async def _run_tool_turn(
+        self,
+        contents: list[Content],
+        fc_parts: list[Part],
+        calls: list[tuple[str, dict[str, Any]]],
+        instruction: str,
+    ) -> AsyncGenerator[dict[str, Any], None]:
+        """Execute one model turn's tool calls and append the exchange.
+
+        Args:
+            contents: Conversation contents, extended in place
+            fc_parts: Function-call parts emitted by the model
+            calls: (tool_name, tool_args) pairs matching ``fc_parts``
+            instruction: Synthesis text sent after the tool results
+
+        Yields:
+            tool_call events ("running", then "completed" in call order)
+        """
+        for tool_name, tool_args in calls:
+            yield {
+                "type": "tool_call",
+                "data": {
+                    "tool_name": tool_name,
+                    "tool_input": tool_args,
+                    "status": "running",
+                },
+            }
+
+        # Execute tools with retry logic
+        results = await self._execute_tool_calls(calls)
+
+        for (tool_name, tool_args), result in zip(calls, results):
+            yield {
+                "type": "tool_call",
+                "data": {
+                    "tool_name": tool_name,
+                    "tool_input": tool_args,
+                    "status": "completed",
+                    "result": result,
+                },
+            }
+
+        self._remember_tool_results(calls, results)
+        contents.extend(_tool_turn_contents(fc_parts, calls, results, instruction))
+
+    @staticmethod
+    def _tool_result_key(tool_name: str, tool_args: dict[str, Any]) -> tuple[str, bytes]:
+        """Key a tool call by name and canonical arguments."""
+        return tool_name, orjson.dumps(tool_args, default=str, option=orjson.OPT_SORT_KEYS)
+
+    def _remember_tool_results(
+        self,
+        calls: list[tuple[str, dict[str, Any]]],
+        results: list[Any],
+    ) -> None:
+        """Keep successful results as predictions for speculative follow-ups."""
+        if not self.speculative_follow_up:
+            return
+        for (tool_name, tool_args), result in zip(calls, results):
+            if isinstance(result, dict) and result.get("error"):
+                continue
+            key = self._tool_result_key(tool_name, tool_args)
+            self._last_tool_results[key] = result
+            self._last_tool_results.move_to_end(key)
+            if len(self._last_tool_results) > _SPECULATION_CACHE_SIZE:
+                self._last_tool_results.popitem(last=False)
+
+    def _start_speculative_follow_up(
+        self,
+        contents: list[Content],
+        fc_parts: list[Part],
+        calls: list[tuple[str, dict[str, Any]]],
+        instruction: str,
+    ) -> tuple[asyncio.Task, Any] | None:
+        """Start the follow-up request before a single tool call finishes.
+
+        The tool's last result for the same arguments is used as the
+        prediction. The follow-up is only kept if the real result matches it.
+
+        Args:
+            contents: Conversation contents before the tool turn
+            fc_parts: Function-call parts emitted by the model
+            calls: (tool_name, tool_args) pairs matching ``fc_parts``
+            instruction: Synthesis text sent after the tool results
+
+        Returns:
+            Tuple of (in-flight follow-up task, predicted result), or None
+        """
+        if not self.speculative_follow_up or len(calls) != 1:
+            return None
+
+        predicted = self._last_tool_results.get(self._tool_result_key(*calls[0]))
+        if predicted is None:
+            return None
+
+        predicted_contents = contents + _tool_turn_contents(fc_parts, calls, [predicted], instruction)
+        task = asyncio.create_task(
+            self.model.generate_content_async(predicted_contents, stream=True)
+        )
+        return task, predicted
+
+    @staticmethod
+    async def _claim_speculative_follow_up(
+        speculation: tuple[asyncio.Task, Any] | None,
+        results: list[Any],
+    ) -> asyncio.Task | None:
+        """Return the speculative follow-up if its prediction held, else discard it."""
+        if speculation is None:
+            return None
+        task, predicted = speculation
+        if results == [predicted]:
+            logger.info("Speculative follow-up reused")
+            return task
+        await _discard_follow_up(task)
+        return None
+
+    async def _drive_follow_ups(
+        self,
+        contents: list[Content],
+        max_tool_calls: int = MAX_CHAINED_TOOL_CALLS,
+        pending_follow_up: asyncio.Task | None = None,
+    ) -> AsyncGenerator[dict[str, Any], None]:
+        """Generate follow-up responses until the model answers in text.
+
+        Text is forwarded as it arrives. A function call ends the stream,
+        runs the tools and starts the next follow-up.
+
+        Args:
+            contents: Conversation contents, extended with each tool turn
+            max_tool_calls: Maximum number of chained tool turns
+            pending_follow_up: Already started request for the first follow-up
+
+        Yields:
+            text and tool_call events
+        """
+        tool_call_count = 1
+        speculation: tuple[asyncio.Task, Any] | None = None
+
+        try:
+            while tool_call_count < max_tool_calls:
+                logger.info("Generating follow-up response", iteration=tool_call_count)
+                if pending_follow_up is not None:
+                    follow_up = await pending_follow_up
+                    pending_follow_up = None
+                else:
+                    follow_up = await self.model.generate_content_async(
+                        contents,
+                        stream=True,
+                    )
+
+                fc_parts: list[Part] = []
+                calls: list[tuple[str, dict[str, Any]]] = []
+                async for follow_chunk in follow_up:
+                    for part in _chunk_parts(follow_chunk):
+                        text = getattr(part, "text", None)
+                        if text:
+                            yield {"type": "text", "content": text}
+                            continue
+                        # A call can still follow a short lead-in sentence
+                        fc = getattr(part, "function_call", None)
+                        if fc:
+                            fc_parts.append(part)
+                            calls.append((fc.name, self._function_call_args(fc)))
+
+                    if fc_parts:
+                        # Break to run the tools and generate the next follow-up
+                        break
+
+                if not fc_parts:
+                    logger.info("Follow-up completed", iterations=tool_call_count)
+                    return
+
+                # More tool calls - execute them together
+                speculation = self._start_speculative_follow_up(contents, fc_parts, calls, _SYNTHESIS_REMINDER)
+                results = []
+                async for event in self._run_tool_turn(contents, fc_parts, calls, _SYNTHESIS_REMINDER):
+                    if event["data"]["status"] == "completed":
+                        results.append(event["data"]["result"])
+                    yield event
+                pending_follow_up = await self._claim_speculative_follow_up(speculation, results)
+                speculation = None
+                tool_call_count += 1
+        finally:
+            # Covers the turn limit as well as the consumer closing us mid-turn
+            await _discard_follow_up(pending_follow_up)
+            if speculation is not None:
+                await _discard_follow_up(speculation[0])
+
     async def _get_memory_context(self, user_id: str = "default") -> str:
         """Get relevant context from memory system.
 
@@ -575,6 +971,144 @@ PRINCIPIOS:
             logger.warning("Failed to check alerts", error=str(e))
             return ""
 
+    async def _fetch_rag(self, query: str) -> str:
+        """Run the RAG retrieval for a query in its own database session.
+
+        Args:
+            query: Text to retrieve context for
+
+        Returns:
+            Formatted context, or empty string
+        """
+        async with async_session_maker() as db:
+            return await get_context_for_query(db, query)
+
+    async def _get_rag_context(self, query: str) -> str:
+        """Get RAG context for a query, skipping trivial and repeated ones.
+
+        Args:
+            query: Last user message
+
+        Returns:
+            Formatted context, or empty string
+        """
+        key = query.strip().lower()
+        if len(key) < _RAG_MIN_QUERY_LEN or key in _RAG_SKIP_QUERIES:
+            return ""
+
+        now = time.monotonic()
+        cached = self._rag_cache.get(key)
+        if cached is not None:
+            stored_at, context = cached
+            if now - stored_at < _RAG_CACHE_TTL:
+                self._rag_cache.move_to_end(key)
+                return context
+            del self._rag_cache[key]
+
+        context = await self._fetch_rag(query)
+
+        self._rag_cache[key] = (now, context)
+        if len(self._rag_cache) > _RAG_CACHE_SIZE:
+            self._rag_cache.popitem(last=False)
+        return context
+
+    @staticmethod
+    def _augment(content: str, memory_context: str, rag_context: str) -> list[Part]:
+        """Build the parts of the last user message with its context.
+
+        Memory and RAG context each get their own Part ahead of the question.
+
+        Args:
+            content: The user's message
+            memory_context: Context from previous sessions
+            rag_context: Relevant document excerpts
+
+        Returns:
+            Parts for the user Content
+        """
+        parts = []
+        if memory_context:
+            parts.append(Part.from_text(f"**Contexto de sesiones anteriores:**\n{memory_context}"))
+        if rag_context:
+            parts.append(Part.from_text(f"**Documentos relevantes:**\n{rag_context}"))
+        if not parts:
+            return [Part.from_text(content)]
+        parts.append(Part.from_text(f"**Pregunta del usuario:** {content}"))
+        return parts
+
+    def _split_history(
+        self, messages: list[dict[str, str]]
+    ) -> tuple[list[dict[str, str]], list[dict[str, str]]]:
+        """Split history into messages to summarize and messages to replay.
+
+        The cut point moves in steps of ``history_window`` so the summarized
+        prefix (and its cached summary) stays the same for several turns.
+
+        Args:
+            messages: Full conversation history
+
+        Returns:
+            Tuple of (older messages, recent messages)
+        """
+        window = self.history_window
+        if len(messages) <= window:
+            return [], messages
+        cut = (len(messages) - window) // window * window
+        return messages[:cut], messages[cut:]
+
+    def _cached_summary(self, older: list[dict[str, str]]) -> str | None:
+        """Return the summary of ``older`` if one is cached.
+
+        On a miss the summary is generated in the background, so the request
+        never waits on the extra model round trip; a later turn with the same
+        prefix picks it up.
+
+        Args:
+            older: Messages that fall outside the history window
+
+        Returns:
+            Cached summary text, or None if it is not available yet
+        """
+        key = hashlib.sha256(
+            orjson.dumps(older, default=str, option=orjson.OPT_SORT_KEYS)
+        ).hexdigest()
+        cached = self.summary_cache.get(key)
+        if cached is not None:
+            return cached or None
+
+        if key not in self._summary_tasks:
+            task = asyncio.create_task(self._summarize_history(key, older))
+            self._summary_tasks[key] = task
+            task.add_done_callback(lambda _: self._summary_tasks.pop(key, None))
+        return None
+
+    async def _summarize_history(self, key: str, older: list[dict[str, str]]) -> None:
+        """Summarize trimmed history and store it in the summary cache.
+
+        Args:
+            key: Cache key for ``older``
+            older: Messages that fall outside the history window
+        """
+        transcript = "\n".join(f"{m['role']}: {m['content']}" for m in older)
+        prompt = (
+            "Resume la siguiente conversación en un máximo de 10 viñetas. "
+            "Conserva cifras, nombres de campañas, fechas y decisiones tomadas.\n\n"
+            f"{transcript}"
+        )
+
+        try:
+            if self._summary_model is None:
+                self._summary_model = GenerativeModel(settings.gemini_summary_model)
+            response = await self._summary_model.generate_content_async(prompt)
+            summary = response.text.strip()
+        except Exception as e:
+            logger.warning("History summarization failed", error=str(e), messages=len(older))
+            return
+
+        if len(self.summary_cache) >= _SUMMARY_CACHE_SIZE:
+            self.summary_cache.pop(next(iter(self.summary_cache)))
+        self.summary_cache[key] = summary
+
     async def stream_response(
         self,
         messages: list[dict[str, str]],
@@ -584,6 +1118,9 @@ PRINCIPIOS:
     ) -> AsyncGenerator[dict[str, Any], None]:
         """Stream response from Gemini with tool support.
 
+        Text events that arrive in quick succession are merged, so the SSE
+        handler sees fewer, larger frames.
+
         Args:
             messages: Conversation history
             use_rag: Whether to include RAG context
@@ -593,61 +1130,85 @@ PRINCIPIOS:
         Yields:
             Stream events (text, tool_call, error, done)
         """
-        try:
-            # Build conversation contents
-            contents: list[Content] = []
+        events = self._stream_events(messages, use_rag, use_analytics, session_id)
+        async with aclosing(coalesce_text(events)) as stream:
+            async for event in stream:
+                yield event
 
-            # Add system instruction as first user message
-            contents.append(
-                Content(
-                    role="user",
-                    parts=[Part.from_text(self.system_instruction)],
-                )
-            )
-            contents.append(
-                Content(
-                    role="model",
-                    parts=[Part.from_text("Entendido. Estoy listo para ayudarte con análisis estratégico de marketing. Responderé siempre en tu idioma, usando datos reales y dando recomendaciones accionables.")],
-                )
-            )
-
-            # Get RAG context for the last user message
-            rag_context = ""
+    async def _stream_events(
+        self,
+        messages: list[dict[str, str]],
+        use_rag: bool,
+        use_analytics: bool,
+        session_id: str,
+    ) -> AsyncGenerator[dict[str, Any], None]:
+        """Produce the raw, uncoalesced event stream for stream_response."""
+        speculation: tuple[asyncio.Task, Any] | None = None
+        rag_task: asyncio.Task[str] | None = None
+        try:
+            # Start RAG retrieval for the last user message right away; it runs
+            # while the rest of the request is assembled
             if use_rag and messages:
                 last_user_msg = next(
                     (m["content"] for m in reversed(messages) if m["role"] == "user"),
                     None,
                 )
                 if last_user_msg:
-                    async with async_session_maker() as db:
-                        rag_context = await get_context_for_query(db, last_user_msg)
+                    rag_task = asyncio.create_task(self._get_rag_context(last_user_msg))
+
+            # Build conversation contents (the system instruction is attached
+            # to the model itself)
+            self._refresh_system_instruction()
+            contents: list[Content] = []
 
             # Get memory context
             memory_context = await self._get_memory_context()
 
+            # Bound the history: what falls outside the window is replaced by
+            # its summary once one is cached, and replayed verbatim until then
+            older, recent = self._split_history(messages)
+            summary = self._cached_summary(older) if older else None
+            if older and summary is None:
+                recent = messages
+
+            # RAG and memory context go on the last message if it's a user turn
+            last_idx = len(recent) - 1
+            augment_last = bool(recent) and _ROLE_MAP.get(recent[-1]["role"]) == "user"
+            rag_context = ""
+            if rag_task:
+                if augment_last:
+                    try:
+                        rag_context = await rag_task
+                    except Exception as e:
+                        # Answer without document context rather than fail
+                        logger.warning("RAG retrieval failed", error=str(e))
+                else:
+                    rag_task.cancel()
+
             # Add conversation history
-            for msg in messages:
-                role = "user" if msg["role"] == "user" else "model"
-                content = msg["content"]
-
-                # Add RAG and memory context to the last user message
-                if role == "user" and msg == messages[-1]:
-                    context_parts = []
-                    if memory_context:
-                        context_parts.append(f"**Contexto de sesiones anteriores:**\n{memory_context}")
-                    if rag_context:
-                        context_parts.append(f"**Documentos relevantes:**\n{rag_context}")
-
-                    if context_parts:
-                        content = "\n\n".join(context_parts) + f"\n\n**Pregunta del usuario:** {content}"
-
-                contents.append(
-                    Content(role=role, parts=[Part.from_text(content)])
+            contents += [
+                Content(
+                    role=_ROLE_MAP.get(msg["role"], "model"),
+                    parts=(
+                        self._augment(msg["content"], memory_context, rag_context)
+                        if augment_last and i == last_idx
+                        else [Part.from_text(msg["content"])]
+                    ),
                 )
+                for i, msg in enumerate(recent)
+            ]
+            if summary:
+                # The summary stands in for earlier model output; it is merged
+                # into a leading model turn so roles keep alternating
+                summary_part = Part.from_text(f"**Resumen de la conversación anterior:**\n{summary}")
+                if contents and contents[0].role == "model":
+                    contents[0] = Content(role="model", parts=[summary_part, *contents[0].parts])
+                else:
+                    contents.insert(0, Content(role="model", parts=[summary_part]))
 
             # Start streaming
             logger.info("Starting Gemini stream", session_id=session_id)
-            response = self.model.generate_content(
+            response = await self.model.generate_content_async(
                 contents,
                 stream=True,
             )
@@ -656,203 +1217,74 @@ PRINCIPIOS:
             total_tool_calls = 0
 
             # Process response chunks
-            for chunk in response:
+            async for chunk in response:
                 chunk_count += 1
                 # Check for function calls
                 try:
-                    has_parts = chunk.candidates and chunk.candidates[0].content.parts
+                    parts = _chunk_parts(chunk)
                 except Exception as chunk_err:
                     logger.warning("Error accessing chunk content", error=str(chunk_err), chunk_num=chunk_count)
                     continue
-                if has_parts:
-                    for part in chunk.candidates[0].content.parts:
-                        if hasattr(part, "function_call") and part.function_call:
-                            fc = part.function_call
-                            tool_name = fc.name
-                            # Safely convert args - handle potential proto/dict conversion issues
-                            try:
-                                tool_args = dict(fc.args) if fc.args else {}
-                            except (TypeError, AttributeError) as arg_err:
-                                logger.warning("Failed to convert args", error=str(arg_err), args_type=type(fc.args).__name__)
-                                tool_args = {}
-
-                            # Emit tool call event
-                            yield {
-                                "type": "tool_call",
-                                "data": {
-                                    "tool_name": tool_name,
-                                    "tool_input": tool_args,
-                                    "status": "running",
-                                },
-                            }
-
-                            # Execute tool with retry logic
-                            result = await self._execute_tool_with_retry(tool_name, tool_args)
-                            total_tool_calls += 1
-
-                            # Emit tool result
-                            yield {
-                                "type": "tool_call",
-                                "data": {
-                                    "tool_name": tool_name,
-                                    "tool_input": tool_args,
-                                    "status": "completed",
-                                    "result": result,
-                                },
-                            }
-
-                            # Continue conversation with tool result
-                            contents.append(
-                                Content(
-                                    role="model",
-                                    parts=[part],
-                                )
-                            )
-
-                            # Add tool result with synthesis instruction
-                            synthesis_instruction = """RESPONDE AHORA. Tienes los datos.
-
-🚫 PROHIBIDO: "Pensamiento", "Voy a", "RECUERDA", tablas crudas, JSON
-✅ TU PRIMERA PALABRA: emoji (📊/🔍/✅) o respuesta directa
-
-ADAPTA LA LONGITUD:
-- Pregunta simple (sí/no, cuánto, cuál) → 2-4 oraciones máximo
-- Pregunta compleja (por qué, analiza, plan) → formato completo:
-  📊 RESUMEN (1 oración) → 🔍 ANÁLISIS → 💡 INSIGHTS → ✅ RECOMENDACIONES
-
-Si faltan datos, llama otra herramienta. Si ya tienes suficiente, RESPONDE."""
-
-                            # Add function response as separate Content
-                            # (combining with text can cause SDK issues)
-                            contents.append(
-                                Content(
-                                    role="user",
-                                    parts=[
-                                        Part.from_function_response(
-                                            name=tool_name,
-                                            response=_serialize_for_function_response(result),
-                                        ),
-                                    ],
-                                )
-                            )
-                            # Add synthesis instruction as separate user message
-                            contents.append(
-                                Content(
-                                    role="user",
-                                    parts=[Part.from_text(synthesis_instruction)],
-                                )
-                            )
-
-                            # Get follow-up response - handle chained tool calls
-                            max_tool_calls = 10  # Allow up to 10 chained calls
-                            tool_call_count = 1
-
-                            while tool_call_count < max_tool_calls:
-                                try:
-                                    logger.info("Generating follow-up response", iteration=tool_call_count, total=total_tool_calls)
-                                    follow_up = self.model.generate_content(
-                                        contents,
-                                        stream=True,
-                                    )
-
-                                    has_function_call = False
-                                    for follow_chunk in follow_up:
-                                        if follow_chunk.candidates and follow_chunk.candidates[0].content.parts:
-                                            for follow_part in follow_chunk.candidates[0].content.parts:
-                                                if hasattr(follow_part, "function_call") and follow_part.function_call:
-                                                    # Another tool call - execute it
-                                                    has_function_call = True
-                                                    fc = follow_part.function_call
-                                                    next_tool_name = fc.name
-                                                    next_tool_args = dict(fc.args) if fc.args else {}
-
-                                                    yield {
-                                                        "type": "tool_call",
-                                                        "data": {
-                                                            "tool_name": next_tool_name,
-                                                            "tool_input": next_tool_args,
-                                                            "status": "running",
-                                                        },
-                                                    }
-
-                                                    next_result = await self._execute_tool_with_retry(
-                                                        next_tool_name, next_tool_args
-                                                    )
-                                                    total_tool_calls += 1
-
-                                                    yield {
-                                                        "type": "tool_call",
-                                                        "data": {
-                                                            "tool_name": next_tool_name,
-                                                            "tool_input": next_tool_args,
-                                                            "status": "completed",
-                                                            "result": next_result,
-                                                        },
-                                                    }
-
-                                                    # Add to conversation with synthesis reminder
-                                                    contents.append(
-                                                        Content(role="model", parts=[follow_part])
-                                                    )
-
-                                                    # Add function response as separate Content
-                                                    contents.append(
-                                                        Content(
-                                                            role="user",
-                                                            parts=[
-                                                                Part.from_function_response(
-                                                                    name=next_tool_name,
-                                                                    response=_serialize_for_function_response(next_result),
-                                                                ),
-                                                            ],
-                                                        )
-                                                    )
-                                                    # Add synthesis reminder as separate user message
-                                                    synthesis_reminder = """Datos obtenidos. RESPONDE AHORA o llama otra herramienta.
-🚫 Sin "Pensamiento", "Voy a", tablas crudas
-✅ Adapta longitud: simple=2-4 oraciones, complejo=formato completo"""
-                                                    contents.append(
-                                                        Content(
-                                                            role="user",
-                                                            parts=[Part.from_text(synthesis_reminder)],
-                                                        )
-                                                    )
-                                                    tool_call_count += 1
-                                                    break  # Break to generate next follow-up
-
-                                                elif hasattr(follow_part, "text") and follow_part.text:
-                                                    yield {"type": "text", "content": follow_part.text}
-
-                                        # Also check direct text access for streaming
-                                        elif hasattr(follow_chunk, "text") and follow_chunk.text:
-                                            yield {"type": "text", "content": follow_chunk.text}
-
-                                    if not has_function_call:
-                                        logger.info("Follow-up completed", total_tool_calls=total_tool_calls)
-                                        break
-
-                                except Exception as follow_up_error:
-                                    logger.error(
-                                        "Follow-up generation failed",
-                                        error=str(follow_up_error),
-                                        error_type=type(follow_up_error).__name__,
-                                        tool_name=tool_name,
-                                        tool_call_count=tool_call_count,
-                                        exc_info=True
-                                    )
-                                    # Use formatted result with template
-                                    formatted_result = _format_tool_result(tool_name, result)
-                                    yield {
-                                        "type": "text",
-                                        "content": formatted_result
-                                    }
-                                    break
-
-                        elif hasattr(part, "text") and part.text:
-                            yield {"type": "text", "content": part.text}
+                if parts:
+                    # Independent tool calls in the same chunk run concurrently
+                    fc_parts = []
+                    calls = []
+                    for part in parts:
+                        fc = getattr(part, "function_call", None)
+                        if fc:
+                            fc_parts.append(part)
+                            calls.append((fc.name, self._function_call_args(fc)))
+                        else:
+                            text = getattr(part, "text", None)
+                            if text:
+                                yield {"type": "text", "content": text}
+
+                    if not fc_parts:
+                        continue
+
+                    # Execute tools and feed the results back with the
+                    # synthesis instruction
+                    speculation = self._start_speculative_follow_up(
+                        contents, fc_parts, calls, _SYNTHESIS_INSTRUCTION
+                    )
+                    results = []
+                    async for event in self._run_tool_turn(contents, fc_parts, calls, _SYNTHESIS_INSTRUCTION):
+                        if event["data"]["status"] == "completed":
+                            results.append(event["data"]["result"])
+                        yield event
+                    total_tool_calls += len(calls)
+                    pending_follow_up = await self._claim_speculative_follow_up(speculation, results)
+                    speculation = None
+
+                    # Get follow-up response - handle chained tool calls
+                    try:
+                        async with aclosing(
+                            self._drive_follow_ups(contents, pending_follow_up=pending_follow_up)
+                        ) as follow_ups:
+                            async for event in follow_ups:
+                                if event["type"] == "tool_call" and event["data"]["status"] == "completed":
+                                    total_tool_calls += 1
+                                yield event
+                    except Exception as follow_up_error:
+                        logger.error(
+                            "Follow-up generation failed",
+                            error=str(follow_up_error),
+                            error_type=type(follow_up_error).__name__,
+                            tool_names=[name for name, _ in calls],
+                            exc_info=True
+                        )
+                        # Use formatted results with templates
+                        formatted_result = "\n\n".join(
+                            _format_tool_result(tool_name, result)
+                            for (tool_name, _), result in zip(calls, results)
+                        )
+                        yield {
+                            "type": "text",
+                            "content": formatted_result
+                        }
                 else:
                     # Log when chunk has no usable content
-                    if chunk_count <= 3:
+                    if _DEBUG and chunk_count <= 3:
                         logger.debug("Chunk has no candidates or parts", chunk_num=chunk_count)
 
             logger.info("Gemini stream completed", total_chunks=chunk_count, total_tool_calls=total_tool_calls)
@@ -878,6 +1310,16 @@ Si faltan datos, llama otra herramienta. Si ya tienes suficiente, RESPONDE."""
             logger.error("Stream response error", error=str(e), exc_info=True)
             yield {"type": "error", "message": str(e)}
             yield {"type": "done"}
+        finally:
+            # A speculative follow-up is still ours if the turn was cut short
+            if speculation is not None:
+                await _discard_follow_up(speculation[0])
+            # So is RAG retrieval if we never got as far as awaiting it
+            if rag_task is not None:
+                if not rag_task.done():
+                    rag_task.cancel()
+                elif not rag_task.cancelled():
+                    rag_task.exception()  # retrieved, so a failure is not reported as lost
 
     async def get_daily_digest(self) -> str:
         """Generate a daily digest with alerts and insights.
@@ -893,3 +1335,16 @@ Si faltan datos, llama otra herramienta. Si ya tienes suficiente, RESPONDE."""
         except Exception as e:
             logger.error("Failed to generate daily digest", error=str(e))
             return f"Error generando resumen: {str(e)}"
+
+
+@functools.lru_cache(maxsize=1)
+def get_orchestrator() -> AgentOrchestrator:
+    """Get the process-wide orchestrator instance.
+
+    Vertex AI init, tool construction and the model are set up once and
+    shared by every request.
+
+    Returns:
+        AgentOrchestrator instance
+    """
+    return AgentOrchestrator()
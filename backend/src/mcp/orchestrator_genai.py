@@ -11,15 +11,21 @@ Key differences from legacy orchestrator:
 """
 
 import asyncio
-import json
+import functools
 import os
-from datetime import datetime
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import aclosing
+from datetime import datetime, timezone
 from typing import Any, AsyncGenerator
-import asyncio
 
+import orjson
 import structlog
 from google import genai
 from google.genai import types
+from vertexai.generative_models import FunctionDeclaration
 
 from src.config import get_settings
 from src.database.connection import async_session_maker
@@ -30,16 +36,112 @@ from src.mcp.web_search import get_web_search_tool, WebSearchTool
 from src.mcp.bigquery import get_bigquery_tool, BigQueryTool
 from src.mcp.leads_tool import get_leads_tool, LeadsTool
 from src.mcp.memory import get_agent_memory
+from src.mcp.streaming import coalesce_text
+from src.mcp.tool_routing import ToolRouter
 from src.mcp.alerts import get_campaign_alerts
 from src.rag.retrieval import get_context_for_query
 
 logger = structlog.get_logger()
 settings = get_settings()
 
+# Debug-only log calls are skipped entirely unless LOG_LEVEL is DEBUG
+_DEBUG = settings.log_level.upper() == "DEBUG"
+
 # Retry configuration
 MAX_RETRIES = 3
 RETRY_DELAY = 1.0
 
+# Serialized tool results above this size are truncated before going back to Gemini
+MAX_FUNCTION_RESPONSE_BYTES = 256 * 1024
+
+# Converted declarations keyed by which optional tools are available
+# (ads, web, bigquery, leads)
+_CACHED_TOOLS: dict[tuple[bool, bool, bool, bool], list[types.FunctionDeclaration]] = {}
+_TOOLS_LOCK = threading.Lock()
+
+# Converted declarations keyed by the source declaration object
+_DECLARATION_CACHE: weakref.WeakKeyDictionary[FunctionDeclaration, types.FunctionDeclaration] = (
+    weakref.WeakKeyDictionary()
+)
+
+# Static system prompt; {DATE} is substituted per day
+_SYSTEM_PROMPT_TEMPLATE = """ROL: Consultor estratégico de marketing digital para SCRAM (tecnología y seguridad electrónica).
+Fecha: {DATE}
+
+REGLAS CRÍTICAS:
+1. IDIOMA: Responde en el MISMO idioma del usuario. Nunca mezcles.
+2. SIN PENSAMIENTO VISIBLE: Nunca escribas "Pensamiento", "Voy a", "Déjame", "Let me". Primera palabra = emoji o respuesta directa.
+3. LONGITUD ADAPTATIVA:
+   - Pregunta simple (sí/no, cuánto) → 2-4 oraciones
+   - Pregunta compleja (análisis) → 📊RESUMEN → 🔍ANÁLISIS → 💡INSIGHTS → ✅RECOMENDACIONES
+
+ECOSISTEMA:
+- GA4 Principal (scram2k.com): 508206486
+- GA4 Seguridad: 509271243
+- GA4 Conectividad: 512088907
+
+HERRAMIENTAS - Flujo recomendado:
+1. `google_ads_list_campaigns` PRIMERO para obtener IDs
+2. `leads_from_google_ads` para datos REALES del CRM
+3. Compara siempre: Ads reporta ~1 conversión pero CRM tiene 25+ leads de Ads = TRACKING ROTO
+
+REGLAS DE HERRAMIENTAS:
+- VELOCIDAD: Llama TODAS las herramientas que necesites EN UN SOLO TURNO (en paralelo). No esperes resultado de una para llamar otra.
+- Ejemplo: Para "estoy ganando dinero?" llama google_ads_list_campaigns + leads_get_summary + leads_pipeline_value JUNTAS en el mismo turno.
+- NO uses `google_ads_search` con GAQL (falla)
+- Ejecuta herramientas SIN pedir permiso
+- NUNCA pidas IDs al usuario
+- Para análisis cruzado usa `bq_auto_analyze`
+
+BENCHMARKS: CTR >2% bueno, CPC <$2 bueno, Conv Rate >3% bueno
+
+PRINCIPIOS:
+- Sé estratégico, no técnico
+- Cruza datos de múltiples fuentes
+- Siempre da recomendaciones accionables
+- Identifica causa raíz, no síntomas"""
+
+# Tool-result cache: seconds a result stays fresh, per tool (default 60s).
+# 0 disables caching, e.g. for CRM leads and realtime data.
+_TOOL_CACHE_TTL: dict[str, float] = {
+    "google_ads_list_campaigns": 300,
+    "search_knowledge_base": 600,
+    "list_documents": 600,
+    "ga_list_properties": 3600,
+    "get_property_details": 3600,
+    "web_search": 600,
+    "run_realtime_report": 0,
+    "leads_get_summary": 0,
+    "leads_by_source": 0,
+    "leads_by_status": 0,
+    "leads_from_google_ads": 0,
+    "leads_pipeline_value": 0,
+    "leads_cross_analyze_ads": 0,
+    "leads_for_offline_conversion": 0,
+}
+_TOOL_CACHE_DEFAULT_TTL = 60.0
+_TOOL_CACHE_SIZE = 256
+
+# Text delta coalescing budget for the SSE stream
+TEXT_COALESCE_WINDOW = 0.025  # seconds
+TEXT_COALESCE_MAX_CHARS = 64
+
+# Max tool calls in flight at once, to stay within provider rate limits
+MAX_CONCURRENT_TOOLS = 8
+
+# Finish reasons that mean the model refused or was cut off by a filter
+_BLOCKED_FINISH_REASONS = frozenset({
+    types.FinishReason.SAFETY,
+    types.FinishReason.BLOCKLIST,
+    types.FinishReason.PROHIBITED_CONTENT,
+    types.FinishReason.SPII,
+})
+
+
+# Flat dicts up to this many scalar fields are passed through unserialized
+_SMALL_RESULT_KEYS = 4
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
 
 def _serialize_result(result: Any) -> dict:
     """Serialize tool result for function response."""
@@ -50,11 +152,93 @@ def _serialize_result(result: Any) -> dict:
             return {"result": result}
         if isinstance(result, (bool, int, float)):
             return {"result": str(result)}
-        return {"result": json.dumps(result, ensure_ascii=False, default=str)}
+        if (
+            isinstance(result, dict)
+            and len(result) <= _SMALL_RESULT_KEYS
+            and all(type(k) is str and isinstance(v, _SCALAR_TYPES) for k, v in result.items())
+        ):
+            # Errors and tiny status dicts go to Gemini as-is
+            return result
+        payload = _dumps_result(result)
+        if len(payload) > MAX_FUNCTION_RESPONSE_BYTES:
+            # Keep huge BigQuery/GA payloads from ballooning every later turn
+            return _truncate_result(result, len(payload))
+        return {"result": payload.decode()}
     except Exception:
         return {"result": str(result)[:2000]}
 
 
+def _dumps_result(result: Any) -> bytes:
+    """Serialize a tool result to JSON bytes."""
+    return orjson.dumps(result, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _truncate_result(result: Any, original_bytes: int) -> dict:
+    """Shrink an oversized result to valid JSON under MAX_FUNCTION_RESPONSE_BYTES.
+
+    The longest row list (the result itself, or a top-level value of a dict
+    result) keeps as many leading items as fit. Without such a list, only
+    the scalar fields of a dict result are kept.
+    """
+    if isinstance(result, list):
+        rows, rebuild = result, lambda kept: kept
+    elif isinstance(result, dict) and any(isinstance(v, list) for v in result.values()):
+        key = max((k for k, v in result.items() if isinstance(v, list)), key=lambda k: len(result[k]))
+        rows, rebuild = result[key], lambda kept: {**result, key: kept}
+    else:
+        rows, rebuild = None, None
+
+    if rows is not None:
+        # Largest number of leading rows that still fits
+        lo, hi = 0, len(rows)
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if len(_dumps_result(rebuild(rows[:mid]))) <= MAX_FUNCTION_RESPONSE_BYTES:
+                lo = mid
+            else:
+                hi = mid - 1
+        payload = _dumps_result(rebuild(rows[:lo]))
+        if len(payload) <= MAX_FUNCTION_RESPONSE_BYTES:
+            return {
+                "result": payload.decode(),
+                "truncated": True,
+                "omitted_count": len(rows) - lo,
+                "original_bytes": original_bytes,
+            }
+
+    scalars = (
+        {k: v for k, v in result.items() if isinstance(v, _SCALAR_TYPES)}
+        if isinstance(result, dict)
+        else {}
+    )
+    return {
+        "result": _dumps_result(scalars).decode(),
+        "truncated": True,
+        "omitted_count": (len(result) - len(scalars)) if isinstance(result, (dict, list)) else 1,
+        "original_bytes": original_bytes,
+    }
+
+
+@functools.lru_cache(maxsize=2)
+def _build_system_instruction_for(date_str: str) -> str:
+    """Build the system instruction for a date (YYYY-MM-DD)."""
+    return _SYSTEM_PROMPT_TEMPLATE.replace("{DATE}", date_str)
+
+
+def _convert_declaration(fd: FunctionDeclaration) -> types.FunctionDeclaration:
+    """Convert a Vertex AI FunctionDeclaration to its Gen AI SDK form.
+
+    Built from the public to_dict() and cached per declaration object
+    (tools share theirs per class), so rebuilding the tools for another
+    availability combination does not convert them again.
+    """
+    converted = _DECLARATION_CACHE.get(fd)
+    if converted is None:
+        converted = types.FunctionDeclaration.model_validate(fd.to_dict())
+        _DECLARATION_CACHE[fd] = converted
+    return converted
+
+
 class GenAIOrchestrator:
     """Orchestrator using the new Google Gen AI SDK."""
 
@@ -80,6 +264,18 @@ class GenAIOrchestrator:
         self.bq_tool = get_bigquery_tool()
         self.leads_tool = get_leads_tool()
 
+        # Tool name -> (execute method, is_async), built once
+        self._router = ToolRouter(
+            self.ga_tool, self.kb_tool, self.ads_tool, self.web_tool, self.bq_tool, self.leads_tool
+        )
+
+        # Bounds parallel tool execution across all streams
+        self._tool_semaphore = asyncio.Semaphore(MAX_CONCURRENT_TOOLS)
+
+        # Recent tool results, least recently used first:
+        # (session_id, tool_name, canonical args) -> (stored_at, result)
+        self._tool_cache: OrderedDict[tuple[str, str, bytes], tuple[float, Any]] = OrderedDict()
+
         # Memory and alerts
         self.memory = get_agent_memory()
         self.alerts = get_campaign_alerts()
@@ -87,8 +283,16 @@ class GenAIOrchestrator:
         # Build tool declarations
         self.tools = self._build_tools()
 
-        # System instruction
-        self.system_instruction = self._build_system_instruction()
+        # Generation settings shared by every request; only the system
+        # instruction varies (it carries the date)
+        self._base_config_kwargs: dict[str, Any] = {
+            "temperature": 1.0,
+            "top_p": 0.95,
+            "max_output_tokens": 8192,
+            "tools": [types.Tool(function_declarations=self.tools)],
+            # Disable automatic function calling - we handle it manually
+            "automatic_function_calling": types.AutomaticFunctionCallingConfig(disable=True),
+        }
 
         # Model name
         self.model_name = settings.gemini_model
@@ -99,116 +303,108 @@ class GenAIOrchestrator:
             tools_count=len(self.tools),
         )
 
-    def _build_system_instruction(self) -> str:
-        """Build optimized system instruction."""
-        current_date = datetime.now().strftime("%Y-%m-%d")
-
-        return f"""ROL: Consultor estratégico de marketing digital para SCRAM (tecnología y seguridad electrónica).
-Fecha: {current_date}
-
-REGLAS CRÍTICAS:
-1. IDIOMA: Responde en el MISMO idioma del usuario. Nunca mezcles.
-2. SIN PENSAMIENTO VISIBLE: Nunca escribas "Pensamiento", "Voy a", "Déjame", "Let me". Primera palabra = emoji o respuesta directa.
-3. LONGITUD ADAPTATIVA:
-   - Pregunta simple (sí/no, cuánto) → 2-4 oraciones
-   - Pregunta compleja (análisis) → 📊RESUMEN → 🔍ANÁLISIS → 💡INSIGHTS → ✅RECOMENDACIONES
-
-ECOSISTEMA:
-- GA4 Principal (scram2k.com): 508206486
-- GA4 Seguridad: 509271243
-- GA4 Conectividad: 512088907
-
-HERRAMIENTAS - Flujo recomendado:
-1. `google_ads_list_campaigns` PRIMERO para obtener IDs
-2. `leads_from_google_ads` para datos REALES del CRM
-3. Compara siempre: Ads reporta ~1 conversión pero CRM tiene 25+ leads de Ads = TRACKING ROTO
-
-REGLAS DE HERRAMIENTAS:
-- VELOCIDAD: Llama TODAS las herramientas que necesites EN UN SOLO TURNO (en paralelo). No esperes resultado de una para llamar otra.
-- Ejemplo: Para "estoy ganando dinero?" llama google_ads_list_campaigns + leads_get_summary + leads_pipeline_value JUNTAS en el mismo turno.
-- NO uses `google_ads_search` con GAQL (falla)
-- Ejecuta herramientas SIN pedir permiso
-- NUNCA pidas IDs al usuario
-- Para análisis cruzado usa `bq_auto_analyze`
-
-BENCHMARKS: CTR >2% bueno, CPC <$2 bueno, Conv Rate >3% bueno
-
-PRINCIPIOS:
-- Sé estratégico, no técnico
-- Cruza datos de múltiples fuentes
-- Siempre da recomendaciones accionables
-- Identifica causa raíz, no síntomas"""
-
     def _build_tools(self) -> list[types.FunctionDeclaration]:
-        """Build function declarations for Gen AI SDK."""
-        declarations = []
-
-        # Helper to convert legacy FunctionDeclaration to dict
-        def convert_declaration(fd) -> dict:
-            # Use to_dict() if available (vertexai FunctionDeclaration)
-            if hasattr(fd, 'to_dict'):
-                return fd.to_dict()
-            # Fallback for other types
-            return {
-                "name": getattr(fd, 'name', fd._raw_function_declaration.name if hasattr(fd, '_raw_function_declaration') else 'unknown'),
-                "description": getattr(fd, 'description', fd._raw_function_declaration.description if hasattr(fd, '_raw_function_declaration') else ''),
-                "parameters": getattr(fd, 'parameters', {}),
-            }
+        """Build function declarations for Gen AI SDK.
 
-        # Google Analytics
-        for fd in self.ga_tool.get_function_declarations():
-            declarations.append(convert_declaration(fd))
+        Declarations are static, so the converted list is built once per
+        combination of available tools and shared by every instance.
+        """
+        cache_key = (
+            self.ads_tool is not None,
+            self.web_tool is not None,
+            self.bq_tool is not None,
+            self.leads_tool is not None,
+        )
+        with _TOOLS_LOCK:
+            cached = _CACHED_TOOLS.get(cache_key)
+            if cached is not None:
+                return cached
+
+            declarations = []
+            for tool in (
+                self.ga_tool,      # Google Analytics
+                self.kb_tool,      # Knowledge Base
+                self.ads_tool,     # Google Ads
+                self.web_tool,     # Web Search
+                self.bq_tool,      # BigQuery
+                self.leads_tool,   # Leads
+            ):
+                if tool:
+                    declarations.extend(
+                        _convert_declaration(fd) for fd in tool.get_function_declarations()
+                    )
+
+            _CACHED_TOOLS[cache_key] = declarations
+            return declarations
 
-        # Knowledge Base
-        for fd in self.kb_tool.get_function_declarations():
-            declarations.append(convert_declaration(fd))
+    async def _execute_tool(self, tool_name: str, tool_args: dict) -> Any:
+        """Execute a tool and return result."""
+        if _DEBUG:
+            logger.debug("Executing tool", tool_name=tool_name, args=tool_args)
 
-        # Google Ads
-        if self.ads_tool:
-            for fd in self.ads_tool.get_function_declarations():
-                declarations.append(convert_declaration(fd))
+        route = self._router.resolve(tool_name)
+        if route is None:
+            return {"error": f"Unknown tool: {tool_name}"}
 
-        # Web Search
-        if self.web_tool:
-            for fd in self.web_tool.get_function_declarations():
-                declarations.append(convert_declaration(fd))
+        try:
+            handler, is_async = route
+            return await handler(tool_name, tool_args) if is_async else handler(tool_name, tool_args)
+        except Exception as e:
+            # Arguments are only logged when something went wrong
+            logger.error("Tool execution failed", tool_name=tool_name, args=tool_args, error=str(e))
+            return {"error": str(e)}
 
-        # BigQuery
-        if self.bq_tool:
-            for fd in self.bq_tool.get_function_declarations():
-                declarations.append(convert_declaration(fd))
+    async def _fetch_rag(self, query: str) -> str:
+        """Retrieve RAG context for a query in its own database session.
 
-        # Leads
-        if self.leads_tool:
-            for fd in self.leads_tool.get_function_declarations():
-                declarations.append(convert_declaration(fd))
+        Failures are logged and treated as "no context".
+        """
+        try:
+            async with async_session_maker() as db:
+                return await get_context_for_query(db, query)
+        except Exception as e:
+            logger.warning("RAG retrieval failed", error=str(e))
+            return ""
 
-        return declarations
+    async def _execute_tool_limited(
+        self, tool_name: str, tool_args: dict, session_id: str
+    ) -> tuple[Any, bool]:
+        """Execute a tool while holding a concurrency slot, reusing fresh results.
 
-    async def _execute_tool(self, tool_name: str, tool_args: dict) -> Any:
-        """Execute a tool and return result."""
-        logger.info("Executing tool", tool_name=tool_name, args=tool_args)
+        Results are only reused within the session that produced them.
 
-        try:
-            if tool_name.startswith("ga_") or tool_name in [
-                "run_report", "run_realtime_report", "get_property_details", "get_account_summaries"
-            ]:
-                return await self.ga_tool.execute(tool_name, tool_args)
-            elif tool_name.startswith("kb_") or tool_name in ["search_knowledge_base", "list_documents"]:
-                return await self.kb_tool.execute(tool_name, tool_args)
-            elif tool_name.startswith("google_ads_") and self.ads_tool:
-                return await self.ads_tool.execute(tool_name, tool_args)
-            elif tool_name == "web_search" and self.web_tool:
-                return await self.web_tool.execute(tool_name, tool_args)
-            elif tool_name.startswith("bq_") and self.bq_tool:
-                return await self.bq_tool.execute(tool_name, tool_args)
-            elif tool_name.startswith("leads_") and self.leads_tool:
-                return self.leads_tool.execute(tool_name, tool_args)
-            else:
-                return {"error": f"Unknown tool: {tool_name}"}
-        except Exception as e:
-            logger.error("Tool execution failed", tool_name=tool_name, error=str(e))
-            return {"error": str(e)}
+        Returns:
+            Tuple of (result, whether it came from the cache)
+        """
+        ttl = _TOOL_CACHE_TTL.get(tool_name, _TOOL_CACHE_DEFAULT_TTL)
+        key = (session_id, tool_name, orjson.dumps(tool_args, default=str, option=orjson.OPT_SORT_KEYS))
+
+        if ttl:
+            cached = self._tool_cache.get(key)
+            if cached is not None and time.monotonic() - cached[0] < ttl:
+                self._tool_cache.move_to_end(key)
+                return cached[1], True
+
+        async with self._tool_semaphore:
+            result = await self._execute_tool(tool_name, tool_args)
+
+        if ttl and not (isinstance(result, dict) and result.get("error")):
+            self._tool_cache.pop(key, None)
+            self._tool_cache[key] = (time.monotonic(), result)
+            if len(self._tool_cache) > _TOOL_CACHE_SIZE:
+                self._tool_cache.popitem(last=False)
+        return result, False
+
+    @staticmethod
+    def _exhausted_budget(started: float, total_tokens: int, total_tool_calls: int) -> str | None:
+        """Return the name of the first per-response budget that is spent, if any."""
+        if total_tool_calls >= settings.max_tool_calls:
+            return "tool_calls"
+        if total_tokens >= settings.max_total_tokens:
+            return "tokens"
+        if time.monotonic() - started >= settings.max_wall_seconds:
+            return "wall_time"
+        return None
 
     async def stream_response(
         self,
@@ -219,6 +415,9 @@ PRINCIPIOS:
     ) -> AsyncGenerator[dict[str, Any], None]:
         """Stream response using Gen AI SDK.
 
+        Small text deltas are coalesced (every 25ms or 64 chars) before they
+        reach the SSE layer; tool_call and done events are never batched.
+
         Args:
             messages: Conversation history
             use_rag: Whether to include RAG context
@@ -228,49 +427,56 @@ PRINCIPIOS:
         Yields:
             Stream events (text, tool_call, error, done)
         """
+        events = self._stream_events(messages, use_rag, session_id)
+        async with aclosing(coalesce_text(
+            events, window=TEXT_COALESCE_WINDOW, max_chars=TEXT_COALESCE_MAX_CHARS
+        )) as stream:
+            async for event in stream:
+                yield event
+
+    async def _stream_events(
+        self,
+        messages: list[dict[str, str]],
+        use_rag: bool,
+        session_id: str,
+    ) -> AsyncGenerator[dict[str, Any], None]:
+        """Produce the raw, uncoalesced event stream for stream_response."""
         try:
-            # Build contents
-            contents = []
-
-            # Get RAG context
-            rag_context = ""
-            if use_rag and messages:
-                last_user_msg = next(
-                    (m["content"] for m in reversed(messages) if m["role"] == "user"),
-                    None,
-                )
-                if last_user_msg:
-                    async with async_session_maker() as db:
-                        rag_context = await get_context_for_query(db, last_user_msg)
+            # Index of the last user message, found once
+            last_user_idx = next(
+                (i for i in range(len(messages) - 1, -1, -1) if messages[i]["role"] == "user"),
+                None,
+            )
 
             # Build conversation
-            for msg in messages:
-                role = "user" if msg["role"] == "user" else "model"
-                content = msg["content"]
-
-                # Add context to last user message
-                if role == "user" and msg == messages[-1] and rag_context:
-                    content = f"**Contexto:**\n{rag_context}\n\n**Pregunta:** {content}"
-
-                contents.append(types.Content(
-                    role=role,
-                    parts=[types.Part.from_text(text=content)]
-                ))
+            contents = [
+                types.Content(
+                    role="user" if msg["role"] == "user" else "model",
+                    parts=[types.Part.from_text(text=msg["content"])],
+                )
+                for msg in messages
+            ]
 
             # Generate config with tools
             config = types.GenerateContentConfig(
-                system_instruction=self.system_instruction,
-                temperature=1.0,
-                top_p=0.95,
-                max_output_tokens=8192,
-                tools=[types.Tool(function_declarations=self.tools)],
-                # Disable automatic function calling - we handle it manually
-                automatic_function_calling=types.AutomaticFunctionCallingConfig(
-                    disable=True
+                # UTC day, like the legacy orchestrator's dated instruction
+                system_instruction=_build_system_instruction_for(
+                    datetime.now(timezone.utc).date().isoformat()
                 ),
+                **self._base_config_kwargs,
             )
 
+            # Add context to the last message when it is the user's question
+            if use_rag and last_user_idx == len(messages) - 1 and messages[-1]["content"]:
+                rag_context = await self._fetch_rag(messages[-1]["content"])
+                if rag_context:
+                    contents[-1].parts[0] = types.Part.from_text(
+                        text=f"**Contexto:**\n{rag_context}\n\n**Pregunta:** {messages[-1]['content']}"
+                    )
+
             # Generate with streaming
+            started = time.monotonic()
+            total_tokens = 0
             total_tool_calls = 0
             max_iterations = 10
             total_text_emitted = 0  # Track total text length to detect complete responses
@@ -280,74 +486,106 @@ PRINCIPIOS:
                 logger.info("Generating response", iteration=iteration,
                            text_emitted=total_text_emitted, text_responses=text_response_count)
 
-                response = self.client.models.generate_content(
+                stream = await self.client.aio.models.generate_content_stream(
                     model=self.model_name,
                     contents=contents,
                     config=config,
                 )
 
-                # Check for function calls
-                if response.candidates and response.candidates[0].content.parts:
-                    text_parts = []
-                    function_calls = []
-
-                    # First pass: categorize all parts
-                    for part in response.candidates[0].content.parts:
-                        if hasattr(part, 'function_call') and part.function_call:
-                            function_calls.append(part.function_call)
-                        elif hasattr(part, 'text') and part.text:
-                            text_parts.append(part.text)
-
-                    # Calculate total text in this response
-                    response_text_length = sum(len(t) for t in text_parts)
-
-                    # SIMPLE RULE: If we already emitted one text response, stop
-                    # This prevents the model from regenerating after tool calls
-                    if text_response_count > 0 and response_text_length > 100:
-                        logger.info("Stopping - already have a text response",
-                                   previous_responses=text_response_count)
-                        break
-
-                    # Emit all text parts and STOP if we have any text
-                    if text_parts:
-                        for text in text_parts:
+                # Stream text as it arrives; collect the turn's parts so the
+                # model content can be replayed with the tool results
+                model_parts = []
+                function_calls = []
+                response_text_length = 0
+                finish_reason = None
+                turn_tokens = 0
+                async for chunk in stream:
+                    # Classify the chunk's parts in a single pass
+                    if chunk.usage_metadata and chunk.usage_metadata.total_token_count:
+                        turn_tokens = chunk.usage_metadata.total_token_count
+                    candidates = chunk.candidates
+                    if candidates and candidates[0].finish_reason:
+                        finish_reason = candidates[0].finish_reason
+                    content = candidates[0].content if candidates else None
+                    parts = content.parts if content else None
+                    if not parts:
+                        continue
+                    model_parts.extend(parts)
+                    for part in parts:
+                        fc = part.function_call
+                        if fc:
+                            function_calls.append(fc)
+                            continue
+                        text = part.text
+                        if text:
                             yield {"type": "text", "content": text}
-                            total_text_emitted += len(text)
-                        # Once we emit text, we're DONE - don't process any more tool calls
-                        logger.info("Text response emitted, stopping loop",
-                                   text_length=total_text_emitted)
-                        break
-
-                    # If there are function calls (and NO text), process ALL in PARALLEL
-                    # Gen AI SDK requires response to ALL function calls in a turn
-                    if function_calls:
-                        # Emit all "running" events first
-                        call_info = []
-                        for fc in function_calls:
-                            tool_name = fc.name
-                            tool_args = dict(fc.args) if fc.args else {}
-                            call_info.append((tool_name, tool_args))
-                            yield {
-                                "type": "tool_call",
-                                "data": {
-                                    "tool_name": tool_name,
-                                    "tool_input": tool_args,
-                                    "status": "running",
-                                },
-                            }
+                            response_text_length += len(text)
+                total_tokens += turn_tokens
+
+                if finish_reason in _BLOCKED_FINISH_REASONS:
+                    logger.warning("Response blocked", finish_reason=str(finish_reason))
+                    yield {
+                        "type": "error",
+                        "reason": "safety",
+                        "message": "La respuesta fue bloqueada por los filtros de seguridad.",
+                    }
+                    break
+
+                if finish_reason == types.FinishReason.MAX_TOKENS:
+                    logger.warning("Response hit max_output_tokens", iteration=iteration)
+                    break
 
-                        # Execute ALL tools in parallel
-                        tasks = [
-                            self._execute_tool(name, args)
-                            for name, args in call_info
-                        ]
-                        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-                        # Emit completed events and collect response parts
-                        function_response_parts = []
-                        for (tool_name, tool_args), result in zip(call_info, results):
-                            if isinstance(result, Exception):
-                                result = {"error": str(result)}
+                if not model_parts:
+                    # No content, we're done
+                    break
+
+                # Once we emit text, we're DONE - don't process any more tool calls
+                if response_text_length:
+                    total_text_emitted += response_text_length
+                    text_response_count += 1
+                    logger.info("Text response emitted, stopping loop",
+                               text_length=total_text_emitted)
+                    break
+
+                # If there are function calls (and NO text), process ALL in PARALLEL
+                # Gen AI SDK requires response to ALL function calls in a turn
+                if not function_calls:
+                    # No text and no function calls (natural STOP) - we're done
+                    break
+
+                # Emit all "running" events first
+                call_info = []
+                for fc in function_calls:
+                    tool_name = fc.name
+                    tool_args = dict(fc.args) if fc.args else {}
+                    call_info.append((tool_name, tool_args))
+                    yield {
+                        "type": "tool_call",
+                        "data": {
+                            "tool_name": tool_name,
+                            "tool_input": tool_args,
+                            "status": "running",
+                        },
+                    }
+
+                # Execute ALL tools in parallel, at most
+                # MAX_CONCURRENT_TOOLS at a time. "completed" events go out
+                # as each tool finishes; responses keep the call order.
+                pending = {
+                    asyncio.create_task(self._execute_tool_limited(name, args, session_id)): i
+                    for i, (name, args) in enumerate(call_info)
+                }
+                function_response_parts: list[types.Part | None] = [None] * len(call_info)
+                try:
+                    while pending:
+                        done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                        for task in done:
+                            i = pending.pop(task)
+                            tool_name, tool_args = call_info[i]
+                            try:
+                                result, cached = task.result()
+                            except Exception as e:
+                                result, cached = {"error": str(e)}, False
                             total_tool_calls += 1
                             yield {
                                 "type": "tool_call",
@@ -356,28 +594,43 @@ PRINCIPIOS:
                                     "tool_input": tool_args,
                                     "status": "completed",
                                     "result": result,
+                                    "cached": cached,
                                 },
                             }
-                            function_response_parts.append(
-                                types.Part.from_function_response(
-                                    name=tool_name,
-                                    response=_serialize_result(result),
-                                )
+                            function_response_parts[i] = types.Part.from_function_response(
+                                name=tool_name,
+                                response=_serialize_result(result),
                             )
+                finally:
+                    # Client went away mid-batch: don't leave tools running
+                    for task in pending:
+                        task.cancel()
 
-                        # Add model response and ALL tool results to contents
-                        contents.append(response.candidates[0].content)
-                        contents.append(types.Content(
-                            role="user",
-                            parts=function_response_parts
-                        ))
-                        # Continue loop to get model's response to tool results
-                    else:
-                        # No text and no function calls - we're done
-                        break
-                else:
-                    # No content, we're done
+                # Add model response and ALL tool results to contents
+                contents.append(types.Content(role="model", parts=model_parts))
+                contents.append(types.Content(
+                    role="user",
+                    parts=function_response_parts
+                ))
+
+                # Stop before another round trip once any budget is spent
+                exhausted = self._exhausted_budget(started, total_tokens, total_tool_calls)
+                if exhausted:
+                    logger.warning(
+                        "Response budget exhausted",
+                        budget=exhausted,
+                        total_tool_calls=total_tool_calls,
+                        total_tokens=total_tokens,
+                        elapsed=round(time.monotonic() - started, 2),
+                    )
+                    yield {
+                        "type": "error",
+                        "reason": "budget",
+                        "budget": exhausted,
+                        "message": "Se alcanzó el límite de procesamiento para esta respuesta.",
+                    }
                     break
+                # Continue loop to get model's response to tool results
 
             logger.info("Generation completed", total_tool_calls=total_tool_calls)
             yield {"type": "done"}
@@ -390,11 +643,18 @@ PRINCIPIOS:
 
 # Singleton instance
 _genai_orchestrator: GenAIOrchestrator | None = None
+_genai_lock = threading.Lock()
 
 
 def get_genai_orchestrator() -> GenAIOrchestrator:
-    """Get or create the Gen AI orchestrator instance."""
+    """Get or create the Gen AI orchestrator instance.
+
+    Creation is guarded by a lock so a burst of first requests builds the
+    client and tools only once.
+    """
     global _genai_orchestrator
     if _genai_orchestrator is None:
-        _genai_orchestrator = GenAIOrchestrator()
+        with _genai_lock:
+            if _genai_orchestrator is None:
+                _genai_orchestrator = GenAIOrchestrator()
     return _genai_orchestrator
@@ -3,12 +3,46 @@
 Provides structured templates for different types of analyses and reports.
 """
 
+import io
 from typing import Any, Optional
 from datetime import datetime
 
+# Table row formats, bound once at import
+_CAMPAIGN_ROW = "| {name} | {impr:,} | {clk:,} | ${cost:,.2f} | {conv:.0f} | {ctr:.2f}% | ${cpc:.2f} |\n".format
+_TERM_ROW = "| {term} | {clk} | ${cost:.2f} | {conv:.0f} |\n".format
+
+
+def _campaign_row(c: dict[str, Any]) -> str:
+    """Format one campaign comparison table row."""
+    get = c.get
+    return _CAMPAIGN_ROW(
+        name=(get("name") or get("campaign_name") or "")[:25],
+        impr=get("impressions", 0),
+        clk=get("clicks", 0),
+        cost=get("cost", 0),
+        conv=get("conversions", 0),
+        ctr=get("ctr", 0),
+        cpc=get("cpc", 0),
+    )
+
+
+def _term_row(t: dict[str, Any]) -> str:
+    """Format one search terms table row."""
+    get = t.get
+    return _TERM_ROW(
+        term=(get("search_term") or get("term") or "")[:40],
+        clk=get("clicks", 0),
+        cost=get("cost", 0),
+        conv=get("conversions", 0),
+    )
+
 
 class ResponseTemplates:
-    """Templates for structured AI responses."""
+    """Templates for structured AI responses.
+
+    Each template writes its markdown into a single StringIO buffer, one
+    line at a time, and returns the buffer's contents.
+    """
 
     @staticmethod
     def campaign_analysis(
@@ -30,10 +64,10 @@ class ResponseTemplates:
         Returns:
             Formatted response string
         """
-        lines = [
-            f"# 📊 Análisis: {campaign_name}\n",
-            "## Resumen Ejecutivo\n",
-        ]
+        buf = io.StringIO()
+        write = buf.write
+        write(f"# 📊 Análisis: {campaign_name}\n\n")
+        write("## Resumen Ejecutivo\n\n")
 
         # Key metrics summary
         impressions = metrics.get("impressions", 0)
@@ -51,54 +85,55 @@ class ResponseTemplates:
         else:
             summary = f"La campaña tuvo **{impressions:,} impresiones** con actividad limitada."
 
-        lines.append(summary + "\n")
+        write(summary)
+        write("\n\n")
 
         # Metrics table
-        lines.extend([
-            "## 🔢 Métricas Clave\n",
-            "| Métrica | Valor |",
-            "|---------|-------|",
-            f"| Impresiones | {impressions:,} |",
-            f"| Clics | {clicks:,} |",
-            f"| CTR | {ctr:.2f}% |",
-            f"| CPC Promedio | ${cpc:.2f} |",
-            f"| Costo Total | ${cost:,.2f} |",
-            f"| Conversiones | {conversions:.0f} |",
-        ])
+        write(
+            "## 🔢 Métricas Clave\n\n"
+            "| Métrica | Valor |\n"
+            "|---------|-------|\n"
+            f"| Impresiones | {impressions:,} |\n"
+            f"| Clics | {clicks:,} |\n"
+            f"| CTR | {ctr:.2f}% |\n"
+            f"| CPC Promedio | ${cpc:.2f} |\n"
+            f"| Costo Total | ${cost:,.2f} |\n"
+            f"| Conversiones | {conversions:.0f} |\n"
+        )
 
         if conversions > 0:
             cpa = cost / conversions
-            lines.append(f"| CPA | ${cpa:.2f} |")
+            write(f"| CPA | ${cpa:.2f} |\n")
 
-        lines.append("")
+        write("\n")
 
         # Benchmark comparison if available
         if benchmark_comparison:
-            lines.append("## 📈 vs. Benchmark de Industria\n")
+            write("## 📈 vs. Benchmark de Industria\n\n")
             for metric, data in benchmark_comparison.get("comparisons", {}).items():
                 emoji = data.get("emoji", "")
                 actual = data.get("actual", 0)
                 benchmark = data.get("benchmark", 0)
                 diff = data.get("diff_pct", 0)
                 sign = "+" if diff > 0 else ""
-                lines.append(f"- **{metric.upper()}**: {actual:.2f} vs {benchmark:.2f} ({emoji} {sign}{diff}%)")
-            lines.append("")
+                write(f"- **{metric.upper()}**: {actual:.2f} vs {benchmark:.2f} ({emoji} {sign}{diff}%)\n")
+            write("\n")
 
         # Insights
         if insights:
-            lines.append("## 💡 Insights Clave\n")
+            write("## 💡 Insights Clave\n\n")
             for i, insight in enumerate(insights, 1):
-                lines.append(f"{i}. {insight}")
-            lines.append("")
+                write(f"{i}. {insight}\n")
+            write("\n")
 
         # Recommendations
         if recommendations:
-            lines.append("## ✅ Recomendaciones\n")
+            write("## ✅ Recomendaciones\n\n")
             for i, rec in enumerate(recommendations, 1):
-                lines.append(f"**{i}.** {rec}")
-            lines.append("")
+                write(f"**{i}.** {rec}\n")
+            write("\n")
 
-        return "\n".join(lines)
+        return buf.getvalue()
 
     @staticmethod
     def diagnostic_response(
@@ -120,29 +155,23 @@ class ResponseTemplates:
         Returns:
             Formatted response
         """
-        lines = [
-            "## 📊 Resumen Ejecutivo\n",
-            f"{diagnosis}\n",
-        ]
+        buf = io.StringIO()
+        write = buf.write
+        write("## 📊 Resumen Ejecutivo\n\n")
+        write(f"{diagnosis}\n\n")
 
         if data_summary:
-            lines.extend([
-                "## 🔍 Datos Analizados\n",
-                data_summary,
-                "",
-            ])
-
-        lines.extend([
-            "## 💡 Análisis\n",
-            analysis,
-            "",
-            "## ✅ Recomendaciones\n",
-        ])
+            write("## 🔍 Datos Analizados\n\n")
+            write(f"{data_summary}\n\n")
+
+        write("## 💡 Análisis\n\n")
+        write(f"{analysis}\n\n")
+        write("## ✅ Recomendaciones\n\n")
 
         for i, rec in enumerate(recommendations, 1):
-            lines.append(f"**{i}.** {rec}")
+            write(f"**{i}.** {rec}\n")
 
-        return "\n".join(lines)
+        return buf.getvalue()
 
     @staticmethod
     def multi_campaign_comparison(
@@ -163,36 +192,30 @@ class ResponseTemplates:
         if not campaigns:
             return "No hay campañas disponibles para comparar."
 
-        lines = [
-            "# 📊 Comparación de Campañas\n",
-        ]
+        buf = io.StringIO()
+        write = buf.write
+        write("# 📊 Comparación de Campañas\n\n")
 
         # Summary table
-        lines.extend([
-            "| Campaña | Impresiones | Clics | Costo | Conv. | CTR | CPC |",
-            "|---------|-------------|-------|-------|-------|-----|-----|",
-        ])
-
-        for c in campaigns:
-            name = c.get("name", c.get("campaign_name", ""))[:25]
-            lines.append(
-                f"| {name} | {c.get('impressions', 0):,} | "
-                f"{c.get('clicks', 0):,} | ${c.get('cost', 0):,.2f} | "
-                f"{c.get('conversions', 0):.0f} | {c.get('ctr', 0):.2f}% | "
-                f"${c.get('cpc', 0):.2f} |"
-            )
+        write(
+            "| Campaña | Impresiones | Clics | Costo | Conv. | CTR | CPC |\n"
+            "|---------|-------------|-------|-------|-------|-----|-----|\n"
+        )
+
+        # Table body in one bulk write
+        write("".join(map(_campaign_row, campaigns)))
 
-        lines.append("")
+        write("\n")
 
         if winner:
-            lines.append(f"**🏆 Mejor rendimiento:** {winner}\n")
+            write(f"**🏆 Mejor rendimiento:** {winner}\n\n")
 
         if insights:
-            lines.append("## 💡 Insights\n")
+            write("## 💡 Insights\n\n")
             for insight in insights:
-                lines.append(f"- {insight}")
+                write(f"- {insight}\n")
 
-        return "\n".join(lines)
+        return buf.getvalue()
 
     @staticmethod
     def search_terms_analysis(
@@ -210,39 +233,34 @@ class ResponseTemplates:
         Returns:
             Formatted analysis
         """
-        lines = [
-            "# 🔍 Análisis de Términos de Búsqueda\n",
-        ]
+        buf = io.StringIO()
+        write = buf.write
+        write("# 🔍 Análisis de Términos de Búsqueda\n\n")
 
         if terms:
-            lines.extend([
-                "## Top Términos por Clics\n",
-                "| Término | Clics | Costo | Conv. |",
-                "|---------|-------|-------|-------|",
-            ])
+            write(
+                "## Top Términos por Clics\n\n"
+                "| Término | Clics | Costo | Conv. |\n"
+                "|---------|-------|-------|-------|\n"
+            )
 
-            for t in terms[:15]:
-                term = t.get("search_term", t.get("term", ""))[:40]
-                lines.append(
-                    f"| {term} | {t.get('clicks', 0)} | "
-                    f"${t.get('cost', 0):.2f} | {t.get('conversions', 0):.0f} |"
-                )
+            write("".join(map(_term_row, terms[:15])))
 
-            lines.append("")
+            write("\n")
 
         if top_performers:
-            lines.append("## ✅ Términos de Alto Rendimiento\n")
+            write("## ✅ Términos de Alto Rendimiento\n\n")
             for term in top_performers:
-                lines.append(f"- **{term}** - Considerar como keyword exacto")
-            lines.append("")
+                write(f"- **{term}** - Considerar como keyword exacto\n")
+            write("\n")
 
         if negatives_suggested:
-            lines.append("## ⛔ Sugerencias de Negativos\n")
+            write("## ⛔ Sugerencias de Negativos\n\n")
             for term in negatives_suggested:
-                lines.append(f"- `{term}` - Agregar como negativo")
-            lines.append("")
+                write(f"- `{term}` - Agregar como negativo\n")
+            write("\n")
 
-        return "\n".join(lines)
+        return buf.getvalue()
 
     @staticmethod
     def daily_report(
@@ -264,30 +282,30 @@ class ResponseTemplates:
         Returns:
             Formatted report
         """
-        lines = [
-            f"# 📅 Reporte Diario - {date}\n",
-            "## 📊 Resumen del Día\n",
-        ]
+        buf = io.StringIO()
+        write = buf.write
+        write(f"# 📅 Reporte Diario - {date}\n\n")
+        write("## 📊 Resumen del Día\n\n")
 
         # Metrics
         total_spend = metrics_summary.get("total_spend", 0)
         total_clicks = metrics_summary.get("total_clicks", 0)
         total_conv = metrics_summary.get("total_conversions", 0)
 
-        lines.extend([
-            f"- **Inversión total:** ${total_spend:,.2f}",
-            f"- **Clics totales:** {total_clicks:,}",
-            f"- **Conversiones:** {total_conv:.0f}",
-        ])
+        write(
+            f"- **Inversión total:** ${total_spend:,.2f}\n"
+            f"- **Clics totales:** {total_clicks:,}\n"
+            f"- **Conversiones:** {total_conv:.0f}\n"
+        )
 
         if total_conv > 0:
             cpa = total_spend / total_conv
-            lines.append(f"- **CPA promedio:** ${cpa:.2f}")
+            write(f"- **CPA promedio:** ${cpa:.2f}\n")
 
-        lines.append("")
+        write("\n")
 
         if top_campaign:
-            lines.append(f"**🏆 Mejor campaña del día:** {top_campaign}\n")
+            write(f"**🏆 Mejor campaña del día:** {top_campaign}\n\n")
 
         # Alerts section
         if alerts:
@@ -295,26 +313,26 @@ class ResponseTemplates:
             warnings = [a for a in alerts if a.get("severity") == "warning"]
 
             if critical:
-                lines.append("## 🚨 Alertas Críticas\n")
+                write("## 🚨 Alertas Críticas\n\n")
                 for alert in critical:
-                    lines.append(f"- **{alert.get('title', '')}**: {alert.get('description', '')}")
-                lines.append("")
+                    write(f"- **{alert.get('title', '')}**: {alert.get('description', '')}\n")
+                write("\n")
 
             if warnings:
-                lines.append("## ⚠️ Advertencias\n")
+                write("## ⚠️ Advertencias\n\n")
                 for alert in warnings:
-                    lines.append(f"- {alert.get('title', '')}")
-                lines.append("")
+                    write(f"- {alert.get('title', '')}\n")
+                write("\n")
         else:
-            lines.append("✅ **Sin alertas activas**\n")
+            write("✅ **Sin alertas activas**\n\n")
 
         # Recommendations
         if recommendations:
-            lines.append("## ✅ Acciones Recomendadas\n")
+            write("## ✅ Acciones Recomendadas\n\n")
             for i, rec in enumerate(recommendations, 1):
-                lines.append(f"{i}. {rec}")
+                write(f"{i}. {rec}\n")
 
-        return "\n".join(lines)
+        return buf.getvalue()
 
     @staticmethod
     def error_response(
@@ -332,17 +350,17 @@ class ResponseTemplates:
         Returns:
             User-friendly error message
         """
-        lines = [
-            f"⚠️ **No pude completar la consulta**\n",
-            f"El acceso a {tool_name} no está disponible en este momento.",
-        ]
+        buf = io.StringIO()
+        write = buf.write
+        write("⚠️ **No pude completar la consulta**\n\n")
+        write(f"El acceso a {tool_name} no está disponible en este momento.\n")
 
         if suggestion:
-            lines.append(f"\n**Alternativa:** {suggestion}")
+            write(f"\n**Alternativa:** {suggestion}\n")
 
-        lines.append("\n¿Hay algo más en lo que pueda ayudarte?")
+        write("\n¿Hay algo más en lo que pueda ayudarte?\n")
 
-        return "\n".join(lines)
+        return buf.getvalue()
 
     @staticmethod
     def action_proposal(
@@ -362,34 +380,33 @@ class ResponseTemplates:
         Returns:
             Formatted proposal
         """
-        lines = [
-            "# 📋 Propuesta de Optimización\n",
-            f"**Tipo:** {action_type}",
-            f"**Objetivo:** {target}\n",
-            "## Cambios Propuestos\n",
-        ]
+        buf = io.StringIO()
+        write = buf.write
+        write(
+            "# 📋 Propuesta de Optimización\n\n"
+            f"**Tipo:** {action_type}\n"
+            f"**Objetivo:** {target}\n\n"
+            "## Cambios Propuestos\n\n"
+        )
 
         for change in changes:
             action = change.get("action", "")
             detail = change.get("detail", "")
-            lines.append(f"- ✏️ **{action}**: {detail}")
+            write(f"- ✏️ **{action}**: {detail}\n")
 
-        lines.append("")
+        write("\n")
 
         if expected_impact:
-            lines.extend([
-                "## 📈 Impacto Esperado\n",
-                expected_impact,
-                "",
-            ])
-
-        lines.extend([
-            "---",
-            "**¿Deseas aprobar estos cambios?**",
-            "Responde 'aprobar' para ejecutar o 'modificar' para ajustar.",
-        ])
-
-        return "\n".join(lines)
+            write("## 📈 Impacto Esperado\n\n")
+            write(f"{expected_impact}\n\n")
+
+        write(
+            "---\n"
+            "**¿Deseas aprobar estos cambios?**\n"
+            "Responde 'aprobar' para ejecutar o 'modificar' para ajustar.\n"
+        )
+
+        return buf.getvalue()
 
 
 # Convenience functions
@@ -0,0 +1,87 @@
+"""Helpers for the orchestrators' event streams."""
+
+import asyncio
+from typing import Any, AsyncGenerator
+
+# Text streamed within this window of the last flush is merged into one event
+TEXT_COALESCE_WINDOW = 0.02  # seconds
+TEXT_COALESCE_MAX_CHARS = 256
+
+
+async def coalesce_text(
+    events: AsyncGenerator[dict[str, Any], None],
+    window: float = TEXT_COALESCE_WINDOW,
+    max_chars: int = TEXT_COALESCE_MAX_CHARS,
+) -> AsyncGenerator[dict[str, Any], None]:
+    """Merge text events that arrive within ``window`` seconds of a flush.
+
+    Buffered text is flushed once ``window`` has passed since the previous
+    flush (even if no new event arrives), when ``max_chars`` is reached,
+    before any non-text event and at the end of the stream. Other events
+    pass through unchanged and in order.
+
+    With nothing buffered, events are pulled directly in the consumer's
+    task. While text is buffered, the next ``__anext__`` is kept pending so
+    it can be waited on until the window's deadline; it is reused on the
+    next pull, and cancelled if this generator is closed. Closing this
+    generator closes ``events``.
+
+    Args:
+        events: Event stream to coalesce
+        window: Seconds text may be held after the previous flush
+        max_chars: Buffered characters that force a flush
+
+    Yields:
+        Stream events with consecutive text merged
+    """
+    loop = asyncio.get_running_loop()
+    buf: list[str] = []
+    size = 0
+    last_flush = 0.0
+    pending: asyncio.Future | None = None
+
+    def flush() -> dict[str, Any]:
+        nonlocal size, last_flush
+        event = {"type": "text", "content": "".join(buf)}
+        buf.clear()
+        size = 0
+        last_flush = loop.time()
+        return event
+
+    try:
+        while True:
+            if buf:
+                if pending is None:
+                    pending = asyncio.ensure_future(anext(events))
+                timeout = last_flush + window - loop.time()
+                done, _ = await asyncio.wait({pending}, timeout=max(0.0, timeout))
+                if not done:
+                    # Window closed with nothing new: send what is buffered
+                    yield flush()
+                    continue
+            step: Any = pending if pending is not None else anext(events)
+            pending = None
+            try:
+                event = await step
+            except StopAsyncIteration:
+                break
+
+            if event.get("type") == "text":
+                buf.append(event["content"])
+                size += len(event["content"])
+                if size >= max_chars or loop.time() - last_flush >= window:
+                    yield flush()
+            else:
+                if buf:
+                    yield flush()
+                yield event
+
+        if buf:
+            yield flush()
+    finally:
+        if pending is not None:
+            pending.cancel()
+            await asyncio.wait({pending})
+            if not pending.cancelled():
+                pending.exception()  # retrieved, so it is not reported as lost
+        await events.aclose()
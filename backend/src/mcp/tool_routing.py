@@ -0,0 +1,86 @@
+"""Tool-name routing shared by the orchestrators."""
+
+from typing import Any, Callable
+
+# (bound execute method, whether it is async)
+Route = tuple[Callable[..., Any], bool]
+
+# Names older prompts and models may still emit
+_LEGACY_GA_NAMES = ("run_report", "run_realtime_report", "get_property_details", "get_account_summaries")
+_LEGACY_KB_NAMES = ("search_knowledge_base", "list_documents")
+
+
+class ToolRouter:
+    """Resolve a function-call name to the tool that executes it.
+
+    Declared names are looked up directly. Undeclared names that carry a
+    tool's prefix (``ga_``, ``bq_``, ...) fall back to that tool.
+    """
+
+    def __init__(
+        self,
+        ga_tool: Any,
+        kb_tool: Any,
+        ads_tool: Any = None,
+        web_tool: Any = None,
+        bq_tool: Any = None,
+        leads_tool: Any = None,
+    ) -> None:
+        """Build the routes for the available tools.
+
+        Args:
+            ga_tool: Google Analytics tool
+            kb_tool: Knowledge base tool
+            ads_tool: Google Ads tool, if configured
+            web_tool: Web search tool, if configured
+            bq_tool: BigQuery tool, if configured
+            leads_tool: Leads tool, if configured (its execute is synchronous)
+        """
+        self.routes: dict[str, Route] = {}
+        for tool, is_async in (
+            (ga_tool, True),
+            (kb_tool, True),
+            (ads_tool, True),
+            (web_tool, True),
+            (bq_tool, True),
+            (leads_tool, False),
+        ):
+            if tool is None:
+                continue
+            for decl in tool.get_function_declarations():
+                self.routes[decl.to_dict()["name"]] = (tool.execute, is_async)
+
+        for name in _LEGACY_GA_NAMES:
+            self.routes.setdefault(name, (ga_tool.execute, True))
+        for name in _LEGACY_KB_NAMES:
+            self.routes.setdefault(name, (kb_tool.execute, True))
+
+        self.prefix_routes: list[tuple[str, Route]] = [
+            (prefix, (tool.execute, is_async))
+            for prefix, tool, is_async in (
+                ("ga_", ga_tool, True),
+                ("kb_", kb_tool, True),
+                ("google_ads_", ads_tool, True),
+                ("bq_", bq_tool, True),
+                ("leads_", leads_tool, False),
+            )
+            if tool is not None
+        ]
+        self.prefix_routes.sort(key=lambda route: len(route[0]), reverse=True)
+
+    def resolve(self, tool_name: str) -> Route | None:
+        """Find the route for a tool name.
+
+        Args:
+            tool_name: Name from the model's function call
+
+        Returns:
+            Route for the tool, or None if no tool handles the name
+        """
+        route = self.routes.get(tool_name)
+        if route is None:
+            route = next(
+                (r for prefix, r in self.prefix_routes if tool_name.startswith(prefix)),
+                None,
+            )
+        return route
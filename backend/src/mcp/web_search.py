@@ -3,23 +3,148 @@
 Provides real-time web search capabilities using Google Custom Search API.
 """
 
+import asyncio
+import re
+import time
+from collections import OrderedDict
 from typing import Any
 
 import httpx
+import orjson
 import structlog
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
 from vertexai.generative_models import FunctionDeclaration
 
 from src.config import get_settings
+from src.mcp.base_tool import BaseTool
+from src.mcp.http_client import get_http_client
 
 logger = structlog.get_logger()
 settings = get_settings()
 
+# Search result cache; synthesized answers are static so they live longer,
+# unless they only stand in for a failed search, which should be retried soon
+_SEARCH_CACHE_SIZE = 512
+_SEARCH_CACHE_TTL = 3600.0  # seconds
+_SYNTHESIZED_CACHE_TTL = 86400.0  # seconds
+_DEGRADED_CACHE_TTL = 60.0  # seconds
 
-class WebSearchTool:
+
+# Max DuckDuckGo requests in flight at once
+DDG_MAX_CONCURRENCY = 5
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """Retry rate limits, server errors and transport failures."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code == 429 or exc.response.status_code >= 500
+    return isinstance(exc, httpx.TransportError)
+
+
+def _keyword_pattern(*keywords: str) -> re.Pattern[str]:
+    """Compile keywords into one substring-matching alternation."""
+    return re.compile("|".join(map(re.escape, keywords)))
+
+
+# Canned answers for synthesized knowledge, built once at import
+_LANDING_RESULT = {
+    "title": "Best Practices for Landing Pages",
+    "snippet": """Key landing page optimization tips:
+1. Clear value proposition above the fold
+2. Single, focused call-to-action (CTA)
+3. Remove navigation distractions
+4. Social proof (testimonials, logos, reviews)
+5. Mobile-first responsive design
+6. Fast loading speed (<3 seconds)
+7. Trust signals (security badges, certifications)
+8. A/B test headlines and CTAs
+9. Form optimization (fewer fields = higher conversion)
+10. Clear benefit-focused copy, not feature-focused"""
+}
+
+_SECURITY_RESULT = {
+    "title": "Marketing for Security Services",
+    "snippet": """Security industry marketing best practices:
+1. Emphasize peace of mind and protection
+2. Show certifications and credentials
+3. Include case studies and testimonials
+4. Offer free security assessments
+5. Highlight 24/7 monitoring capabilities
+6. Use before/after scenarios
+7. Focus on ROI and insurance benefits
+8. Local SEO optimization critical
+9. Video content showing installations
+10. Emergency response time as key differentiator"""
+}
+
+_GOOGLE_ADS_RESULT = {
+    "title": "Google Ads Optimization Tips",
+    "snippet": """Google Ads optimization strategies:
+1. Use negative keywords to filter irrelevant traffic
+2. Implement conversion tracking properly
+3. Test multiple ad variations
+4. Use responsive search ads
+5. Optimize for Quality Score (CTR, relevance, landing page)
+6. Set up remarketing campaigns
+7. Use location targeting for local services
+8. Schedule ads for peak business hours
+9. Monitor search terms report regularly
+10. Align ad copy with landing page messaging"""
+}
+
+_SEO_RESULT = {
+    "title": "SEO Best Practices 2024-2025",
+    "snippet": """Current SEO recommendations:
+1. Focus on E-E-A-T (Experience, Expertise, Authority, Trust)
+2. Core Web Vitals optimization
+3. Mobile-first indexing compliance
+4. Structured data implementation
+5. Quality content over keyword stuffing
+6. Local SEO for service businesses
+7. Voice search optimization
+8. Internal linking strategy
+9. Regular content updates
+10. User intent matching"""
+}
+
+_CRO_RESULT = {
+    "title": "Conversion Rate Optimization",
+    "snippet": """CRO benchmarks and tips:
+- Average B2B landing page conversion: 2.5-5%
+- Top performers: 10%+
+- Form completion rates: 3-5 fields optimal
+- CTA button color: high contrast works best
+- Mobile conversion typically 50% lower than desktop
+- Video can increase conversions by 80%
+- Trust badges can increase conversions by 42%
+- Exit-intent popups recover 10-15% abandonment"""
+}
+
+# Topic detection for synthesized answers, compiled once. Keywords match as
+# substrings so Spanish inflections ("campañas", "conversiones") still hit.
+_TOPIC_RESULTS: tuple[tuple[re.Pattern[str], dict[str, str]], ...] = (
+    (_keyword_pattern("landing", "pagina de aterrizaje"), _LANDING_RESULT),
+    (_keyword_pattern("seguridad", "security", "cctv", "alarma"), _SECURITY_RESULT),
+    (_keyword_pattern("google ads", "ppc", "sem", "campaña"), _GOOGLE_ADS_RESULT),
+    (_keyword_pattern("seo", "posicionamiento", "organico"), _SEO_RESULT),
+    (_keyword_pattern("conversion", "conversión", "cro"), _CRO_RESULT),
+)
+
+
+class WebSearchTool(BaseTool):
     """Tool for searching the web using Google Custom Search or fallback."""
 
-    def __init__(self) -> None:
-        """Initialize the web search tool."""
+    def __init__(self, http: httpx.AsyncClient | None = None) -> None:
+        """Initialize the web search tool.
+
+        Args:
+            http: HTTP client to reuse; defaults to the shared pooled client
+        """
+        self._http = http
+        # Caps concurrent DuckDuckGo calls to stay under its rate limit
+        self._ddg_semaphore = asyncio.Semaphore(DDG_MAX_CONCURRENCY)
+        # (normalized query, num_results) -> (expires_at, result)
+        self._cache: OrderedDict[tuple[str, int], tuple[float, dict[str, Any]]] = OrderedDict()
         self.api_key = getattr(settings, 'google_search_api_key', None)
         self.search_engine_id = getattr(settings, 'google_search_engine_id', None)
 
@@ -28,12 +153,15 @@ class WebSearchTool:
         else:
             logger.info("WebSearchTool initialized with fallback search")
 
-    def get_function_declarations(self) -> list[FunctionDeclaration]:
-        """Get function declarations for Gemini.
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """HTTP client used for search requests."""
+        if self._http is None or self._http.is_closed:
+            self._http = get_http_client()
+        return self._http
 
-        Returns:
-            List of FunctionDeclaration objects
-        """
+    def _build_function_declarations(self) -> list[FunctionDeclaration]:
+        """Build the web_search function declaration."""
         return [
             FunctionDeclaration(
                 name="web_search",
@@ -88,15 +216,41 @@ Ejemplos:
         if not query:
             return {"error": "Query is required"}
 
+        key = (query.strip().lower(), num_results)
+        now = time.monotonic()
+        cached = self._cache.get(key)
+        if cached is not None:
+            expires_at, result = cached
+            if now < expires_at:
+                self._cache.move_to_end(key)
+                return result
+            del self._cache[key]
+
         try:
             if self.api_key and self.search_engine_id:
-                return await self._google_custom_search(query, num_results)
+                result = await self._google_custom_search(query, num_results)
             else:
-                return await self._fallback_search(query, num_results)
+                result = await self._fallback_search(query, num_results)
         except Exception as e:
             logger.error("Web search failed", error=str(e), query=query)
             return {"error": f"Search failed: {str(e)}"}
 
+        if result.get("success"):
+            if result.get("degraded"):
+                ttl = _DEGRADED_CACHE_TTL
+            elif result.get("source") == "synthesized_knowledge":
+                ttl = _SYNTHESIZED_CACHE_TTL
+            else:
+                ttl = _SEARCH_CACHE_TTL
+            self._cache[key] = (now + ttl, result)
+            if len(self._cache) > _SEARCH_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return result
+
+    def cache_clear(self) -> None:
+        """Drop all cached search results."""
+        self._cache.clear()
+
     async def _google_custom_search(self, query: str, num_results: int) -> dict[str, Any]:
         """Search using Google Custom Search API.
 
@@ -116,10 +270,9 @@ Ejemplos:
             "lr": "lang_es",  # Prefer Spanish results
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params, timeout=15.0)
-            response.raise_for_status()
-            data = response.json()
+        response = await self.http.get(url, params=params, timeout=15.0)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
 
         results = []
         for item in data.get("items", []):
@@ -137,6 +290,18 @@ Ejemplos:
             "results": results
         }
 
+    @retry(
+        retry=retry_if_exception(_is_retryable),
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=0.5, max=4),
+        reraise=True,
+    )
+    async def _ddg_get(self, url: str, params: dict[str, Any]) -> httpx.Response:
+        """GET from DuckDuckGo, backing off on rate limits and server errors."""
+        response = await self.http.get(url, params=params, timeout=10.0)
+        response.raise_for_status()
+        return response
+
     async def _fallback_search(self, query: str, num_results: int) -> dict[str, Any]:
         """Fallback search using DuckDuckGo instant answers.
 
@@ -157,9 +322,9 @@ Ejemplos:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, params=params, timeout=10.0)
-                data = response.json()
+            async with self._ddg_semaphore:
+                response = await self._ddg_get(url, params)
+            data = orjson.loads(response.content)
 
             results = []
 
@@ -196,125 +361,50 @@ Ejemplos:
 
         except Exception as e:
             logger.warning("DuckDuckGo search failed, using synthesis", error=str(e))
-            return await self._synthesize_knowledge(query)
+            result = await self._synthesize_knowledge(query)
+            result["degraded"] = True
+            return result
 
     async def _synthesize_knowledge(self, query: str) -> dict[str, Any]:
         """Synthesize knowledge when search APIs are unavailable.
 
         This provides structured guidance based on common topics.
         """
-        # Keywords to detect topic
         query_lower = query.lower()
+        results = [result for pattern, result in _TOPIC_RESULTS if pattern.search(query_lower)]
 
-        knowledge = {
+        if not results:
+            results.append({
+                "title": "General Marketing Insights",
+                "snippet": f"For '{query}', I recommend focusing on data-driven decisions, A/B testing, and continuous optimization based on your specific metrics. Analyze your current performance in Google Analytics and Google Ads to identify improvement opportunities."
+            })
+
+        return {
             "success": True,
             "query": query,
             "results_count": 1,
             "source": "synthesized_knowledge",
             "note": "Based on industry best practices and expert knowledge",
-            "results": []
+            "results": results,
         }
 
-        if any(kw in query_lower for kw in ["landing", "landing page", "pagina de aterrizaje"]):
-            knowledge["results"].append({
-                "title": "Best Practices for Landing Pages",
-                "snippet": """Key landing page optimization tips:
-1. Clear value proposition above the fold
-2. Single, focused call-to-action (CTA)
-3. Remove navigation distractions
-4. Social proof (testimonials, logos, reviews)
-5. Mobile-first responsive design
-6. Fast loading speed (<3 seconds)
-7. Trust signals (security badges, certifications)
-8. A/B test headlines and CTAs
-9. Form optimization (fewer fields = higher conversion)
-10. Clear benefit-focused copy, not feature-focused"""
-            })
-
-        if any(kw in query_lower for kw in ["seguridad", "security", "cctv", "alarma"]):
-            knowledge["results"].append({
-                "title": "Marketing for Security Services",
-                "snippet": """Security industry marketing best practices:
-1. Emphasize peace of mind and protection
-2. Show certifications and credentials
-3. Include case studies and testimonials
-4. Offer free security assessments
-5. Highlight 24/7 monitoring capabilities
-6. Use before/after scenarios
-7. Focus on ROI and insurance benefits
-8. Local SEO optimization critical
-9. Video content showing installations
-10. Emergency response time as key differentiator"""
-            })
-
-        if any(kw in query_lower for kw in ["google ads", "ppc", "sem", "campaña"]):
-            knowledge["results"].append({
-                "title": "Google Ads Optimization Tips",
-                "snippet": """Google Ads optimization strategies:
-1. Use negative keywords to filter irrelevant traffic
-2. Implement conversion tracking properly
-3. Test multiple ad variations
-4. Use responsive search ads
-5. Optimize for Quality Score (CTR, relevance, landing page)
-6. Set up remarketing campaigns
-7. Use location targeting for local services
-8. Schedule ads for peak business hours
-9. Monitor search terms report regularly
-10. Align ad copy with landing page messaging"""
-            })
-
-        if any(kw in query_lower for kw in ["seo", "posicionamiento", "organico"]):
-            knowledge["results"].append({
-                "title": "SEO Best Practices 2024-2025",
-                "snippet": """Current SEO recommendations:
-1. Focus on E-E-A-T (Experience, Expertise, Authority, Trust)
-2. Core Web Vitals optimization
-3. Mobile-first indexing compliance
-4. Structured data implementation
-5. Quality content over keyword stuffing
-6. Local SEO for service businesses
-7. Voice search optimization
-8. Internal linking strategy
-9. Regular content updates
-10. User intent matching"""
-            })
-
-        if any(kw in query_lower for kw in ["conversion", "conversión", "cro"]):
-            knowledge["results"].append({
-                "title": "Conversion Rate Optimization",
-                "snippet": """CRO benchmarks and tips:
-- Average B2B landing page conversion: 2.5-5%
-- Top performers: 10%+
-- Form completion rates: 3-5 fields optimal
-- CTA button color: high contrast works best
-- Mobile conversion typically 50% lower than desktop
-- Video can increase conversions by 80%
-- Trust badges can increase conversions by 42%
-- Exit-intent popups recover 10-15% abandonment"""
-            })
-
-        if not knowledge["results"]:
-            knowledge["results"].append({
-                "title": "General Marketing Insights",
-                "snippet": f"For '{query}', I recommend focusing on data-driven decisions, A/B testing, and continuous optimization based on your specific metrics. Analyze your current performance in Google Analytics and Google Ads to identify improvement opportunities."
-            })
-
-        return knowledge
-
 
 # Singleton instance
 _web_search_tool: WebSearchTool | None = None
 
 
-def get_web_search_tool() -> WebSearchTool:
+def get_web_search_tool(http: httpx.AsyncClient | None = None) -> WebSearchTool:
     """Get or create the Web Search tool instance.
 
+    Args:
+        http: HTTP client to inject when the instance is first created
+
     Returns:
         WebSearchTool instance
     """
     global _web_search_tool
 
     if _web_search_tool is None:
-        _web_search_tool = WebSearchTool()
+        _web_search_tool = WebSearchTool(http=http)
 
     return _web_search_tool
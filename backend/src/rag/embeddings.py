@@ -5,7 +5,7 @@ text-embedding-004 model via Vertex AI.
 """
 
 import asyncio
-from typing import Sequence
+from typing import TYPE_CHECKING, Sequence
 
 import structlog
 from google.cloud import aiplatform
@@ -13,25 +13,41 @@ from tenacity import retry, stop_after_attempt, wait_exponential
 
 from src.config import get_settings
 
+if TYPE_CHECKING:
+    from vertexai.language_models import TextEmbeddingModel
+
 logger = structlog.get_logger()
 settings = get_settings()
 
 # Batch size for embedding requests
 EMBEDDING_BATCH_SIZE = 5
 
-# Initialize Vertex AI
+# Max embedding batches in flight at once
+EMBEDDING_CONCURRENCY = 8
+
+# Initialize Vertex AI and the embedding model once
 _initialized = False
+_embedding_model: "TextEmbeddingModel | None" = None
 
 
-def _ensure_initialized() -> None:
-    """Initialize Vertex AI client if not already done."""
-    global _initialized
+def _ensure_initialized() -> "TextEmbeddingModel":
+    """Initialize Vertex AI and load the embedding model if not already done.
+
+    Returns:
+        The shared TextEmbeddingModel instance
+    """
+    global _initialized, _embedding_model
     if not _initialized:
         aiplatform.init(
             project=settings.gcp_project_id,
             location=settings.vertex_ai_location,
         )
         _initialized = True
+    if _embedding_model is None:
+        from vertexai.language_models import TextEmbeddingModel
+
+        _embedding_model = TextEmbeddingModel.from_pretrained(settings.embedding_model)
+    return _embedding_model
 
 
 @retry(
@@ -47,19 +63,11 @@ async def _generate_embedding_batch(texts: list[str]) -> list[list[float]]:
     Returns:
         List of embedding vectors
     """
-    _ensure_initialized()
-
-    # Use Vertex AI text embeddings
-    from vertexai.language_models import TextEmbeddingModel
-
-    model = TextEmbeddingModel.from_pretrained(settings.embedding_model)
+    model = _ensure_initialized()
 
     # Run in executor since the API is synchronous
-    loop = asyncio.get_event_loop()
-    embeddings = await loop.run_in_executor(
-        None,
-        lambda: model.get_embeddings(texts),
-    )
+    loop = asyncio.get_running_loop()
+    embeddings = await loop.run_in_executor(None, model.get_embeddings, texts)
 
     return [embedding.values for embedding in embeddings]
 
@@ -68,7 +76,8 @@ async def generate_embeddings(texts: Sequence[str]) -> list[list[float]]:
     """Generate embeddings for multiple texts with batching.
 
     Splits input into batches to respect API limits and
-    processes them with retry logic.
+    processes them concurrently (at most EMBEDDING_CONCURRENCY at a
+    time) with retry logic.
 
     Args:
         texts: Sequence of text strings to embed
@@ -79,32 +88,40 @@ async def generate_embeddings(texts: Sequence[str]) -> list[list[float]]:
     if not texts:
         return []
 
-    all_embeddings: list[list[float]] = []
-
-    # Process in batches
-    for i in range(0, len(texts), EMBEDDING_BATCH_SIZE):
-        batch = list(texts[i : i + EMBEDDING_BATCH_SIZE])
-
-        logger.debug(
-            "Generating embedding batch",
-            batch_start=i,
-            batch_size=len(batch),
-        )
-
-        try:
-            batch_embeddings = await _generate_embedding_batch(batch)
-            all_embeddings.extend(batch_embeddings)
-        except Exception as e:
-            logger.error(
-                "Embedding generation failed",
-                batch_start=i,
-                error=str(e),
-                exc_info=True,
+    batches = [
+        list(texts[i : i + EMBEDDING_BATCH_SIZE])
+        for i in range(0, len(texts), EMBEDDING_BATCH_SIZE)
+    ]
+    semaphore = asyncio.Semaphore(EMBEDDING_CONCURRENCY)
+
+    async def run(batch_start: int, batch: list[str]) -> list[list[float]]:
+        async with semaphore:
+            logger.debug(
+                "Generating embedding batch",
+                batch_start=batch_start,
+                batch_size=len(batch),
             )
-            # Return zero vectors for failed batch
-            zero_vector = [0.0] * 768
-            all_embeddings.extend([zero_vector] * len(batch))
+            try:
+                return await _generate_embedding_batch(batch)
+            except Exception as e:
+                logger.error(
+                    "Embedding generation failed",
+                    batch_start=batch_start,
+                    error=str(e),
+                    exc_info=True,
+                )
+                # Return zero vectors for failed batch
+                zero_vector = [0.0] * 768
+                return [zero_vector] * len(batch)
+
+    # Batches run concurrently; gather keeps them in input order
+    results = await asyncio.gather(
+        *(run(n * EMBEDDING_BATCH_SIZE, batch) for n, batch in enumerate(batches))
+    )
 
+    all_embeddings: list[list[float]] = []
+    for batch_embeddings in results:
+        all_embeddings.extend(batch_embeddings)
     return all_embeddings
 
 
@@ -4,10 +4,14 @@ Extracts text from documents, chunks content, and generates embeddings.
 """
 
 import asyncio
+import bisect
+import io
+import re
 from pathlib import Path
 from uuid import UUID
 
 import structlog
+from sqlalchemy import insert, select
 from pypdf import PdfReader
 from docx import Document as DocxDocument
 
@@ -24,6 +28,9 @@ settings = get_settings()
 CHUNK_SIZE = 1000  # characters
 CHUNK_OVERLAP = 200  # characters
 
+# Sentence endings chunks prefer to break after
+_SENTENCE_END = re.compile(r"\. |\.\n|\? |!\n|\n\n")
+
 
 def extract_text_from_pdf(file_path: str) -> str:
     """Extract text content from PDF file.
@@ -35,14 +42,17 @@ def extract_text_from_pdf(file_path: str) -> str:
         Extracted text content
     """
     reader = PdfReader(file_path)
-    text_parts: list[str] = []
+    buf = io.StringIO()
 
+    # Pages are written as they are extracted instead of collected first
     for page in reader.pages:
         page_text = page.extract_text()
         if page_text:
-            text_parts.append(page_text)
+            if buf.tell():
+                buf.write("\n\n")
+            buf.write(page_text)
 
-    return "\n\n".join(text_parts)
+    return buf.getvalue()
 
 
 def extract_text_from_docx(file_path: str) -> str:
@@ -55,13 +65,16 @@ def extract_text_from_docx(file_path: str) -> str:
         Extracted text content
     """
     doc = DocxDocument(file_path)
-    text_parts: list[str] = []
+    buf = io.StringIO()
 
     for paragraph in doc.paragraphs:
-        if paragraph.text.strip():
-            text_parts.append(paragraph.text)
+        paragraph_text = paragraph.text
+        if paragraph_text.strip():
+            if buf.tell():
+                buf.write("\n\n")
+            buf.write(paragraph_text)
 
-    return "\n\n".join(text_parts)
+    return buf.getvalue()
 
 
 def extract_text_from_txt(file_path: str) -> str:
@@ -125,21 +138,26 @@ def chunk_text(text: str, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVE
     start = 0
     text_length = len(text)
 
+    # Offsets just past every sentence ending, found in one scan
+    boundaries = [m.end() for m in _SENTENCE_END.finditer(text)]
+
     while start < text_length:
         end = start + chunk_size
 
-        # Try to break at sentence boundary
+        # Try to break at the last sentence boundary in the window's back half
         if end < text_length:
-            # Look for sentence endings
-            for sep in [". ", ".\n", "? ", "!\n", "\n\n"]:
-                last_sep = text.rfind(sep, start, end)
-                if last_sep > start + chunk_size // 2:
-                    end = last_sep + len(sep)
-                    break
-
-        chunk = text[start:end].strip()
-        if chunk:
-            chunks.append(chunk)
+            i = bisect.bisect_right(boundaries, end) - 1
+            if i >= 0 and boundaries[i] > start + chunk_size // 2:
+                end = boundaries[i]
+
+        # Trim edge whitespace by index so only the final chunk is sliced
+        lo, hi = start, min(end, text_length)
+        while lo < hi and text[lo].isspace():
+            lo += 1
+        while hi > lo and text[hi - 1].isspace():
+            hi -= 1
+        if lo < hi:
+            chunks.append(text[lo:hi])
 
         # Move start position with overlap
         start = end - overlap if end < text_length else text_length
@@ -161,7 +179,6 @@ async def process_document(document_id: UUID, file_path: str) -> None:
     async with async_session_maker() as db:
         try:
             # Get document record
-            from sqlalchemy import select
             query = select(Document).where(Document.id == document_id)
             result = await db.execute(query)
             document = result.scalar_one_or_none()
@@ -176,7 +193,8 @@ async def process_document(document_id: UUID, file_path: str) -> None:
 
             # Extract text
             logger.info("Extracting text", document_id=str(document_id))
-            text = extract_text(file_path, document.mime_type)
+            # PDF/DOCX parsing is CPU-bound; keep it off the event loop
+            text = await asyncio.to_thread(extract_text, file_path, document.mime_type)
 
             if not text.strip():
                 document.status = DocumentStatus.ERROR.value
@@ -186,7 +204,7 @@ async def process_document(document_id: UUID, file_path: str) -> None:
 
             # Chunk text
             logger.info("Chunking text", document_id=str(document_id))
-            chunks = chunk_text(text)
+            chunks = await asyncio.to_thread(chunk_text, text)
 
             if not chunks:
                 document.status = DocumentStatus.ERROR.value
@@ -202,16 +220,21 @@ async def process_document(document_id: UUID, file_path: str) -> None:
             )
             embeddings = await generate_embeddings(chunks)
 
-            # Create chunk records
-            for i, (chunk_text_content, embedding) in enumerate(zip(chunks, embeddings)):
-                chunk = DocumentChunk(
-                    document_id=document_id,
-                    chunk_index=i,
-                    content=chunk_text_content,
-                    embedding=embedding,
-                    token_count=len(chunk_text_content.split()),
-                )
-                db.add(chunk)
+            # Create chunk records in one executemany INSERT
+            await db.execute(
+                insert(DocumentChunk),
+                [
+                    {
+                        "document_id": document_id,
+                        "chunk_index": i,
+                        "content": chunk_text_content,
+                        "embedding": embedding,
+                        # ~4 chars per token, same rule retrieval budgets with
+                        "token_count": max(1, len(chunk_text_content) // 4),
+                    }
+                    for i, (chunk_text_content, embedding) in enumerate(zip(chunks, embeddings))
+                ],
+            )
 
             # Update document status
             document.status = DocumentStatus.INDEXED.value
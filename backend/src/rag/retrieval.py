@@ -3,15 +3,87 @@
 Implements semantic search using pgvector's cosine similarity.
 """
 
+from collections import OrderedDict
+
 import structlog
-from sqlalchemy import text
+from pgvector.sqlalchemy import HALFVEC
+from sqlalchemy import bindparam, literal_column, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.database.models import DocumentChunk
 from src.rag.embeddings import generate_single_embedding
 from src.schemas.documents import ChunkResponse
 
 logger = structlog.get_logger()
 
+# Cosine similarity search, built once as a Core statement so its compiled
+# form and the asyncpg prepared statement are reused. The inner query is a
+# plain ORDER BY distance LIMIT so the HNSW index serves it as an index
+# probe; the threshold is applied to that short list afterwards (same rows,
+# since similarity falls monotonically with distance).
+_distance = DocumentChunk.embedding.cosine_distance(
+    bindparam("embedding", type_=HALFVEC(768))
+)
+_nearest = (
+    select(
+        DocumentChunk.id,
+        DocumentChunk.document_id,
+        DocumentChunk.chunk_index,
+        DocumentChunk.content,
+        DocumentChunk.token_count,
+        (literal_column("1") - _distance).label("similarity"),
+    )
+    .where(DocumentChunk.embedding.is_not(None))
+    .order_by(_distance)
+    .limit(bindparam("top_k"))
+    .subquery("nearest")
+)
+_SIMILARITY_STMT = (
+    select(_nearest)
+    .where(_nearest.c.similarity > bindparam("threshold"))
+    .order_by(_nearest.c.similarity.desc())
+)
+
+# Candidate list size for the HNSW probe (pgvector default is 40); set per
+# transaction with set_config() since SET cannot take a bound parameter
+_SET_EF_SEARCH = text("SELECT set_config('hnsw.ef_search', :ef, true)")
+_HNSW_EF_SEARCH_MIN = 40
+_HNSW_EF_PER_RESULT = 8
+
+# Framing for the RAG context block
+_CONTEXT_HEADER = "=== Relevant Context from Knowledge Base ===\n\n"
+_CONTEXT_SEPARATOR = "\n\n---\n\n"
+_CONTEXT_FOOTER = "\n\n=== End of Context ==="
+
+# Recent query embeddings, keyed by normalized query text
+_QUERY_EMBED_CACHE_SIZE = 1024
+_query_embed_cache: OrderedDict[str, list[float]] = OrderedDict()
+
+
+async def _embed_query(query: str) -> list[float]:
+    """Embed a search query, reusing the vector for repeated queries.
+
+    Args:
+        query: Search query text
+
+    Returns:
+        Embedding vector
+    """
+    key = query.strip().lower()
+    cached = _query_embed_cache.get(key)
+    if cached is not None:
+        _query_embed_cache.move_to_end(key)
+        return cached
+
+    embedding = await generate_single_embedding(query)
+
+    # Zero vectors mean the embedding call failed; don't pin them
+    if any(embedding):
+        _query_embed_cache[key] = embedding
+        if len(_query_embed_cache) > _QUERY_EMBED_CACHE_SIZE:
+            _query_embed_cache.popitem(last=False)
+    return embedding
+
 
 async def search_similar_chunks(
     db: AsyncSession,
@@ -33,33 +105,20 @@ async def search_similar_chunks(
     Returns:
         List of matching chunks with similarity scores
     """
-    # Generate query embedding
-    query_embedding = await generate_single_embedding(query)
+    # Generate query embedding (cached for repeated queries)
+    query_embedding = await _embed_query(query)
 
-    # Convert to string for SQL
-    embedding_str = "[" + ",".join(map(str, query_embedding)) + "]"
+    # Widen the HNSW candidate list for larger top_k (transaction-local)
+    await db.execute(
+        _SET_EF_SEARCH,
+        {"ef": str(max(_HNSW_EF_SEARCH_MIN, top_k * _HNSW_EF_PER_RESULT))},
+    )
 
     # Execute vector search using pgvector
-    # Note: Using CAST() instead of :: to avoid asyncpg parameter parsing issues
-    sql = text("""
-        SELECT
-            dc.id,
-            dc.document_id,
-            dc.chunk_index,
-            dc.content,
-            dc.token_count,
-            1 - (dc.embedding <=> CAST(:embedding AS vector)) AS similarity
-        FROM document_chunks dc
-        WHERE dc.embedding IS NOT NULL
-          AND 1 - (dc.embedding <=> CAST(:embedding AS vector)) > :threshold
-        ORDER BY dc.embedding <=> CAST(:embedding AS vector)
-        LIMIT :top_k
-    """)
-
     result = await db.execute(
-        sql,
+        _SIMILARITY_STMT,
         {
-            "embedding": embedding_str,
+            "embedding": query_embedding,
             "threshold": threshold,
             "top_k": top_k,
         },
@@ -73,17 +132,7 @@ async def search_similar_chunks(
         results_found=len(rows),
     )
 
-    return [
-        ChunkResponse(
-            id=row.id,
-            document_id=row.document_id,
-            chunk_index=row.chunk_index,
-            content=row.content,
-            token_count=row.token_count,
-            similarity=float(row.similarity),
-        )
-        for row in rows
-    ]
+    return [ChunkResponse.from_row(row) for row in rows]
 
 
 async def get_context_for_query(
@@ -118,25 +167,27 @@ async def get_context_for_query(
     if not chunks:
         return ""
 
-    context_parts: list[str] = []
+    # Header, sources with separators and footer go into one join
+    segments: list[str] = [_CONTEXT_HEADER]
     total_tokens = 0
 
     for i, chunk in enumerate(chunks, 1):
-        chunk_tokens = chunk.token_count or len(chunk.content.split())
+        # token_count is stored at ingest; fall back to the ~4 chars/token
+        # rule, counting at least one token like ingestion does
+        chunk_tokens = chunk.token_count or max(1, len(chunk.content) // 4)
 
         if total_tokens + chunk_tokens > max_tokens:
             break
 
-        context_parts.append(
+        if i > 1:
+            segments.append(_CONTEXT_SEPARATOR)
+        segments.append(
             f"[Source {i}] (similarity: {chunk.similarity:.2f})\n{chunk.content}"
         )
         total_tokens += chunk_tokens
 
-    if not context_parts:
+    if len(segments) == 1:
         return ""
 
-    return (
-        "=== Relevant Context from Knowledge Base ===\n\n"
-        + "\n\n---\n\n".join(context_parts)
-        + "\n\n=== End of Context ==="
-    )
+    segments.append(_CONTEXT_FOOTER)
+    return "".join(segments)
@@ -0,0 +1,15 @@
+"""Shared base for response schemas built from database rows."""
+
+from pydantic import BaseModel
+
+
+class RowResponse(BaseModel):
+    """Response schema that can be built straight from an ORM or result row.
+
+    Subclasses provide ``from_row()``, which uses ``model_construct()`` and
+    skips validation. It is only safe for rows loaded from the database,
+    where the column types already hold; anything else goes through
+    ``model_validate()``.
+    """
+
+    model_config = {"from_attributes": True}
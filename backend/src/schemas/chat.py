@@ -6,6 +6,8 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field
 
+from src.schemas.base import RowResponse
+
 
 class ChatSessionCreate(BaseModel):
     """Request schema for creating a chat session."""
@@ -22,7 +24,7 @@ class ChatSessionCreate(BaseModel):
     model_config = {"strict": True}
 
 
-class ChatSessionResponse(BaseModel):
+class ChatSessionResponse(RowResponse):
     """Response schema for chat session."""
 
     id: UUID
@@ -32,7 +34,17 @@ class ChatSessionResponse(BaseModel):
     updated_at: datetime
     message_count: Annotated[int, Field(default=0)]
 
-    model_config = {"from_attributes": True}
+    @classmethod
+    def from_row(cls, session: Any, message_count: int = 0) -> "ChatSessionResponse":
+        """Build a response from a ChatSession ORM row."""
+        return cls.model_construct(
+            id=session.id,
+            title=session.title,
+            user_id=session.user_id,
+            created_at=session.created_at,
+            updated_at=session.updated_at,
+            message_count=message_count,
+        )
 
 
 class ChatMessageCreate(BaseModel):
@@ -46,7 +58,7 @@ class ChatMessageCreate(BaseModel):
     model_config = {"strict": True}
 
 
-class ChatMessageResponse(BaseModel):
+class ChatMessageResponse(RowResponse):
     """Response schema for chat message."""
 
     id: UUID
@@ -56,7 +68,17 @@ class ChatMessageResponse(BaseModel):
     tool_calls: dict[str, Any] | None
     created_at: datetime
 
-    model_config = {"from_attributes": True}
+    @classmethod
+    def from_row(cls, message: Any) -> "ChatMessageResponse":
+        """Build a response from a ChatMessage ORM row."""
+        return cls.model_construct(
+            id=message.id,
+            session_id=message.session_id,
+            role=message.role,
+            content=message.content,
+            tool_calls=message.tool_calls,
+            created_at=message.created_at,
+        )
 
 
 class ChatStreamRequest(BaseModel):
@@ -7,6 +7,8 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field
 
+from src.schemas.base import RowResponse
+
 
 class DocumentStatus(str, Enum):
     """Document processing status."""
@@ -31,7 +33,7 @@ class DocumentUploadResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
-class DocumentResponse(BaseModel):
+class DocumentResponse(RowResponse):
     """Response schema for document details."""
 
     id: UUID
@@ -45,7 +47,21 @@ class DocumentResponse(BaseModel):
     updated_at: datetime
     metadata: Annotated[dict[str, Any], Field(default_factory=dict)]
 
-    model_config = {"from_attributes": True}
+    @classmethod
+    def from_row(cls, document: Any) -> "DocumentResponse":
+        """Build a response from a Document ORM row."""
+        return cls.model_construct(
+            id=document.id,
+            filename=document.filename,
+            original_name=document.original_name,
+            mime_type=document.mime_type,
+            file_size=document.file_size,
+            status=DocumentStatus(document.status),
+            chunk_count=document.chunk_count,
+            created_at=document.created_at,
+            updated_at=document.updated_at,
+            metadata=document.metadata_ or {},
+        )
 
 
 class DocumentListResponse(BaseModel):
@@ -57,7 +73,7 @@ class DocumentListResponse(BaseModel):
     page_size: int
 
 
-class ChunkResponse(BaseModel):
+class ChunkResponse(RowResponse):
     """Response schema for document chunk."""
 
     id: UUID
@@ -67,7 +83,17 @@ class ChunkResponse(BaseModel):
     token_count: int | None
     similarity: Annotated[float | None, Field(default=None)]
 
-    model_config = {"from_attributes": True}
+    @classmethod
+    def from_row(cls, row: Any) -> "ChunkResponse":
+        """Build a response from a similarity search row."""
+        return cls.model_construct(
+            id=row.id,
+            document_id=row.document_id,
+            chunk_index=row.chunk_index,
+            content=row.content,
+            token_count=row.token_count,
+            similarity=float(row.similarity),
+        )
 
 
 class SearchRequest(BaseModel):
@@ -4,9 +4,12 @@ Provides Speech-to-Text (STT) and Text-to-Speech (TTS) capabilities
 using Google Cloud services for natural voice interactions.
 """
 
-from typing import Any, AsyncGenerator, Optional
+from typing import Any, AsyncGenerator, Literal, Optional
 import asyncio
 import base64
+import functools
+import re
+import threading
 import structlog
 from google.cloud import speech_v1 as speech
 from google.cloud import texttospeech_v1 as tts
@@ -16,6 +19,90 @@ from src.config import get_settings
 logger = structlog.get_logger()
 settings = get_settings()
 
+# Sentence boundaries used to feed streaming synthesis one sentence at a time
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+
+# Encoding name -> Google enum, resolved once at import
+_STT_ENCODING_MAP = {
+    "LINEAR16": speech.RecognitionConfig.AudioEncoding.LINEAR16,
+    "FLAC": speech.RecognitionConfig.AudioEncoding.FLAC,
+    "MP3": speech.RecognitionConfig.AudioEncoding.MP3,
+    "WEBM_OPUS": speech.RecognitionConfig.AudioEncoding.WEBM_OPUS,
+}
+_TTS_ENCODING_MAP = {
+    "MP3": tts.AudioEncoding.MP3,
+    "LINEAR16": tts.AudioEncoding.LINEAR16,
+    "OGG_OPUS": tts.AudioEncoding.OGG_OPUS,
+}
+_DEFAULT_STT_ENCODING = _STT_ENCODING_MAP["LINEAR16"]
+_DEFAULT_TTS_ENCODING = _TTS_ENCODING_MAP["MP3"]
+
+# Audio bytes per StreamingRecognizeRequest (the API caps a request at 25 KB)
+_STT_FRAME_BYTES = 20 * 1024
+
+# Live audio is regrouped into ~100 ms LINEAR16 frames (2 bytes per sample)
+_STT_LIVE_FRAME_SECONDS = 0.1
+
+# Default Neural2 voice per language
+_VOICE_MAP = {
+    "es-MX": "es-MX-Neural2-A",  # Female, Mexican Spanish
+    "es-ES": "es-ES-Neural2-A",  # Female, European Spanish
+    "en-US": "en-US-Neural2-A",  # Female, US English
+    "en-GB": "en-GB-Neural2-A",  # Female, British English
+    "pt-BR": "pt-BR-Neural2-A",  # Female, Brazilian Portuguese
+}
+_DEFAULT_VOICE = "es-MX-Neural2-A"
+
+# Streaming synthesis only accepts Chirp 3 HD voices; Mexican Spanish maps
+# to the Latin American es-US voice
+_STREAMING_VOICE_MAP = {
+    "es-MX": "es-US-Chirp3-HD-Aoede",
+    "es-ES": "es-ES-Chirp3-HD-Aoede",
+    "en-US": "en-US-Chirp3-HD-Aoede",
+    "en-GB": "en-GB-Chirp3-HD-Aoede",
+    "pt-BR": "pt-BR-Chirp3-HD-Aoede",
+}
+_DEFAULT_STREAMING_VOICE = "es-US-Chirp3-HD-Aoede"
+_STREAMING_SPEAKING_RATE_RANGE = (0.25, 2.0)
+
+# Function words for the detect_language heuristic; words are matched
+# without surrounding punctuation so "the," still counts
+_WORD_RE = re.compile(r"[a-záéíóúñü]+", re.IGNORECASE)
+_SPANISH_WORDS = frozenset({"el", "la", "de", "que", "y", "en", "un", "es", "los", "las", "por", "con", "para", "como"})
+_ENGLISH_WORDS = frozenset({"the", "a", "an", "is", "are", "of", "to", "and", "in", "for", "with", "that", "this"})
+
+# detect_language stops once one side leads by this many hits (with at
+# least _LANGUAGE_MIN_HITS seen), and never reads past _LANGUAGE_MAX_WORDS
+_LANGUAGE_MARGIN = 5
+_LANGUAGE_MIN_HITS = 8
+_LANGUAGE_MAX_WORDS = 200
+
+
+@functools.lru_cache(maxsize=64)
+def _tts_request_config(
+    language_code: str,
+    voice_name: str,
+    speaking_rate: float,
+    pitch: float,
+    audio_encoding: str,
+) -> tuple[tts.VoiceSelectionParams, tts.AudioConfig]:
+    """Build the voice and audio config protos for a TTS request.
+
+    Conversational traffic repeats a handful of parameter sets, so the
+    protos are built once per set and shared by every request using it.
+    Callers must not mutate the returned messages.
+    """
+    voice = tts.VoiceSelectionParams(
+        language_code=language_code,
+        name=voice_name,
+    )
+    audio_config = tts.AudioConfig(
+        audio_encoding=_TTS_ENCODING_MAP.get(audio_encoding, _DEFAULT_TTS_ENCODING),
+        speaking_rate=speaking_rate,
+        pitch=pitch,
+    )
+    return voice, audio_config
+
 
 class AudioService:
     """Service for voice-based AI interactions."""
@@ -25,20 +112,30 @@ class AudioService:
         self._stt_client: Optional[speech.SpeechAsyncClient] = None
         self._tts_client: Optional[tts.TextToSpeechAsyncClient] = None
         self._initialized = False
+        self._init_lock = asyncio.Lock()
+
+    async def initialize(self) -> None:
+        """Create the Google Cloud STT/TTS clients if they don't exist yet.
 
-    async def _ensure_initialized(self) -> None:
-        """Lazily initialize Google Cloud clients."""
+        Called once at application startup; request paths only fall back to
+        it if that failed. Safe to call repeatedly, and guarded by a lock so
+        concurrent first requests open one pair of gRPC channels, not one each.
+        """
         if self._initialized:
             return
 
-        try:
-            self._stt_client = speech.SpeechAsyncClient()
-            self._tts_client = tts.TextToSpeechAsyncClient()
-            self._initialized = True
-            logger.info("Audio service initialized successfully")
-        except Exception as e:
-            logger.error("Failed to initialize audio service", error=str(e))
-            raise
+        async with self._init_lock:
+            if self._initialized:
+                return
+
+            try:
+                self._stt_client = speech.SpeechAsyncClient()
+                self._tts_client = tts.TextToSpeechAsyncClient()
+                self._initialized = True
+                logger.info("Audio service initialized successfully")
+            except Exception as e:
+                logger.error("Failed to initialize audio service", error=str(e))
+                raise
 
     async def speech_to_text(
         self,
@@ -49,6 +146,10 @@ class AudioService:
     ) -> dict[str, Any]:
         """Convert speech audio to text.
 
+        The clip is sent over StreamingRecognize in frames, so recognition
+        runs while the audio is still being uploaded and clips longer than
+        the one-minute synchronous limit are accepted.
+
         Args:
             audio_content: Raw audio bytes
             language_code: Language code (e.g., 'es-MX', 'en-US')
@@ -58,36 +159,48 @@ class AudioService:
         Returns:
             Dict with transcription and confidence score
         """
-        await self._ensure_initialized()
+        if not self._initialized:
+            await self.initialize()
 
         try:
-            # Map encoding string to enum
-            encoding_map = {
-                "LINEAR16": speech.RecognitionConfig.AudioEncoding.LINEAR16,
-                "FLAC": speech.RecognitionConfig.AudioEncoding.FLAC,
-                "MP3": speech.RecognitionConfig.AudioEncoding.MP3,
-                "WEBM_OPUS": speech.RecognitionConfig.AudioEncoding.WEBM_OPUS,
-            }
-
-            config = speech.RecognitionConfig(
-                encoding=encoding_map.get(encoding, speech.RecognitionConfig.AudioEncoding.LINEAR16),
-                sample_rate_hertz=sample_rate_hertz,
-                language_code=language_code,
-                enable_automatic_punctuation=True,
-                model="latest_long",
-                # Enable enhanced features
-                use_enhanced=True,
-                # Support multiple speakers
-                enable_speaker_diarization=False,
-                # Alternative transcriptions
-                max_alternatives=1,
+            config = speech.StreamingRecognitionConfig(
+                config=speech.RecognitionConfig(
+                    encoding=_STT_ENCODING_MAP.get(encoding, _DEFAULT_STT_ENCODING),
+                    sample_rate_hertz=sample_rate_hertz,
+                    language_code=language_code,
+                    enable_automatic_punctuation=True,
+                    model="latest_long",
+                    # Enable enhanced features
+                    use_enhanced=True,
+                    # Alternative transcriptions
+                    max_alternatives=1,
+                ),
+                interim_results=False,  # Only final results are returned
             )
 
-            audio = speech.RecognitionAudio(content=audio_content)
+            async def request_generator():
+                # First request must contain config only
+                yield speech.StreamingRecognizeRequest(streaming_config=config)
 
-            response = await self._stt_client.recognize(config=config, audio=audio)
+                # Subsequent requests contain the audio in fixed-size frames
+                for start in range(0, len(audio_content), _STT_FRAME_BYTES):
+                    yield speech.StreamingRecognizeRequest(
+                        audio_content=audio_content[start:start + _STT_FRAME_BYTES]
+                    )
 
-            if not response.results:
+            responses = await self._stt_client.streaming_recognize(
+                requests=request_generator()
+            )
+
+            # Long audio comes back as several consecutive final results
+            final_results = [
+                result
+                async for response in responses
+                for result in response.results
+                if result.is_final and result.alternatives
+            ]
+
+            if not final_results:
                 return {
                     "success": True,
                     "transcript": "",
@@ -96,13 +209,16 @@ class AudioService:
                 }
 
             # Get the best result
-            best_result = response.results[0]
-            best_alternative = best_result.alternatives[0]
+            best_result = final_results[0]
 
             return {
                 "success": True,
-                "transcript": best_alternative.transcript,
-                "confidence": best_alternative.confidence,
+                "transcript": " ".join(
+                    result.alternatives[0].transcript.strip() for result in final_results
+                ),
+                "confidence": sum(
+                    result.alternatives[0].confidence for result in final_results
+                ) / len(final_results),
                 "alternatives": [
                     {
                         "transcript": alt.transcript,
@@ -137,12 +253,13 @@ class AudioService:
         Yields:
             Dict with partial and final transcriptions
         """
-        await self._ensure_initialized()
+        if not self._initialized:
+            await self.initialize()
 
         try:
             config = speech.StreamingRecognitionConfig(
                 config=speech.RecognitionConfig(
-                    encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
+                    encoding=_DEFAULT_STT_ENCODING,
                     sample_rate_hertz=sample_rate_hertz,
                     language_code=language_code,
                     enable_automatic_punctuation=True,
@@ -150,13 +267,28 @@ class AudioService:
                 interim_results=True,  # Get partial results
             )
 
+            frame_bytes = min(
+                _STT_FRAME_BYTES,
+                int(sample_rate_hertz * 2 * _STT_LIVE_FRAME_SECONDS),
+            )
+
             async def request_generator():
                 # First request must contain config only
                 yield speech.StreamingRecognizeRequest(streaming_config=config)
 
-                # Subsequent requests contain audio
+                # Subsequent requests contain audio, regrouped into frames as
+                # it arrives (pulled in the consuming task, no timers)
+                buffer = bytearray()
                 async for chunk in audio_stream:
-                    yield speech.StreamingRecognizeRequest(audio_content=chunk)
+                    buffer += chunk
+                    while len(buffer) >= frame_bytes:
+                        yield speech.StreamingRecognizeRequest(
+                            audio_content=bytes(buffer[:frame_bytes])
+                        )
+                        del buffer[:frame_bytes]
+
+                if buffer:
+                    yield speech.StreamingRecognizeRequest(audio_content=bytes(buffer))
 
             responses = await self._stt_client.streaming_recognize(
                 requests=request_generator()
@@ -180,7 +312,7 @@ class AudioService:
                 "confidence": 0.0,
             }
 
-    async def text_to_speech(
+    async def text_to_speech_batch(
         self,
         text: str,
         language_code: str = "es-MX",
@@ -188,8 +320,12 @@ class AudioService:
         speaking_rate: float = 1.0,
         pitch: float = 0.0,
         audio_encoding: str = "MP3",
+        return_format: Literal["base64", "bytes"] = "base64",
     ) -> dict[str, Any]:
-        """Convert text to speech audio.
+        """Convert text to speech audio in a single request.
+
+        Blocks until the whole clip is synthesized. Prefer
+        text_to_speech_streaming() for conversational turns.
 
         Args:
             text: Text to synthesize
@@ -198,11 +334,14 @@ class AudioService:
             speaking_rate: Speed of speech (0.25 to 4.0)
             pitch: Voice pitch (-20.0 to 20.0)
             audio_encoding: Output format (MP3, LINEAR16, OGG_OPUS)
+            return_format: "base64" for JSON clients, "bytes" to return the
+                raw audio and skip the encoding step
 
         Returns:
             Dict with audio content and metadata
         """
-        await self._ensure_initialized()
+        if not self._initialized:
+            await self.initialize()
 
         try:
             # Set up synthesis input
@@ -213,23 +352,8 @@ class AudioService:
             if not voice_name:
                 voice_name = self._get_default_voice(language_code)
 
-            voice = tts.VoiceSelectionParams(
-                language_code=language_code,
-                name=voice_name,
-            )
-
-            # Map encoding
-            encoding_map = {
-                "MP3": tts.AudioEncoding.MP3,
-                "LINEAR16": tts.AudioEncoding.LINEAR16,
-                "OGG_OPUS": tts.AudioEncoding.OGG_OPUS,
-            }
-
-            # Configure audio output
-            audio_config = tts.AudioConfig(
-                audio_encoding=encoding_map.get(audio_encoding, tts.AudioEncoding.MP3),
-                speaking_rate=speaking_rate,
-                pitch=pitch,
+            voice, audio_config = _tts_request_config(
+                language_code, voice_name, speaking_rate, pitch, audio_encoding
             )
 
             # Synthesize speech
@@ -239,9 +363,13 @@ class AudioService:
                 audio_config=audio_config,
             )
 
+            audio_content = response.audio_content
+            if return_format == "base64":
+                audio_content = base64.b64encode(audio_content).decode("ascii")
+
             return {
                 "success": True,
-                "audio_content": base64.b64encode(response.audio_content).decode("utf-8"),
+                "audio_content": audio_content,
                 "audio_bytes": len(response.audio_content),
                 "format": audio_encoding.lower(),
                 "voice": voice_name,
@@ -256,17 +384,77 @@ class AudioService:
                 "audio_content": None,
             }
 
-    def _get_default_voice(self, language_code: str) -> str:
+    async def text_to_speech_streaming(
+        self,
+        text: str,
+        language_code: str = "es-MX",
+        voice_name: Optional[str] = None,
+        speaking_rate: float = 1.0,
+    ) -> AsyncGenerator[bytes, None]:
+        """Convert text to speech audio, yielding OGG_OPUS chunks as they arrive.
+
+        The text is sent sentence by sentence over a bidirectional stream, so
+        playback can start on the first chunk instead of after the full clip.
+        Streaming synthesis only supports Chirp 3 HD voices, so the default
+        voice differs from the batch path, and the request language follows
+        the voice's locale.
+
+        Args:
+            text: Text to synthesize
+            language_code: Language code (e.g., 'es-MX', 'en-US')
+            voice_name: Chirp 3 HD voice name (e.g., 'es-US-Chirp3-HD-Aoede')
+            speaking_rate: Speed of speech, clamped to 0.25-2.0
+
+        Yields:
+            Raw OGG_OPUS audio bytes
+        """
+        if not self._initialized:
+            await self.initialize()
+
+        if not voice_name:
+            voice_name = _STREAMING_VOICE_MAP.get(language_code, _DEFAULT_STREAMING_VOICE)
+
+        min_rate, max_rate = _STREAMING_SPEAKING_RATE_RANGE
+        config = tts.StreamingSynthesizeConfig(
+            voice=tts.VoiceSelectionParams(
+                # Voice names start with their locale, e.g. 'es-US-...'
+                language_code="-".join(voice_name.split("-", 2)[:2]),
+                name=voice_name,
+            ),
+            streaming_audio_config=tts.StreamingAudioConfig(
+                audio_encoding=_TTS_ENCODING_MAP["OGG_OPUS"],
+                speaking_rate=min(max(speaking_rate, min_rate), max_rate),
+            ),
+        )
+
+        async def request_generator():
+            # First request must contain config only
+            yield tts.StreamingSynthesizeRequest(streaming_config=config)
+
+            # Subsequent requests contain text, one sentence each
+            for sentence in _SENTENCE_SPLIT.split(text.strip()):
+                if sentence:
+                    yield tts.StreamingSynthesizeRequest(
+                        input=tts.StreamingSynthesisInput(text=sentence)
+                    )
+
+        try:
+            responses = await self._tts_client.streaming_synthesize(
+                requests=request_generator()
+            )
+
+            async for response in responses:
+                if response.audio_content:
+                    yield response.audio_content
+
+        except Exception as e:
+            logger.error("Streaming text-to-speech failed", error=str(e))
+            raise
+
+    @staticmethod
+    def _get_default_voice(language_code: str) -> str:
         """Get the default Neural2 voice for a language."""
-        # Map languages to Neural2 voices
-        voice_map = {
-            "es-MX": "es-MX-Neural2-A",  # Female, Mexican Spanish
-            "es-ES": "es-ES-Neural2-A",  # Female, European Spanish
-            "en-US": "en-US-Neural2-A",  # Female, US English
-            "en-GB": "en-GB-Neural2-A",  # Female, British English
-            "pt-BR": "pt-BR-Neural2-A",  # Female, Brazilian Portuguese
-        }
-        return voice_map.get(language_code, "es-MX-Neural2-A")
+        return _VOICE_MAP.get(language_code, _DEFAULT_VOICE)
 
     async def detect_language(self, text: str) -> str:
         """Detect the language of input text.
@@ -279,37 +467,47 @@ class AudioService:
         """
         # Simple heuristic-based detection
         # In production, use Google Cloud Translation API or a proper ML model
-        spanish_words = {"el", "la", "de", "que", "y", "en", "un", "es", "los", "las", "por", "con", "para", "como"}
-        english_words = {"the", "a", "an", "is", "are", "of", "to", "and", "in", "for", "with", "that", "this"}
-
-        words = set(text.lower().split())
-
-        spanish_count = len(words & spanish_words)
-        english_count = len(words & english_words)
-
-        if spanish_count > english_count:
-            return "es-MX"
-        elif english_count > spanish_count:
-            return "en-US"
-        else:
-            return "es-MX"  # Default to Spanish
+        spanish_count = english_count = 0
+        for position, match in enumerate(_WORD_RE.finditer(text)):
+            if position == _LANGUAGE_MAX_WORDS:
+                break
+            word = match.group().lower()
+            if word in _SPANISH_WORDS:
+                spanish_count += 1
+            elif word in _ENGLISH_WORDS:
+                english_count += 1
+            else:
+                continue
+            if (
+                spanish_count + english_count >= _LANGUAGE_MIN_HITS
+                and abs(spanish_count - english_count) >= _LANGUAGE_MARGIN
+            ):
+                break
+
+        # Ties default to Spanish
+        return "en-US" if english_count > spanish_count else "es-MX"
 
 
 # Singleton instance
 _audio_service: Optional[AudioService] = None
+_audio_lock = threading.Lock()
 
 
 def get_audio_service() -> Optional[AudioService]:
     """Get or create audio service instance.
 
+    Creation is guarded by a lock so concurrent callers share one instance.
+
     Returns:
         AudioService instance or None if initialization fails
     """
     global _audio_service
     if _audio_service is None:
-        try:
-            _audio_service = AudioService()
-        except Exception as e:
-            logger.error("Failed to create audio service", error=str(e))
-            return None
+        with _audio_lock:
+            if _audio_service is None:
+                try:
+                    _audio_service = AudioService()
+                except Exception as e:
+                    logger.error("Failed to create audio service", error=str(e))
+                    return None
     return _audio_service
@@ -6,10 +6,13 @@ from fastapi.testclient import TestClient
 from src.main import app
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client() -> TestClient:
     """Create test client for API testing.
 
+    Shared by the whole session. The lifespan is not entered, so tests
+    don't open Google clients or probe for cloud credentials.
+
     Returns:
         TestClient: FastAPI test client instance
     """
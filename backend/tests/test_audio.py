@@ -0,0 +1,168 @@
+"""Tests for the audio service and endpoints."""
+
+import asyncio
+from typing import Any, AsyncGenerator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.v1 import audio as audio_api
+from src.services.audio_service import AudioService, tts
+
+
+class FakeStreamingTTS:
+    """Stand-in for TextToSpeechAsyncClient.streaming_synthesize."""
+
+    def __init__(self, error: Exception | None = None) -> None:
+        self.error = error
+        self.requests: list[Any] = []
+
+    async def streaming_synthesize(self, requests: AsyncGenerator[Any, None]) -> Any:
+        self.requests = [request async for request in requests]
+        if self.error:
+            raise self.error
+
+        async def responses() -> AsyncGenerator[Any, None]:
+            for request in self.requests[1:]:
+                yield tts.StreamingSynthesizeResponse(audio_content=request.input.text.encode())
+
+        return responses()
+
+
+class FakeStreamingSTT:
+    """Stand-in for SpeechAsyncClient.streaming_recognize that records frame sizes."""
+
+    def __init__(self) -> None:
+        self.frames: list[int] = []
+
+    async def streaming_recognize(self, requests: AsyncGenerator[Any, None]) -> Any:
+        self.frames = [len(request.audio_content) async for request in requests][1:]
+
+        async def responses() -> AsyncGenerator[Any, None]:
+            return
+            yield
+
+        return responses()
+
+
+def _service(client: Any) -> AudioService:
+    service = AudioService()
+    service._initialized = True
+    service._tts_client = client
+    return service
+
+
+def _stt_service(client: FakeStreamingSTT) -> AudioService:
+    service = AudioService()
+    service._initialized = True
+    service._stt_client = client
+    return service
+
+
+async def _audio(*chunks: int) -> AsyncGenerator[bytes, None]:
+    """Yield chunks of the given sizes."""
+    for size in chunks:
+        yield b"\0" * size
+
+
+class TestStreamingSynthesis:
+    """Tests for streaming text-to-speech."""
+
+    async def test_defaults_to_chirp_voice(self) -> None:
+        """Test the default streaming voice is a Chirp 3 HD voice in its own locale."""
+        client = FakeStreamingTTS()
+        chunks = [c async for c in _service(client).text_to_speech_streaming("Hola. Adiós", "es-MX")]
+
+        config = client.requests[0].streaming_config
+        assert "Chirp3-HD" in config.voice.name
+        assert config.voice.name.startswith(config.voice.language_code + "-")
+        assert chunks == [b"Hola.", "Adiós".encode()]
+
+    async def test_clamps_speaking_rate(self) -> None:
+        """Test speaking rates above the streaming maximum are capped."""
+        client = FakeStreamingTTS()
+        [c async for c in _service(client).text_to_speech_streaming("Hola", speaking_rate=4.0)]
+        assert client.requests[0].streaming_config.streaming_audio_config.speaking_rate == 2.0
+
+    def test_endpoint_reports_setup_errors(self, client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test a failure before the first chunk maps to an error status."""
+        service = _service(FakeStreamingTTS(error=RuntimeError("voice not supported")))
+        monkeypatch.setattr(audio_api, "get_audio_service", lambda: service)
+
+        response = client.post("/api/v1/audio/synthesize/stream", json={"text": "Hola"})
+
+        assert response.status_code == 502
+        assert "voice not supported" in response.json()["detail"]
+
+    def test_endpoint_streams_audio(self, client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test the endpoint streams every synthesized chunk."""
+        service = _service(FakeStreamingTTS())
+        monkeypatch.setattr(audio_api, "get_audio_service", lambda: service)
+
+        response = client.post("/api/v1/audio/synthesize/stream", json={"text": "Uno. Dos."})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "audio/ogg"
+        assert response.content == b"Uno.Dos."
+
+
+class TestStreamingRecognition:
+    """Tests for live speech-to-text."""
+
+    async def test_regroups_chunks_into_100ms_frames(self) -> None:
+        """Test 20 ms browser chunks go out as 100 ms frames plus the remainder."""
+        client = FakeStreamingSTT()
+        service = _stt_service(client)
+
+        [r async for r in service.speech_to_text_streaming(_audio(*[640] * 12), sample_rate_hertz=16000)]
+
+        assert client.frames == [3200, 3200, 1280]
+
+    async def test_splits_large_chunks(self) -> None:
+        """Test a chunk larger than a frame is split across frames."""
+        client = FakeStreamingSTT()
+        service = _stt_service(client)
+
+        [r async for r in service.speech_to_text_streaming(_audio(8000), sample_rate_hertz=16000)]
+
+        assert client.frames == [3200, 3200, 1600]
+
+    async def test_reads_audio_in_consuming_task(self) -> None:
+        """Test the caller's audio generator is driven by the task consuming requests."""
+        client = FakeStreamingSTT()
+        service = _stt_service(client)
+        tasks = []
+
+        async def audio() -> AsyncGenerator[bytes, None]:
+            for _ in range(3):
+                tasks.append(asyncio.current_task())
+                yield b"\0" * 640
+
+        [r async for r in service.speech_to_text_streaming(audio(), sample_rate_hertz=16000)]
+
+        assert tasks == [asyncio.current_task()] * 3
+        assert client.frames == [1920]
+
+
+class TestDetectLanguage:
+    """Tests for the detect_language heuristic."""
+
+    async def test_short_text(self) -> None:
+        """Test short inputs are decided by function-word counts, ignoring case and punctuation."""
+        service = AudioService()
+
+        assert await service.detect_language("The campaign is, THE best.") == "en-US"
+        assert await service.detect_language("La campaña de Google es la mejor") == "es-MX"
+        assert await service.detect_language("") == "es-MX"
+
+    async def test_stops_once_one_language_leads(self) -> None:
+        """Test a clear early lead decides the result even if later text disagrees."""
+        text = "el la de que y en un es " + "the of to and in for with that " * 3
+
+        assert await AudioService().detect_language(text) == "es-MX"
+
+    async def test_reads_at_most_max_words(self) -> None:
+        """Test words past the reading limit are ignored."""
+        text = "palabra " * 200 + "the of to and in for with that"
+
+        assert await AudioService().detect_language(text) == "es-MX"
@@ -0,0 +1,56 @@
+"""Tests for the shared tool base class."""
+
+import pytest
+from vertexai.generative_models import FunctionDeclaration
+
+from src.mcp.base_tool import BaseTool
+
+
+def _declaration(name: str) -> FunctionDeclaration:
+    return FunctionDeclaration(name=name, description=name, parameters={"type": "object", "properties": {}})
+
+
+class CountingTool(BaseTool):
+    """Tool that counts how often its declarations are built."""
+
+    builds = 0
+
+    def _build_function_declarations(self) -> list[FunctionDeclaration]:
+        CountingTool.builds += 1
+        return [_declaration("counting")]
+
+
+class OtherTool(BaseTool):
+    """Second tool, to check the cache is per class."""
+
+    def _build_function_declarations(self) -> list[FunctionDeclaration]:
+        return [_declaration("other")]
+
+
+class TestBaseTool:
+    """Tests for BaseTool."""
+
+    def test_declarations_built_once_per_class(self) -> None:
+        """Test every instance shares the declarations built on first use."""
+        first = CountingTool().get_function_declarations()
+        second = CountingTool().get_function_declarations()
+
+        assert first is second
+        assert CountingTool.builds == 1
+
+    def test_subclasses_do_not_share_cache(self) -> None:
+        """Test each tool class keeps its own declarations."""
+        CountingTool().get_function_declarations()
+
+        declarations = OtherTool().get_function_declarations()
+
+        assert [d.to_dict()["name"] for d in declarations] == ["other"]
+
+    def test_missing_builder_fails_at_instantiation(self) -> None:
+        """Test a tool without _build_function_declarations cannot be created."""
+
+        class IncompleteTool(BaseTool):
+            pass
+
+        with pytest.raises(TypeError):
+            IncompleteTool()
@@ -1,16 +1,7 @@
 """Tests for health check endpoints."""
 
-import pytest
 from fastapi.testclient import TestClient
 
-from src.main import app
-
-
-@pytest.fixture
-def client() -> TestClient:
-    """Create test client."""
-    return TestClient(app)
-
 
 def test_root_endpoint(client: TestClient) -> None:
     """Test root endpoint returns API info."""
@@ -0,0 +1,262 @@
+"""Tests for the Vertex AI agent orchestrator."""
+
+import asyncio
+from collections import OrderedDict
+from typing import Any, AsyncGenerator
+
+from vertexai.generative_models import GenerationResponse
+
+from src.mcp.orchestrator import AgentOrchestrator
+
+
+def _response(parts: list[dict[str, Any]]) -> GenerationResponse:
+    return GenerationResponse.from_dict(
+        {"candidates": [{"content": {"role": "model", "parts": parts}, "finish_reason": "STOP"}]}
+    )
+
+
+class FakeStream:
+    """Model response stream that records whether it was closed."""
+
+    def __init__(self, chunks: list[GenerationResponse]) -> None:
+        self.chunks = chunks
+        self.closed = False
+
+    def __aiter__(self) -> "FakeStream":
+        return self
+
+    async def __anext__(self) -> GenerationResponse:
+        if not self.chunks:
+            raise StopAsyncIteration
+        return self.chunks.pop(0)
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+class FakeModel:
+    """Model that returns queued streams, one per request."""
+
+    def __init__(self, *streams: FakeStream) -> None:
+        self.streams = list(streams)
+        self.requests: list[list[Any]] = []
+
+    async def generate_content_async(self, contents: list[Any], stream: bool = False) -> FakeStream:
+        self.requests.append(list(contents))
+        return self.streams.pop(0)
+
+
+class FakeSummaryModel:
+    """Summary model that answers each prompt with a fixed text."""
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.calls = 0
+
+    async def generate_content_async(self, prompt: str) -> GenerationResponse:
+        self.calls += 1
+        return _response([{"text": self.text}])
+
+
+def _orchestrator(model: FakeModel) -> AgentOrchestrator:
+    """Orchestrator with only the state the follow-up loop uses."""
+    orchestrator = AgentOrchestrator.__new__(AgentOrchestrator)
+    orchestrator.model = model
+    orchestrator.speculative_follow_up = True
+    orchestrator._last_tool_results = OrderedDict()
+    orchestrator.history_window = 2
+    orchestrator.summary_cache = {}
+    orchestrator._summary_tasks = {}
+    orchestrator._summary_model = FakeSummaryModel("- resumen")
+    orchestrator.memory = None
+    orchestrator._refresh_system_instruction = lambda: None
+    return orchestrator
+
+
+def _history(count: int) -> list[dict[str, str]]:
+    return [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"m{i}"}
+        for i in range(count)
+    ]
+
+
+async def _drain(
+    orchestrator: AgentOrchestrator, messages: list[dict[str, str]], use_rag: bool = False
+) -> None:
+    async for _ in orchestrator._stream_events(messages, use_rag, False, "s"):
+        pass
+
+
+async def _done(value: Any) -> Any:
+    return value
+
+
+class TestSpeculativeFollowUp:
+    """Tests for speculative follow-up requests."""
+
+    async def test_hit_reuses_request(self) -> None:
+        """Test a matching prediction hands back the in-flight request."""
+        stream = FakeStream([])
+        task = asyncio.create_task(_done(stream))
+
+        claimed = await AgentOrchestrator._claim_speculative_follow_up((task, {"ok": 1}), [{"ok": 1}])
+
+        assert claimed is task
+        assert not stream.closed
+
+    async def test_miss_closes_opened_stream(self) -> None:
+        """Test a wrong prediction closes the stream the request opened."""
+        stream = FakeStream([])
+        task = asyncio.create_task(_done(stream))
+        await asyncio.sleep(0)
+
+        claimed = await AgentOrchestrator._claim_speculative_follow_up((task, {"ok": 1}), [{"ok": 2}])
+
+        assert claimed is None
+        assert stream.closed
+
+    async def test_miss_cancels_pending_request(self) -> None:
+        """Test a wrong prediction cancels a request still in flight."""
+        task = asyncio.create_task(asyncio.sleep(60))
+
+        claimed = await AgentOrchestrator._claim_speculative_follow_up((task, {"ok": 1}), [{"ok": 2}])
+
+        assert claimed is None
+        assert task.cancelled()
+
+    async def test_close_mid_turn_discards_speculation(self) -> None:
+        """Test closing the follow-up loop during a tool turn releases the speculative request."""
+        call = {"function_call": {"name": "web_search", "args": {"query": "q"}}}
+        speculative = FakeStream([_response([{"text": "never read"}])])
+        orchestrator = _orchestrator(FakeModel(FakeStream([_response([call])]), speculative))
+        orchestrator._last_tool_results[orchestrator._tool_result_key("web_search", {"query": "q"})] = {"r": 1}
+
+        async def slow_tool_turn(*args: Any) -> AsyncGenerator[dict[str, Any], None]:
+            yield {"type": "tool_call", "data": {"status": "running"}}
+            await asyncio.sleep(60)
+
+        orchestrator._run_tool_turn = slow_tool_turn
+        follow_ups = orchestrator._drive_follow_ups([])
+        event = await follow_ups.__anext__()
+        await asyncio.sleep(0)
+        await follow_ups.aclose()
+
+        assert event["data"]["status"] == "running"
+        assert speculative.closed
+
+
+class TestHistorySummary:
+    """Tests for summarizing history outside the window."""
+
+    async def test_miss_replays_history_without_waiting(self) -> None:
+        """Test an uncached summary is built in the background while history is replayed."""
+        model = FakeModel(FakeStream([_response([{"text": "ok"}])]))
+        orchestrator = _orchestrator(model)
+
+        await _drain(orchestrator, _history(5))
+
+        assert len(model.requests[0]) == 5
+        assert orchestrator._summary_model.calls == 0
+        await asyncio.gather(*orchestrator._summary_tasks.values())
+        assert list(orchestrator.summary_cache.values()) == ["- resumen"]
+
+    async def test_cached_summary_is_a_model_turn(self) -> None:
+        """Test a cached summary replaces older history as a leading model turn."""
+        model = FakeModel(*(FakeStream([_response([{"text": "ok"}])]) for _ in range(2)))
+        orchestrator = _orchestrator(model)
+        messages = _history(5)
+
+        await _drain(orchestrator, messages)
+        await asyncio.gather(*orchestrator._summary_tasks.values())
+        await _drain(orchestrator, messages)
+
+        contents = model.requests[1]
+        assert [c.role for c in contents] == ["model", "user", "model", "user"]
+        assert "- resumen" in contents[0].parts[0].text
+        assert orchestrator._summary_model.calls == 1
+
+    async def test_summary_merges_into_leading_model_turn(self) -> None:
+        """Test the summary joins a replayed model turn instead of doubling it."""
+        model = FakeModel(*(FakeStream([_response([{"text": "ok"}])]) for _ in range(2)))
+        orchestrator = _orchestrator(model)
+        messages = _history(7)[1:]
+
+        await _drain(orchestrator, messages)
+        await asyncio.gather(*orchestrator._summary_tasks.values())
+        await _drain(orchestrator, messages)
+
+        contents = model.requests[1]
+        assert [c.role for c in contents] == ["model", "user"]
+        assert [p.text for p in contents[0].parts][1] == "m5"
+
+
+class TestRagRetrieval:
+    """Tests for RAG retrieval alongside the response stream."""
+
+    async def test_failure_falls_back_to_no_context(self) -> None:
+        """Test a failed retrieval still produces an answer."""
+        model = FakeModel(FakeStream([_response([{"text": "ok"}])]))
+        orchestrator = _orchestrator(model)
+
+        async def failing_rag(query: str) -> str:
+            raise RuntimeError("database down")
+
+        orchestrator._get_rag_context = failing_rag
+        events = [e async for e in orchestrator._stream_events(_history(1), True, False, "s")]
+
+        assert [e["type"] for e in events] == ["text", "done"]
+        assert model.requests[0][-1].parts[-1].text == "m0"
+
+    async def test_cancelled_when_setup_fails(self) -> None:
+        """Test retrieval still in flight is cancelled if the request fails before using it."""
+        orchestrator = _orchestrator(FakeModel())
+        cancelled = asyncio.Event()
+
+        async def slow_rag(query: str) -> str:
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return ""
+
+        async def failing_memory() -> str:
+            await asyncio.sleep(0)
+            raise RuntimeError("memory down")
+
+        orchestrator._get_rag_context = slow_rag
+        orchestrator._get_memory_context = failing_memory
+        events = [e async for e in orchestrator._stream_events(_history(1), True, False, "s")]
+        await asyncio.sleep(0)
+
+        assert [e["type"] for e in events] == ["error", "done"]
+        assert cancelled.is_set()
+
+    async def test_cancelled_with_the_stream(self) -> None:
+        """Test cancelling the consumer mid-setup also cancels retrieval."""
+        orchestrator = _orchestrator(FakeModel())
+        cancelled = asyncio.Event()
+        in_memory = asyncio.Event()
+
+        async def slow_rag(query: str) -> str:
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return ""
+
+        async def stuck_memory() -> str:
+            in_memory.set()
+            await asyncio.sleep(60)
+            return ""
+
+        orchestrator._get_rag_context = slow_rag
+        orchestrator._get_memory_context = stuck_memory
+        consumer = asyncio.create_task(_drain(orchestrator, _history(1), use_rag=True))
+        await in_memory.wait()
+        consumer.cancel()
+        await asyncio.gather(consumer, return_exceptions=True)
+        await asyncio.sleep(0)
+
+        assert cancelled.is_set()
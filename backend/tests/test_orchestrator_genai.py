@@ -0,0 +1,174 @@
+"""Tests for the Gen AI SDK orchestrator."""
+
+import asyncio
+from collections import OrderedDict
+from types import SimpleNamespace
+from typing import Any
+
+import orjson
+import pytest
+from google.genai import types
+from vertexai.generative_models import FunctionDeclaration
+
+from src.mcp import orchestrator_genai
+from src.mcp.orchestrator_genai import GenAIOrchestrator
+
+
+class TestResponseBudgets:
+    """Tests for per-response budgets."""
+
+    @pytest.fixture(autouse=True)
+    def budgets(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Small per-response budgets and a frozen clock."""
+        monkeypatch.setattr(
+            orchestrator_genai,
+            "settings",
+            SimpleNamespace(max_tool_calls=3, max_total_tokens=1000, max_wall_seconds=10.0),
+        )
+        monkeypatch.setattr(orchestrator_genai.time, "monotonic", lambda: 100.0)
+
+    def test_within_budget(self) -> None:
+        """Test nothing is reported while every budget has room."""
+        assert GenAIOrchestrator._exhausted_budget(95.0, 999, 2) is None
+
+    def test_tool_calls(self) -> None:
+        """Test the tool-call budget is spent at its limit."""
+        assert GenAIOrchestrator._exhausted_budget(95.0, 0, 3) == "tool_calls"
+
+    def test_tokens(self) -> None:
+        """Test the token budget is spent at its limit."""
+        assert GenAIOrchestrator._exhausted_budget(95.0, 1000, 0) == "tokens"
+
+    def test_wall_time(self) -> None:
+        """Test the wall-time budget is spent once enough time has passed."""
+        assert GenAIOrchestrator._exhausted_budget(90.0, 0, 0) == "wall_time"
+
+    def test_first_spent_budget_wins(self) -> None:
+        """Test tool calls are reported ahead of other spent budgets."""
+        assert GenAIOrchestrator._exhausted_budget(0.0, 5000, 9) == "tool_calls"
+
+
+class TestSerializeResult:
+    """Tests for tool result serialization."""
+
+    @pytest.fixture(autouse=True)
+    def small_limit(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Shrink the response size limit so tests stay small."""
+        monkeypatch.setattr(orchestrator_genai, "MAX_FUNCTION_RESPONSE_BYTES", 1000)
+
+    def test_fits_unchanged(self) -> None:
+        """Test results under the limit are passed whole."""
+        serialized = orchestrator_genai._serialize_result({"rows": [{"n": 1}] * 5, "total": 5})
+
+        assert "truncated" not in serialized
+        assert orjson.loads(serialized["result"]) == {"rows": [{"n": 1}] * 5, "total": 5}
+
+    def test_truncates_rows_to_valid_json(self) -> None:
+        """Test oversized row lists keep leading rows and report how many were dropped."""
+        rows = [{"campaign": f"c{i}", "clicks": i} for i in range(200)]
+        serialized = orchestrator_genai._serialize_result({"rows": rows, "total": 200})
+
+        kept = orjson.loads(serialized["result"])
+        assert serialized["truncated"] is True
+        assert kept["total"] == 200
+        assert kept["rows"] == rows[: len(kept["rows"])]
+        assert serialized["omitted_count"] == 200 - len(kept["rows"])
+        assert len(serialized["result"]) <= 1000
+
+    def test_truncates_top_level_list(self) -> None:
+        """Test a bare list result is trimmed the same way."""
+        rows = [{"n": i} for i in range(500)]
+        serialized = orchestrator_genai._serialize_result(rows)
+
+        kept = orjson.loads(serialized["result"])
+        assert kept == rows[: len(kept)]
+        assert serialized["omitted_count"] == 500 - len(kept)
+
+    def test_without_rows_keeps_scalar_fields(self) -> None:
+        """Test a result with no list to trim falls back to its scalar fields."""
+        serialized = orchestrator_genai._serialize_result({"status": "ok", "blob": {"x": "y" * 5000}})
+
+        assert orjson.loads(serialized["result"]) == {"status": "ok"}
+        assert serialized["omitted_count"] == 1
+
+
+def _cached_orchestrator() -> tuple[GenAIOrchestrator, list[str]]:
+    """Orchestrator with only the tool cache state, and a log of executed tools."""
+    orchestrator = GenAIOrchestrator.__new__(GenAIOrchestrator)
+    orchestrator._tool_cache = OrderedDict()
+    orchestrator._tool_semaphore = asyncio.Semaphore(1)
+    executed: list[str] = []
+
+    async def execute(tool_name: str, tool_args: dict) -> Any:
+        executed.append(tool_name)
+        return {"tool": tool_name, "args": tool_args, "rows": []}
+
+    orchestrator._execute_tool = execute
+    return orchestrator, executed
+
+
+class TestToolResultCache:
+    """Tests for reusing tool results."""
+
+    async def test_reused_within_session(self) -> None:
+        """Test a repeated call in the same session is served from the cache."""
+        orchestrator, executed = _cached_orchestrator()
+
+        first, _ = await orchestrator._execute_tool_limited("web_search", {"query": "q"}, "s1")
+        second, cached = await orchestrator._execute_tool_limited("web_search", {"query": "q"}, "s1")
+
+        assert cached is True
+        assert second is first
+        assert executed == ["web_search"]
+
+    async def test_not_shared_across_sessions(self) -> None:
+        """Test another session runs the tool itself."""
+        orchestrator, executed = _cached_orchestrator()
+
+        await orchestrator._execute_tool_limited("web_search", {"query": "q"}, "s1")
+        _, cached = await orchestrator._execute_tool_limited("web_search", {"query": "q"}, "s2")
+
+        assert cached is False
+        assert executed == ["web_search", "web_search"]
+
+    async def test_uncached_tools(self) -> None:
+        """Test tools with a zero TTL, such as CRM leads, always run."""
+        orchestrator, executed = _cached_orchestrator()
+
+        for _ in range(2):
+            await orchestrator._execute_tool_limited("leads_get_summary", {}, "s1")
+
+        assert executed == ["leads_get_summary"] * 2
+
+    async def test_hits_refresh_eviction_order(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test the least recently used entry is evicted, not the oldest inserted."""
+        monkeypatch.setattr(orchestrator_genai, "_TOOL_CACHE_SIZE", 2)
+        orchestrator, executed = _cached_orchestrator()
+
+        await orchestrator._execute_tool_limited("web_search", {"query": "a"}, "s1")
+        await orchestrator._execute_tool_limited("web_search", {"query": "b"}, "s1")
+        await orchestrator._execute_tool_limited("web_search", {"query": "a"}, "s1")
+        await orchestrator._execute_tool_limited("web_search", {"query": "c"}, "s1")
+        _, cached = await orchestrator._execute_tool_limited("web_search", {"query": "a"}, "s1")
+
+        assert cached is True
+        assert len(executed) == 3
+
+
+class TestConvertDeclaration:
+    """Tests for converting Vertex AI declarations to the Gen AI SDK."""
+
+    def test_converts_and_caches(self) -> None:
+        """Test a declaration converts once and keeps its name and parameters."""
+        fd = FunctionDeclaration(
+            name="web_search",
+            description="Search the web",
+            parameters={"type": "object", "properties": {"query": {"type": "string"}}, "required": ["query"]},
+        )
+
+        converted = orchestrator_genai._convert_declaration(fd)
+
+        assert isinstance(converted, types.FunctionDeclaration)
+        assert converted.name == "web_search"
+        assert converted.parameters.required == ["query"]
+        assert orchestrator_genai._convert_declaration(fd) is converted
@@ -1,8 +1,14 @@
 """Tests for RAG pipeline components."""
 
+from collections import OrderedDict
+
 import pytest
+from pgvector.sqlalchemy import HALFVEC
+from sqlalchemy.dialects import postgresql
 
+from src.rag import retrieval
 from src.rag.ingestion import chunk_text
+from src.schemas.documents import ChunkResponse
 
 
 class TestChunking:
@@ -63,3 +69,108 @@ class TestChunking:
             stripped = chunk.strip()
             # Either ends with punctuation or is the content
             assert stripped.endswith(('.', '!', '?')) or len(stripped) < 40
+
+    def test_chunk_breaks_at_last_boundary(self) -> None:
+        """Test the break is the last sentence boundary in the window, whatever its kind."""
+        text = "A" * 22 + "\n\n" + "B" * 6 + ". " + "C" * 40
+        result = chunk_text(text, chunk_size=40, overlap=5)
+
+        assert result[0] == "A" * 22 + "\n\n" + "B" * 6 + "."
+
+    def test_chunk_ignores_boundary_in_first_half(self) -> None:
+        """Test a boundary before the window's midpoint gives way to a hard cut."""
+        text = "Short. " + "x" * 60
+        result = chunk_text(text, chunk_size=40, overlap=5)
+
+        assert result[0] == text[:40]
+        assert result[1] == text[35:]
+
+
+class TestQueryEmbeddingCache:
+    """Tests for the query embedding cache."""
+
+    @pytest.fixture
+    def embed_calls(self, monkeypatch: pytest.MonkeyPatch) -> list[str]:
+        """Fresh cache and a fake embedder that records its queries."""
+        calls: list[str] = []
+
+        async def fake_embed(query: str) -> list[float]:
+            calls.append(query)
+            return [0.0] * 768 if query == "fails" else [float(len(calls))] * 768
+
+        monkeypatch.setattr(retrieval, "_query_embed_cache", OrderedDict())
+        monkeypatch.setattr(retrieval, "generate_single_embedding", fake_embed)
+        return calls
+
+    async def test_repeated_query_is_embedded_once(self, embed_calls: list[str]) -> None:
+        """Test queries differing only in case and edge whitespace share a vector."""
+        first = await retrieval._embed_query("Mejores campañas")
+        second = await retrieval._embed_query("  mejores CAMPAÑAS ")
+
+        assert second is first
+        assert embed_calls == ["Mejores campañas"]
+
+    async def test_failed_embedding_is_not_cached(self, embed_calls: list[str]) -> None:
+        """Test zero vectors from a failed call are retried next time."""
+        await retrieval._embed_query("fails")
+        await retrieval._embed_query("fails")
+
+        assert embed_calls == ["fails", "fails"]
+
+    async def test_least_recently_used_is_evicted(
+        self, embed_calls: list[str], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test the cache drops the least recently used query when full."""
+        monkeypatch.setattr(retrieval, "_QUERY_EMBED_CACHE_SIZE", 2)
+        await retrieval._embed_query("a")
+        await retrieval._embed_query("b")
+        await retrieval._embed_query("a")
+        await retrieval._embed_query("c")
+
+        assert list(retrieval._query_embed_cache) == ["a", "c"]
+
+
+class TestSimilarityStatement:
+    """Tests for the prebuilt similarity search statement."""
+
+    @staticmethod
+    def _sql() -> str:
+        return str(retrieval._SIMILARITY_STMT.compile(dialect=postgresql.asyncpg.dialect()))
+
+    def test_embedding_binds_as_halfvec(self) -> None:
+        """Test the query vector is bound with the column's halfvec type."""
+        compiled = retrieval._SIMILARITY_STMT.compile(dialect=postgresql.asyncpg.dialect())
+        bind_type = compiled.binds["embedding"].type
+
+        assert isinstance(bind_type, HALFVEC)
+        assert bind_type.dim == 768
+
+    def test_index_probe_then_threshold(self) -> None:
+        """Test the inner query is a plain nearest-neighbour probe and the threshold is applied outside it."""
+        inner, outer = self._sql().split(") AS nearest")
+
+        assert "ORDER BY document_chunks.embedding <=> $1" in inner
+        assert "LIMIT $2" in inner
+        assert "$3" not in inner
+        assert "nearest.similarity > $3" in outer
+
+
+class TestContextBudget:
+    """Tests for packing retrieved chunks into the context token budget."""
+
+    async def test_tiny_chunks_count_against_budget(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test chunks under four characters still cost a token."""
+        chunks = [
+            ChunkResponse.model_construct(
+                id=i, document_id=0, chunk_index=i, content="ok", token_count=None, similarity=0.9
+            )
+            for i in range(10)
+        ]
+
+        async def fake_search(**kwargs: object) -> list[ChunkResponse]:
+            return chunks
+
+        monkeypatch.setattr(retrieval, "search_similar_chunks", fake_search)
+        context = await retrieval.get_context_for_query(None, "q", max_tokens=3)
+
+        assert context.count("[Source") == 3
@@ -1,10 +1,14 @@
 """Tests for Pydantic schemas."""
 
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
 import pytest
 from pydantic import ValidationError
 
 from src.schemas.chat import ChatMessageCreate, ChatSessionCreate, ChatStreamRequest
-from src.schemas.documents import DocumentStatus, SearchRequest
+from src.schemas.documents import DocumentResponse, DocumentStatus, SearchRequest
 
 
 class TestChatSchemas:
@@ -72,3 +76,23 @@ class TestDocumentSchemas:
         """Test search request with invalid threshold."""
         with pytest.raises(ValidationError):
             SearchRequest(query="test", threshold=1.5)  # Max is 1.0
+
+    def test_document_response_from_row(self) -> None:
+        """Test building a document response from an ORM-like row."""
+        now = datetime.now(timezone.utc)
+        row = SimpleNamespace(
+            id=uuid4(),
+            filename="a.pdf",
+            original_name="A.pdf",
+            mime_type="application/pdf",
+            file_size=10,
+            status="indexed",
+            chunk_count=3,
+            created_at=now,
+            updated_at=now,
+            metadata_=None,
+        )
+        response = DocumentResponse.from_row(row)
+        assert response.status is DocumentStatus.INDEXED
+        assert response.metadata == {}
+        assert response.model_dump(mode="json")["id"] == str(row.id)
@@ -0,0 +1,108 @@
+"""Tests for event stream helpers."""
+
+import asyncio
+from typing import Any, AsyncGenerator
+
+from src.mcp.streaming import coalesce_text
+
+
+def _text(content: str) -> dict[str, Any]:
+    return {"type": "text", "content": content}
+
+
+async def _stream(*items: Any) -> AsyncGenerator[dict[str, Any], None]:
+    """Yield events; a float item sleeps that many seconds instead."""
+    for item in items:
+        if isinstance(item, float):
+            await asyncio.sleep(item)
+        else:
+            yield item
+
+
+class TestCoalesceText:
+    """Tests for coalesce_text."""
+
+    async def test_merges_text_within_window(self) -> None:
+        """Test text inside the window is merged and flushed at the end."""
+        events = _stream(_text("a"), _text("b"), _text("c"))
+        result = [e async for e in coalesce_text(events, window=60.0)]
+        assert result == [_text("a"), _text("bc")]
+
+    async def test_flushes_before_other_events(self) -> None:
+        """Test buffered text is flushed ahead of a non-text event."""
+        tool = {"type": "tool_call", "data": {"tool": "x"}}
+        events = _stream(_text("a"), _text("b"), tool, _text("c"))
+        result = [e async for e in coalesce_text(events, window=60.0)]
+        assert result == [_text("a"), _text("b"), tool, _text("c")]
+
+    async def test_flushes_once_window_elapses(self) -> None:
+        """Test text is not held past the window while the stream pauses."""
+        events = _stream(_text("a"), _text("b"), 0.05, _text("c"), _text("d"))
+        result = [e async for e in coalesce_text(events, window=0.02)]
+        assert result == [_text("a"), _text("b"), _text("c"), _text("d")]
+
+    async def test_flushes_at_max_chars(self) -> None:
+        """Test a full buffer is flushed without waiting for the window."""
+        events = _stream(_text("a"), _text("bb"), _text("cc"), _text("d"))
+        result = [e async for e in coalesce_text(events, window=60.0, max_chars=4)]
+        assert result == [_text("a"), _text("bbcc"), _text("d")]
+
+    async def test_runs_in_consumer_task(self) -> None:
+        """Test the inner stream is driven by the consuming task."""
+        tasks = []
+
+        async def events() -> AsyncGenerator[dict[str, Any], None]:
+            for content in ("a", "b"):
+                tasks.append(asyncio.current_task())
+                yield _text(content)
+
+        [e async for e in coalesce_text(events(), window=60.0)]
+        assert tasks == [asyncio.current_task()] * 2
+
+    async def test_close_propagates_to_inner_stream(self) -> None:
+        """Test closing the coalesced stream closes the inner one."""
+        closed = []
+
+        async def events() -> AsyncGenerator[dict[str, Any], None]:
+            try:
+                while True:
+                    yield {"type": "tool_call"}
+            finally:
+                closed.append(True)
+
+        stream = coalesce_text(events())
+        await stream.__anext__()
+        await stream.aclose()
+        assert closed == [True]
+
+    async def test_flushes_when_window_expires_without_new_events(self) -> None:
+        """Test buffered text is sent at the window deadline, ahead of a slow next event."""
+        events = _stream(_text("a"), _text("b"), 0.5, {"type": "done"})
+        stream = coalesce_text(events, window=0.02)
+        loop = asyncio.get_running_loop()
+
+        assert await stream.__anext__() == _text("a")
+        started = loop.time()
+        assert await stream.__anext__() == _text("b")
+        assert loop.time() - started < 0.25
+        assert await stream.__anext__() == {"type": "done"}
+        await stream.aclose()
+
+    async def test_close_while_waiting_cancels_pending_pull(self) -> None:
+        """Test closing during a deadline wait cancels the pending pull and closes the inner stream."""
+        closed = []
+
+        async def events() -> AsyncGenerator[dict[str, Any], None]:
+            try:
+                yield _text("a")
+                yield _text("b")
+                await asyncio.sleep(60)
+                yield _text("never")
+            finally:
+                closed.append(True)
+
+        stream = coalesce_text(events(), window=0.02)
+        assert await stream.__anext__() == _text("a")
+        assert await stream.__anext__() == _text("b")
+        await stream.aclose()
+        assert closed == [True]
@@ -0,0 +1,59 @@
+"""Tests for tool-name routing."""
+
+from typing import Any
+
+from vertexai.generative_models import FunctionDeclaration
+
+from src.mcp.tool_routing import ToolRouter
+
+
+class FakeTool:
+    """Tool declaring a fixed set of function names."""
+
+    def __init__(self, *names: str) -> None:
+        self.names = names
+
+    def get_function_declarations(self) -> list[FunctionDeclaration]:
+        return [
+            FunctionDeclaration(name=name, description=name, parameters={"type": "object", "properties": {}})
+            for name in self.names
+        ]
+
+    def execute(self, tool_name: str, tool_args: dict[str, Any]) -> Any:
+        return tool_name
+
+
+class TestToolRouter:
+    """Tests for ToolRouter."""
+
+    def test_declared_names(self) -> None:
+        """Test declared names route to their tool with its async flag."""
+        ga, kb, leads = FakeTool("ga_run_report"), FakeTool("kb_search"), FakeTool("leads_get_summary")
+        router = ToolRouter(ga, kb, leads_tool=leads)
+
+        assert router.resolve("ga_run_report") == (ga.execute, True)
+        assert router.resolve("kb_search") == (kb.execute, True)
+        assert router.resolve("leads_get_summary") == (leads.execute, False)
+
+    def test_legacy_names(self) -> None:
+        """Test legacy names still reach the analytics and knowledge base tools."""
+        ga, kb = FakeTool(), FakeTool()
+        router = ToolRouter(ga, kb)
+
+        assert router.resolve("run_report") == (ga.execute, True)
+        assert router.resolve("list_documents") == (kb.execute, True)
+
+    def test_prefix_fallback(self) -> None:
+        """Test undeclared names fall back to the tool owning their prefix."""
+        ga, kb, bq = FakeTool(), FakeTool(), FakeTool()
+        router = ToolRouter(ga, kb, bq_tool=bq)
+
+        assert router.resolve("bq_new_query") == (bq.execute, True)
+        assert router.resolve("ga_new_report") == (ga.execute, True)
+
+    def test_unknown_and_missing_tools(self) -> None:
+        """Test names for unconfigured tools or no tool at all do not resolve."""
+        router = ToolRouter(FakeTool(), FakeTool())
+
+        assert router.resolve("google_ads_get_campaigns") is None
+        assert router.resolve("nope") is None
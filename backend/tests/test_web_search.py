@@ -0,0 +1,142 @@
+"""Tests for the web search tool."""
+
+import httpx
+import pytest
+from tenacity import wait_none
+
+from src.mcp import web_search
+from src.mcp.web_search import WebSearchTool
+
+
+def _response(status_code: int, content: bytes = b"{}") -> httpx.Response:
+    """Build an httpx response bound to a DuckDuckGo request."""
+    request = httpx.Request("GET", "https://api.duckduckgo.com/")
+    return httpx.Response(status_code, content=content, request=request)
+
+
+@pytest.fixture
+def tool() -> WebSearchTool:
+    """Web search tool forced onto the DuckDuckGo fallback."""
+    instance = WebSearchTool(http=httpx.AsyncClient())
+    instance.api_key = None
+    instance.search_engine_id = None
+    return instance
+
+
+class TestWebSearchCache:
+    """Tests for web_search result caching."""
+
+    async def test_live_results_are_cached(self, tool: WebSearchTool, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test a successful search is served from cache on repeat."""
+        calls = []
+
+        async def fake_get(url: str, params: dict) -> httpx.Response:
+            calls.append(params["q"])
+            return _response(200, b'{"Abstract": "A", "Heading": "H"}')
+
+        monkeypatch.setattr(tool, "_ddg_get", fake_get)
+        first = await tool.execute("web_search", {"query": "SEO tips"})
+        second = await tool.execute("web_search", {"query": "  seo TIPS "})
+
+        assert first["source"] == "DuckDuckGo"
+        assert second is first
+        assert calls == ["SEO tips"]
+
+    async def test_synthesis_after_failure_gets_short_ttl(
+        self, tool: WebSearchTool, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test synthesized fallback after a failed search is cached only briefly."""
+
+        async def failing_get(url: str, params: dict) -> httpx.Response:
+            raise httpx.ConnectTimeout("timed out")
+
+        monkeypatch.setattr(tool, "_ddg_get", failing_get)
+        monkeypatch.setattr(web_search.time, "monotonic", lambda: 1000.0)
+        result = await tool.execute("web_search", {"query": "landing pages"})
+
+        assert result["source"] == "synthesized_knowledge"
+        assert result["degraded"] is True
+        expires_at, _ = tool._cache[("landing pages", 5)]
+        assert expires_at == 1000.0 + web_search._DEGRADED_CACHE_TTL
+
+    async def test_synthesis_on_empty_results_gets_long_ttl(
+        self, tool: WebSearchTool, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test synthesis as the primary answer keeps the long TTL."""
+
+        async def empty_get(url: str, params: dict) -> httpx.Response:
+            return _response(200)
+
+        monkeypatch.setattr(tool, "_ddg_get", empty_get)
+        monkeypatch.setattr(web_search.time, "monotonic", lambda: 1000.0)
+        result = await tool.execute("web_search", {"query": "landing pages"})
+
+        assert "degraded" not in result
+        expires_at, _ = tool._cache[("landing pages", 5)]
+        assert expires_at == 1000.0 + web_search._SYNTHESIZED_CACHE_TTL
+
+
+class TestDuckDuckGoRetries:
+    """Tests for DuckDuckGo request retries."""
+
+    @pytest.fixture(autouse=True)
+    def no_backoff(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Skip the exponential backoff between attempts."""
+        monkeypatch.setattr(WebSearchTool._ddg_get.retry, "wait", wait_none())
+
+    @staticmethod
+    def _tool(*statuses: int) -> tuple[WebSearchTool, list[int]]:
+        """Tool whose HTTP client answers with ``statuses`` in turn."""
+        seen: list[int] = []
+        queue = list(statuses)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            status = queue.pop(0)
+            seen.append(status)
+            return httpx.Response(status, content=b"{}")
+
+        return WebSearchTool(http=httpx.AsyncClient(transport=httpx.MockTransport(handler))), seen
+
+    async def test_retries_rate_limits_and_server_errors(self) -> None:
+        """Test 429 and 5xx responses are retried until one succeeds."""
+        tool, seen = self._tool(429, 503, 200)
+
+        response = await tool._ddg_get("https://api.duckduckgo.com/", {"q": "x"})
+
+        assert response.status_code == 200
+        assert seen == [429, 503, 200]
+
+    async def test_gives_up_after_three_attempts(self) -> None:
+        """Test the last error is raised once the attempts run out."""
+        tool, seen = self._tool(500, 500, 500, 200)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await tool._ddg_get("https://api.duckduckgo.com/", {"q": "x"})
+
+        assert seen == [500, 500, 500]
+
+    async def test_client_errors_are_not_retried(self) -> None:
+        """Test a 4xx other than 429 fails on the first attempt."""
+        tool, seen = self._tool(404, 200)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await tool._ddg_get("https://api.duckduckgo.com/", {"q": "x"})
+
+        assert seen == [404]
+
+    async def test_transport_errors_are_retried(self) -> None:
+        """Test connection failures are retried."""
+        attempts = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            attempts.append(request)
+            if len(attempts) == 1:
+                raise httpx.ConnectError("refused")
+            return httpx.Response(200, content=b"{}")
+
+        tool = WebSearchTool(http=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+        response = await tool._ddg_get("https://api.duckduckgo.com/", {"q": "x"})
+
+        assert response.status_code == 200
+        assert len(attempts) == 2